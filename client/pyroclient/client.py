@@ -33,6 +33,7 @@ class ClientRoute(str, Enum):
     OCCLUSION_MASKS_BY_ID = "occlusion_masks/{mask_id}"
     # DETECTIONS
     DETECTIONS_CREATE = "detections/"
+    DETECTIONS_CREATE_BATCH = "detections/batch"
     DETECTIONS_FETCH = "detections"
     DETECTIONS_URL = "detections/{det_id}/url"
     # SEQUENCES
@@ -398,6 +399,50 @@ class Client:
             files=files,
         )
 
+    def create_detections_batch(self, frames: List[Dict[str, Any]]) -> Response:
+        """Replay frames buffered on-device (e.g. during an uplink outage) in a single request.
+
+        >>> from pyroclient import Client
+        >>> api_client = Client("MY_CAM_TOKEN")
+        >>> frames = [
+        >>>     {"media": data, "bboxes": [(.1,.1,.5,.8,.5)], "pose_id": 12, "recorded_at": "2026-07-21T14:30:00"},
+        >>>     {"media": data, "bboxes": [], "pose_id": 12, "recorded_at": "2026-07-21T14:30:30"},
+        >>> ]
+        >>> response = api_client.create_detections_batch(frames)
+
+        Args:
+            frames: list of frames, each a dict with keys `media`, `bboxes`, `pose_id` and `recorded_at`
+                (ISO 8601 capture timestamp, mandatory here), plus optional `crops` (one per bbox).
+                Either every frame with a bbox carries its crops, or none does.
+
+        Returns:
+            HTTP response, listing for each frame (in request order) its first detection, if any
+        """
+        data: Dict[str, List[str]] = {"bboxes": [], "pose_id": [], "recorded_at": []}
+        files: List[Tuple[str, Tuple[str, bytes, str]]] = []
+        crop_files: List[Tuple[str, Tuple[str, bytes, str]]] = []
+        for frame in frames:
+            bboxes = frame["bboxes"]
+            if not isinstance(bboxes, (list, tuple)) or len(bboxes) > 5:
+                raise ValueError("bboxes must be a list of tuples with a maximum of 5 boxes")
+            crops = frame.get("crops")
+            if crops is not None and len(crops) != len(bboxes):
+                raise ValueError("crops must have the same length as bboxes")
+            data["bboxes"].append(_dump_bbox_to_json(bboxes))
+            data["pose_id"].append(str(frame["pose_id"]))
+            data["recorded_at"].append(frame["recorded_at"])
+            files.append(("file", ("frame.jpg", frame["media"], "image/jpeg")))
+            # Crops are sent as one flat list, ordered by frame then by bbox
+            if crops is not None:
+                crop_files.extend(("crop", ("crop.jpg", crop, "image/jpeg")) for crop in crops)
+        return requests.post(
+            urljoin(self._route_prefix, ClientRoute.DETECTIONS_CREATE_BATCH),
+            headers=self.headers,
+            data=data,
+            timeout=self.timeout,
+            files=files + crop_files,
+        )
+
     def get_detection_url(self, detection_id: int) -> Response:
         """Retrieve the URL of the media linked to a detection
 
@@ -56,6 +56,51 @@ def test_create_detection_forwards_recorded_at(monkeypatch):
     assert "recorded_at" not in captured["data"]
 
 
+def test_create_detections_batch_forwards_frames(monkeypatch):
+    """Per-frame fields are repeated in frame order, crops flattened after the frames."""
+
+    class _Resp:
+        status_code = 200
+        text = "ok"
+
+    captured: dict = {}
+
+    def fake_post(url, headers=None, data=None, timeout=None, files=None):
+        captured.update(url=url, data=data, files=files)
+        return _Resp()
+
+    monkeypatch.setattr(requests, "get", lambda *_args, **_kwargs: _Resp())
+    monkeypatch.setattr(requests, "post", fake_post)
+
+    api_client = Client("tok", "http://testserver", timeout=1)
+    api_client.create_detections_batch([
+        {
+            "media": b"img-0",
+            "bboxes": [(0.1, 0.1, 0.5, 0.8, 0.5)],
+            "pose_id": 1,
+            "recorded_at": "2026-07-21T14:30:00",
+            "crops": [b"crop-0"],
+        },
+        {"media": b"img-1", "bboxes": [], "pose_id": 2, "recorded_at": "2026-07-21T14:30:30", "crops": []},
+    ])
+    assert captured["url"].endswith("detections/batch")
+    assert captured["data"] == {
+        "bboxes": ["[(0.100,0.100,0.500,0.800,0.500)]", "[]"],
+        "pose_id": ["1", "2"],
+        "recorded_at": ["2026-07-21T14:30:00", "2026-07-21T14:30:30"],
+    }
+    assert [(key, payload[1]) for key, payload in captured["files"]] == [
+        ("file", b"img-0"),
+        ("file", b"img-1"),
+        ("crop", b"crop-0"),
+    ]
+
+    with pytest.raises(ValueError, match="crops must have the same length as bboxes"):
+        api_client.create_detections_batch([
+            {"media": b"img", "bboxes": [(0.1, 0.1, 0.5, 0.8, 0.5)], "pose_id": 1, "recorded_at": "x", "crops": []}
+        ])
+
+
 def test_get_current_poses_camera(cam_token, cam_pose_id):
     cam_client = Client(cam_token, "http://localhost:5050", timeout=10)
     response = cam_client.get_current_poses()
@@ -18,7 +18,7 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel.sql.expression import SelectOfScalar
 
 from app.api.dependencies import get_alert_crud, get_camera_crud, get_jwt, get_sequence_crud
-from app.core.time import utcnow
+from app.core.time import day_bounds, utcnow
 from app.crud import AlertCRUD, CameraCRUD, SequenceCRUD
 from app.db import get_session
 from app.models import Alert, AlertSequence, AnnotationType, Camera, Sequence, UserRole
@@ -121,7 +121,10 @@ async def _build_alerts_from_date_stmt(
         )
         seq_filter = max_conf_filter_clause(fwi_classes_by_camera)
 
-    alerts_stmt: Any = select(Alert).where(func.date(Alert.started_at) == from_date)
+    day_start, day_end = day_bounds(from_date)
+    alerts_stmt: Any = (
+        select(Alert).where(cast(Any, Alert.started_at) >= day_start).where(cast(Any, Alert.started_at) < day_end)
+    )
     if not is_admin:
         alerts_stmt = alerts_stmt.where(Alert.organization_id == organization_id)
     if seq_filter is not None:
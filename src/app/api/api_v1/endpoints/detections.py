@@ -4,19 +4,21 @@
 # See LICENSE or go to <https://www.apache.org/licenses/LICENSE-2.0> for full license details.
 
 
+import asyncio
 import itertools
 import logging
 import re
-from ast import literal_eval
 from datetime import datetime, timedelta
-from typing import AbstractSet, Any, Dict, List, Optional, Set, Tuple, Union, cast
+from typing import AbstractSet, Annotated, Any, Collection, Dict, List, Optional, Set, Tuple, Union, cast
 
+import numpy as np
 import pandas as pd
 from fastapi import (
     APIRouter,
     Depends,
     File,
     Form,
+    Header,
     HTTPException,
     Path,
     Response,
@@ -24,37 +26,43 @@ from fastapi import (
     UploadFile,
     status,
 )
+from pydantic import Field
 from sqlmodel import delete, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.api.dependencies import (
     get_camera_crud,
     get_detection_crud,
+    get_idempotency_key_crud,
     get_jwt,
     get_pose_crud,
     get_sequence_crud,
 )
+from app.core.bboxes import BBox, decode_bbox
 from app.core.config import settings
+from app.core.frames import Corners, FrameManifest
 from app.core.time import to_utc_naive, utcnow
-from app.crud import AlertCRUD, CameraCRUD, DetectionCRUD, PoseCRUD, SequenceCRUD
-from app.models import Alert, AlertSequence, Camera, Detection, Pose, Role, Sequence, UserRole
+from app.crud import AlertCRUD, CameraCRUD, DetectionCRUD, IdempotencyKeyCRUD, PoseCRUD, SequenceCRUD
+from app.models import Alert, AlertSequence, Camera, Detection, IdempotencyKey, Pose, Role, Sequence, UserRole
 from app.schemas.alerts import AlertCreate, AlertUpdate
 from app.schemas.detections import (
     BOX_PATTERN,
     BOXES_PATTERN,
     EMPTY_BBOXES,
+    DetectionBatchItem,
     DetectionCreate,
     DetectionRead,
-    DetectionSequence,
     DetectionUrl,
 )
 from app.schemas.login import TokenPayload
-from app.schemas.sequences import SequenceUpdate
-from app.services.cones import resolve_cone
+from app.services.bbox_matching import assign_boxes, match_matrices
+from app.services.cones import cone_from_bboxes
 from app.services.overlap import compute_overlap, haversine_km
-from app.services.sequence_confidence import max_conf_from_bboxes
-from app.services.storage import s3_service, upload_file
+from app.services.risk import risk_service
+from app.services.sequence_index import sequence_index
+from app.services.storage import media_spool, s3_service, upload_file
 from app.services.telemetry import telemetry_client
+from app.services.temporal import temporal_service
 
 logger = logging.getLogger("uvicorn.error")
 
@@ -69,43 +77,44 @@ def _bbox_list_to_str(bboxes: List[str]) -> str:
     return f"[{','.join(bboxes)}]"
 
 
-def _parse_bbox(bbox_str: str) -> Tuple[float, float, float, float, float]:
+def _parse_bbox(bbox_str: str) -> BBox:
     try:
-        bbox = literal_eval(bbox_str)
-    except (SyntaxError, ValueError) as exc:
+        return decode_bbox(bbox_str)
+    except ValueError as exc:
         raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid bbox format.") from exc
-    if not isinstance(bbox, tuple) or len(bbox) != 5:
-        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid bbox format.")
-    return cast(Tuple[float, float, float, float, float], bbox)
-
 
-def _bboxes_overlap(
-    left: Tuple[float, float, float, float, float],
-    right: Tuple[float, float, float, float, float],
-    tolerance: float = 0.0,
-) -> bool:
-    # A negative intersection is a gap: allow up to `tolerance` (relative coords) per axis
-    # so a plume whose bbox drifts between frames still matches its sequence.
-    lx_min, ly_min, lx_max, ly_max, _ = left
-    rx_min, ry_min, rx_max, ry_max, _ = right
-    inter_w = min(lx_max, rx_max) - max(lx_min, rx_min)
-    inter_h = min(ly_max, ry_max) - max(ly_min, ry_min)
-    return inter_w > -tolerance and inter_h > -tolerance
 
-
-async def _get_last_bbox_for_sequence(
+async def _sync_sequence_index(
     detections: DetectionCRUD,
-    sequence_id: int,
-) -> Optional[Tuple[float, float, float, float, float]]:
-    # Continuity rows (empty bbox) are skipped: spatial matching must compare against the
-    # last real evidence, not against a frame where nothing was detected.
-    det = await detections.get_latest_with_bbox(sequence_id)
-    if det is None:
-        return None
-    bbox_strs = _extract_bbox_strings(det.bbox)
-    if not bbox_strs:
-        return None
-    return _parse_bbox(bbox_strs[0])
+    sequences: SequenceCRUD,
+    camera_id: int,
+    pose_id: int,
+) -> None:
+    """Align the index on the sequences of the pose open to bbox matching.
+
+    The active sequences are queried once per frame (the source of truth across workers); their
+    last bboxes come from the process index and are only reloaded, in a single query, for the
+    sequences that are new to it or got a detection added or deleted through another worker since indexed.
+    """
+    active_sequences = await sequences.fetch_all(
+        filters=[("camera_id", camera_id), ("pose_id", pose_id)],
+        inequality_pair=(
+            "last_seen_at",
+            ">",
+            utcnow() - timedelta(seconds=settings.SEQUENCE_RELAXATION_SECONDS),
+        ),
+    )
+    versions_by_id = {
+        seq.id: (seq.last_seen_at, seq.detection_removed_at) for seq in active_sequences if seq.id is not None
+    }
+    stale_ids = sequence_index.sync(camera_id, pose_id, versions_by_id)
+    if stale_ids:
+        latest_by_seq = {det.sequence_id: det for det in await detections.get_latest_with_bbox_in(stale_ids)}
+        for seq_id in stale_ids:
+            det = latest_by_seq.get(seq_id)
+            last_bbox = det.primary_bbox if det is not None else None
+            last_seen_at, detection_removed_at = versions_by_id[seq_id]
+            sequence_index.put(camera_id, pose_id, seq_id, last_seen_at, last_bbox, detection_removed_at)
 
 
 async def _get_continuity_sequences(
@@ -136,7 +145,7 @@ async def _create_continuity_detection(
 
     Continuity rows keep the sequence's frame timeline gapless for the temporal model.
     They never refresh last_seen_at nor max_conf: the sequence's lifetime and confidence
-    track real evidence only.
+    track real evidence only. Only flushed: committed with the rest of the frame.
     """
     return await detections.create(
         DetectionCreate(
@@ -146,7 +155,19 @@ async def _create_continuity_detection(
             bbox=EMPTY_BBOXES,
             sequence_id=sequence_id,
             recorded_at=recorded_at,
-        )
+            frame_spooled=media_spool.is_enabled,
+        ),
+        commit=False,
+    )
+
+
+async def _enqueue_validations(sequences: SequenceCRUD, camera_id: int, sequence_ids: Collection[int]) -> None:
+    """Queue the sequences for validation, ranked by their priority (the camera's fire risk included)."""
+    await sequences.enqueue_validations(
+        sequence_ids,
+        commit=False,
+        risk_priority=risk_service.priority(camera_id),
+        priority_seconds=settings.TEMPORAL_VALIDATION_PRIORITY_SECONDS,
     )
 
 
@@ -162,8 +183,8 @@ async def _attach_continuity_detections(
 ) -> List[Detection]:
     """Attach the frame as a continuity row to every given sequence not already covered.
 
-    Each touched sequence is re-enqueued for validation: its frame set changed even though
-    no real evidence was added.
+    Each touched sequence gets the frame in its manifest and is re-enqueued for validation:
+    its frame set changed even though no real evidence was added.
     """
     created: List[Detection] = []
     for seq in continuity_sequences:
@@ -172,7 +193,12 @@ async def _attach_continuity_detections(
         created.append(
             await _create_continuity_detection(detections, camera_id, pose_id, bucket_key, seq.id, recorded_at)
         )
-        await sequences.enqueue_validation(seq.id)
+    await sequences.record_frames(
+        {cast(int, det.sequence_id): [(bucket_key, None)] for det in created},
+        keep_last=temporal_service.MAX_FRAMES,
+        commit=False,
+    )
+    await _enqueue_validations(sequences, camera_id, [cast(int, det.sequence_id) for det in created])
     return created
 
 
@@ -511,6 +537,249 @@ async def _attach_sequence_to_alert(
     return alert_id
 
 
+async def _seed_sequences(
+    detections: DetectionCRUD,
+    sequences: SequenceCRUD,
+    pose: Pose,
+    camera: Camera,
+    frame_dets: List[Detection],
+) -> List[int]:
+    """Open a sequence for each unmatched detection of the frame backed by enough recent evidence.
+
+    An unmatched detection seeds a sequence when at least SEQUENCE_MIN_INTERVAL_DETS recent
+    unassigned detections of the pose (itself and its frame siblings included) overlap it, and
+    they are all attached to it. The candidates are fetched once per frame and compared to all
+    the unmatched boxes in a single overlap matrix. Only flushed: committed with the rest of the
+    frame. Returns the ids of the created sequences.
+    """
+    # Candidates are compared on the bbox columns decoded at their own ingest
+    candidates: List[Tuple[Detection, BBox]] = [
+        (cand, cand_bbox)
+        for cand in await detections.fetch_all(
+            filters=[("camera_id", pose.camera_id), ("pose_id", pose.id), ("sequence_id", None)],
+            inequality_pair=(
+                "created_at",
+                ">",
+                utcnow() - timedelta(seconds=settings.SEQUENCE_MIN_INTERVAL_SECONDS),
+            ),
+            order_by="created_at",
+            order_desc=False,
+        )
+        if (cand_bbox := cand.primary_bbox) is not None
+    ]
+    unmatched = [det for det in frame_dets if det.sequence_id is None]
+    overlaps, _ = match_matrices(
+        [cast(BBox, det.primary_bbox) for det in unmatched],
+        [cand_bbox for _, cand_bbox in candidates],
+        settings.SEQUENCE_BBOX_TOLERANCE,
+    )
+    column_by_id = {cand.id: col for col, (cand, _) in enumerate(candidates)}
+    attached = np.zeros(len(candidates), dtype=bool)
+    seeded: List[int] = []
+    for row, det in enumerate(unmatched):
+        # Already attached to the sequence seeded by an overlapping sibling of the frame
+        if (col := column_by_id.get(det.id)) is not None and attached[col]:
+            continue
+        overlapping = np.flatnonzero(overlaps[row] & ~attached)
+        if len(overlapping) < settings.SEQUENCE_MIN_INTERVAL_DETS:
+            continue
+        overlapping_dets = [candidates[col] for col in overlapping.tolist()]
+        # Candidates are in created_at order: the first one opens the sequence
+        first_det, first_bbox = overlapping_dets[0]
+        cone_azimuth, cone_angle = cone_from_bboxes(pose.azimuth, [first_bbox], camera.angle_of_view)
+        sequence_ = await sequences.create(
+            Sequence(
+                camera_id=pose.camera_id,
+                pose_id=pose.id,
+                camera_azimuth=pose.azimuth,
+                sequence_azimuth=cone_azimuth,
+                cone_angle=cone_angle,
+                started_at=first_det.created_at,
+                last_seen_at=max(cand.created_at for cand, _ in overlapping_dets),
+                max_conf=max(cand_bbox[4] for _, cand_bbox in overlapping_dets),
+            ),
+            commit=False,
+        )
+        # The manifest columns are excluded from the create payload: set on the flushed row
+        sequence_.sqlmodel_update(
+            FrameManifest.build(
+                ((cand.bucket_key, cast(Corners, cand_bbox[:4])) for cand, cand_bbox in overlapping_dets),
+                temporal_service.MAX_FRAMES,
+            ).columns()
+        )
+        await detections.assign_sequence(
+            [cast(int, cand.id) for cand, _ in overlapping_dets], cast(int, sequence_.id), commit=False
+        )
+        attached[overlapping] = True
+        for cand, _ in overlapping_dets:
+            cand.sequence_id = sequence_.id
+        sequence_index.put(pose.camera_id, pose.id, sequence_.id, sequence_.last_seen_at, cast(BBox, det.primary_bbox))
+        seeded.append(sequence_.id)
+    return seeded
+
+
+def _validate_bbox_strings(bboxes: str) -> List[str]:
+    """Split a bboxes payload into its boxes, rejecting any box with inverted coordinates.
+
+    The regex already constrains the format; parsing validates coordinate ordering on every
+    box (an empty list parses to no box at all and is a valid frame with no detection).
+    """
+    bbox_strings = _extract_bbox_strings(bboxes)
+    if any(box[0] >= box[2] or box[1] >= box[3] for box in map(_parse_bbox, bbox_strings)):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="xmin & ymin are expected to be respectively smaller than xmax & ymax",
+        )
+    return bbox_strings
+
+
+def _authorize_pose(pose: Pose, camera_id: int) -> None:
+    if pose.camera_id != camera_id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access forbidden.")
+    if not pose.active:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Pose is not active.")
+
+
+async def _ingest_frame(
+    bbox_strings: List[str],
+    file: UploadFile,
+    crops: List[UploadFile],
+    pose: Pose,
+    recorded_at: datetime,
+    organization_id: int,
+    detections: DetectionCRUD,
+    sequences: SequenceCRUD,
+    cameras: CameraCRUD,
+) -> Optional[Detection]:
+    """Upload a frame and run it through sequence matching; returns its first detection.
+
+    Shared by the single and batch ingest routes: the caller has already validated the
+    bboxes, authorized the pose and aligned the crops. Returns None for a frame with no
+    bbox that extends no sequence, in which case nothing is uploaded nor stored.
+
+    Writes are only flushed, as a unit of work the caller commits: a frame is never applied
+    partially, and sequence updates and queue marks run as one statement each.
+    """
+    camera_id = pose.camera_id
+    # Frame with no detection: it only matters as continuity for recently-seen sequences of
+    # the pose. Without one, store nothing at all — empty frames must never seed a sequence
+    # (the historical placeholder bboxes did, creating phantom sequences).
+    if not bbox_strings:
+        continuity_sequences = await _get_continuity_sequences(sequences, camera_id, pose.id)
+        if not continuity_sequences:
+            return None
+        bucket_key = await upload_file(file, organization_id, camera_id, spool=True)
+        continuity_dets = await _attach_continuity_detections(
+            detections, sequences, continuity_sequences, camera_id, pose.id, bucket_key, recorded_at
+        )
+        return continuity_dets[0]
+
+    # Upload media: the frame and its crops concurrently (or only write them to the local spool
+    # in write-behind mode, see S3_SPOOL_DIR).
+    # Prefix crops with the bbox index so byte-identical crops in the same request still get
+    # distinct keys; each detection then owns its crop object (safe to delete independently).
+    bucket_key, *uploaded_crop_keys = await asyncio.gather(
+        upload_file(file, organization_id, camera_id, spool=True),
+        *(
+            upload_file(crop, organization_id, camera_id, key_prefix=f"crop_{idx}_", spool=True)
+            for idx, crop in enumerate(crops)
+        ),
+    )
+    crop_bucket_keys: List[Optional[str]] = list(uploaded_crop_keys) if crops else [None] * len(bbox_strings)
+
+    created: List[Detection] = []
+    camera = cast(Camera, await cameras.get(camera_id, strict=True))
+    await _sync_sequence_index(detections, sequences, camera_id, pose.id)
+    # sequences touched by this frame, to mark due for validation (DB-backed queue).
+    affected_sequences: Set[int] = set()
+    # matched sequence id -> (last_seen_at, confidences of the matched bboxes), applied in one statement
+    matches: Dict[int, Tuple[datetime, List[float]]] = {}
+    # matched sequence id -> the frame with the matched bboxes, for its frame manifest
+    matched_frames: Dict[int, List[Tuple[str, Optional[Corners]]]] = {}
+
+    # Match all the boxes of the frame against the pose's active sequences (the index) in one
+    # assignment step: each box goes to its best-fitting sequence, not to the first in reach.
+    det_bboxes = [_parse_bbox(bbox_str) for bbox_str in bbox_strings]
+    targets = [
+        (seq_id, entry.bbox) for seq_id, entry in sequence_index.active(camera_id, pose.id) if entry.bbox is not None
+    ]
+    assigned = assign_boxes(det_bboxes, [bbox for _, bbox in targets], settings.SEQUENCE_BBOX_TOLERANCE)
+
+    for idx, bbox_str in enumerate(bbox_strings):
+        matched_sequence_id = targets[target_idx][0] if (target_idx := assigned[idx]) is not None else None
+        single_bboxes = _bbox_list_to_str([bbox_str])
+        other_bbox_strings = bbox_strings[:idx] + bbox_strings[idx + 1 :]
+        others_bboxes = _bbox_list_to_str(other_bbox_strings) if other_bbox_strings else None
+        det = await detections.create(
+            DetectionCreate(
+                camera_id=camera_id,
+                pose_id=pose.id,
+                sequence_id=matched_sequence_id,
+                bucket_key=bucket_key,
+                crop_bucket_key=crop_bucket_keys[idx],
+                bbox=single_bboxes,
+                others_bboxes=others_bboxes,
+                recorded_at=recorded_at,
+                frame_spooled=media_spool.is_enabled,
+            ),
+            commit=False,
+        )
+        if matched_sequence_id is not None:
+            sequence_index.extend(matched_sequence_id, det.created_at, det_bboxes[idx])
+            # Only the primary bbox tracks the sequence; siblings in others_bboxes are unrelated detections.
+            matched_confs = matches[matched_sequence_id][1] if matched_sequence_id in matches else []
+            matches[matched_sequence_id] = (det.created_at, [*matched_confs, det_bboxes[idx][4]])
+            matched_frames.setdefault(matched_sequence_id, []).append((bucket_key, cast(Corners, det_bboxes[idx][:4])))
+            affected_sequences.add(matched_sequence_id)
+        created.append(det)
+
+    if any(target_idx is None for target_idx in assigned):
+        affected_sequences.update(await _seed_sequences(detections, sequences, pose, camera, created))
+
+    await sequences.extend_sequences(
+        {seq_id: (last_seen_at, max(confs)) for seq_id, (last_seen_at, confs) in matches.items()},
+        commit=False,
+    )
+    await sequences.record_frames(matched_frames, keep_last=temporal_service.MAX_FRAMES, commit=False)
+
+    # Continuity pass: a recently-seen sequence of this pose whose object was not detected on
+    # this frame (no bbox matched it, e.g. one of two smokes faded) still gets the frame,
+    # attached with an empty bbox, so its frame timeline stays gapless for the temporal model.
+    # The helper enqueues validation itself, so these sequences stay out of affected_sequences.
+    await _attach_continuity_detections(
+        detections,
+        sequences,
+        await _get_continuity_sequences(sequences, camera_id, pose.id),
+        camera_id,
+        pose.id,
+        bucket_key,
+        recorded_at,
+        skip_sequence_ids=affected_sequences,
+    )
+
+    # Mark touched sequences due for validation (idempotent: one queue entry per sequence,
+    # whichever uvicorn worker received the detection). The per-process validation worker
+    # claims due sequences from the DB and runs the gated pipeline: triangulation and ALL
+    # notification channels (webhooks, Telegram, Slack) fire only once validated.
+    await _enqueue_validations(sequences, camera_id, affected_sequences)
+
+    return created[0]
+
+
+async def _settle_spooled_frames(detections: DetectionCRUD, organization_id: int, bucket_keys: Set[str]) -> None:
+    """Clear the spool flag of the committed frames the uploader already flushed.
+
+    The uploader clears the flags of the frames it uploads, but a frame flushed before its
+    detections were committed had no row to clear yet: the frame's file leaves the spool
+    before its flag is cleared, so checking the spool after the commit leaves none behind.
+    """
+    if not media_spool.is_enabled:
+        return
+    flushed = [key for key in bucket_keys if not media_spool.pending(organization_id, [key])]
+    if flushed:
+        await detections.mark_frames_uploaded(flushed)
+
+
 @router.post(
     "/",
     status_code=status.HTTP_201_CREATED,
@@ -537,29 +806,31 @@ async def create_detection(
     ),
     file: UploadFile = File(..., alias="file"),
     crop_files: Optional[List[UploadFile]] = File(None, alias="crop"),
+    idempotency_key: Optional[str] = Header(
+        None,
+        alias="Idempotency-Key",
+        min_length=1,
+        max_length=255,
+        description=(
+            "Client-generated id of the upload, resent on retries: a key already used by the camera "
+            f"within the last {settings.IDEMPOTENCY_KEY_TTL_SECONDS}s returns the original response "
+            "without storing the frame again."
+        ),
+    ),
     detections: DetectionCRUD = Depends(get_detection_crud),
     sequences: SequenceCRUD = Depends(get_sequence_crud),
     cameras: CameraCRUD = Depends(get_camera_crud),
     poses: PoseCRUD = Depends(get_pose_crud),
+    idempotency_keys: IdempotencyKeyCRUD = Depends(get_idempotency_key_crud),
     token_payload: TokenPayload = Security(get_jwt, scopes=[Role.CAMERA]),
 ) -> Union[Detection, Response]:
     telemetry_client.capture(f"camera|{token_payload.sub}", event="detections-create")
 
-    # The Form regex already constrains the format; parse to validate coordinate ordering on
-    # every box (an empty list parses to no box at all and is a valid frame with no detection).
-    bbox_strings = _extract_bbox_strings(bboxes)
-    if any(box[0] >= box[2] or box[1] >= box[3] for box in map(_parse_bbox, bbox_strings)):
-        raise HTTPException(
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            detail="xmin & ymin are expected to be respectively smaller than xmax & ymax",
-        )
+    bbox_strings = _validate_bbox_strings(bboxes)
 
     # Authorize before any S3 upload to avoid orphan objects on 403
     pose = cast(Pose, await poses.get(pose_id, strict=True))
-    if pose.camera_id != token_payload.sub:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access forbidden.")
-    if not pose.active:
-        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Pose is not active.")
+    _authorize_pose(pose, token_payload.sub)
 
     # Validate crop/bbox alignment before any S3 upload to avoid orphan objects.
     # Each crop frames a single object, so there must be exactly one crop per bbox (or none at all).
@@ -576,153 +847,135 @@ async def create_detection(
     # ones are assumed UTC, and all rows from a single upload share the same capture time.
     effective_recorded_at = to_utc_naive(recorded_at) if recorded_at is not None else utcnow()
 
-    # Frame with no detection: it only matters as continuity for recently-seen sequences of
-    # the pose. Without one, store nothing at all — empty frames must never seed a sequence
-    # (the historical placeholder bboxes did, creating phantom sequences).
-    if not bbox_strings:
-        continuity_sequences = await _get_continuity_sequences(sequences, token_payload.sub, pose_id)
-        if not continuity_sequences:
+    # A retry of an upload already applied (the engine timed out waiting for the response)
+    # replays its outcome: no second upload, no second pass through sequence matching.
+    if idempotency_key is not None and not await idempotency_keys.claim(
+        token_payload.sub, idempotency_key, settings.IDEMPOTENCY_KEY_TTL_SECONDS
+    ):
+        outcome = cast(IdempotencyKey, await idempotency_keys.get_outcome(token_payload.sub, idempotency_key))
+        if outcome.detection_id is None:
             return Response(status_code=status.HTTP_204_NO_CONTENT)
-        bucket_key = await upload_file(file, token_payload.organization_id, token_payload.sub)
-        continuity_dets = await _attach_continuity_detections(
-            detections, sequences, continuity_sequences, token_payload.sub, pose_id, bucket_key, effective_recorded_at
-        )
-        return DetectionRead(**continuity_dets[0].model_dump())
-
-    # Upload media
-    bucket_key = await upload_file(file, token_payload.organization_id, token_payload.sub)
-    crop_bucket_keys: List[Optional[str]] = [None] * len(bbox_strings)
-    for idx, crop in enumerate(crops):
-        # Prefix with the bbox index so byte-identical crops in the same request still get
-        # distinct keys; each detection then owns its crop object (safe to delete independently).
-        crop_bucket_keys[idx] = await upload_file(
-            crop, token_payload.organization_id, token_payload.sub, key_prefix=f"crop_{idx}_"
-        )
+        return DetectionRead(**cast(Detection, await detections.get(outcome.detection_id, strict=True)).model_dump())
 
-    created: List[Detection] = []
-    camera = cast(Camera, await cameras.get(token_payload.sub, strict=True))
-    # sequences touched by this request, to mark due for validation (DB-backed queue).
-    affected_sequences: Set[int] = set()
+    det = await _ingest_frame(
+        bbox_strings,
+        file,
+        crops,
+        pose,
+        effective_recorded_at,
+        token_payload.organization_id,
+        detections,
+        sequences,
+        cameras,
+    )
+    if idempotency_key is not None:
+        await idempotency_keys.record(token_payload.sub, idempotency_key, det.id if det is not None else None)
+    # Single commit for the whole frame, key included (the CRUDs share the request session)
+    await detections.session.commit()
+    if det is None:
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+    await _settle_spooled_frames(detections, token_payload.organization_id, {det.bucket_key})
+    return DetectionRead(**det.model_dump())
 
-    for idx, bbox_str in enumerate(bbox_strings):
-        single_bboxes = _bbox_list_to_str([bbox_str])
-        other_bbox_strings = bbox_strings[:idx] + bbox_strings[idx + 1 :]
-        others_bboxes = _bbox_list_to_str(other_bbox_strings) if other_bbox_strings else None
-        det = await detections.create(
-            DetectionCreate(
-                camera_id=token_payload.sub,
-                pose_id=pose_id,
-                bucket_key=bucket_key,
-                crop_bucket_key=crop_bucket_keys[idx],
-                bbox=single_bboxes,
-                others_bboxes=others_bboxes,
-                recorded_at=effective_recorded_at,
-            )
-        )
 
-        det_bbox = _parse_bbox(bbox_str)
-        # Sequence handling
-        # Check if there is a sequence that was seen recently
-        candidate_sequences = await sequences.fetch_all(
-            filters=[("camera_id", token_payload.sub), ("pose_id", pose_id)],
-            inequality_pair=(
-                "last_seen_at",
-                ">",
-                utcnow() - timedelta(seconds=settings.SEQUENCE_RELAXATION_SECONDS),
-            ),
-            order_by="last_seen_at",
-            order_desc=True,
+@router.post(
+    "/batch",
+    status_code=status.HTTP_201_CREATED,
+    summary="Register a batch of buffered frames",
+    description=(
+        "Replays frames buffered on-device (e.g. during an uplink outage) in a single request. "
+        "Fields are repeated once per frame, in the same order: `bboxes`, `pose_id`, "
+        "`recorded_at` and `file`. Crops are optional: either none at all, or one `crop` per "
+        "bbox across the whole batch, ordered by frame then by bbox. Frames are processed in "
+        "`recorded_at` order; results are returned in request order, with a null detection for "
+        "an empty frame that extended no sequence."
+    ),
+)
+async def create_detections_batch(
+    bboxes: List[str] = Form(
+        ...,
+        description="bbox list of each frame, in the same format as the single-frame route",
+    ),
+    pose_ids: List[Annotated[int, Field(gt=0)]] = Form(..., alias="pose_id", description="pose id of each frame"),
+    recorded_at: List[datetime] = Form(
+        ...,
+        description=(
+            "Capture timestamp of each frame. Timezone-aware values are converted to UTC; naive values are assumed UTC."
+        ),
+    ),
+    files: List[UploadFile] = File(..., alias="file"),
+    crop_files: Optional[List[UploadFile]] = File(None, alias="crop"),
+    detections: DetectionCRUD = Depends(get_detection_crud),
+    sequences: SequenceCRUD = Depends(get_sequence_crud),
+    cameras: CameraCRUD = Depends(get_camera_crud),
+    poses: PoseCRUD = Depends(get_pose_crud),
+    token_payload: TokenPayload = Security(get_jwt, scopes=[Role.CAMERA]),
+) -> List[DetectionBatchItem]:
+    telemetry_client.capture(
+        f"camera|{token_payload.sub}", event="detections-create-batch", properties={"frames": len(files)}
+    )
+
+    num_frames = len(files)
+    if not (len(bboxes) == len(pose_ids) == len(recorded_at) == num_frames):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Each frame needs its own bboxes, pose_id, recorded_at and file.",
         )
-        matched_sequence: Optional[Sequence] = None
-        for seq in candidate_sequences:
-            if seq.id is None:
-                continue
-            last_bbox = await _get_last_bbox_for_sequence(detections, seq.id)
-            if last_bbox is not None and _bboxes_overlap(last_bbox, det_bbox, settings.SEQUENCE_BBOX_TOLERANCE):
-                matched_sequence = seq
-                break
-
-        if matched_sequence is not None:
-            await sequences.update(matched_sequence.id, SequenceUpdate(last_seen_at=det.created_at))
-            det = await detections.update(det.id, DetectionSequence(sequence_id=matched_sequence.id))
-            # Only the primary bbox tracks the sequence; siblings in others_bboxes are unrelated detections.
-            det_max_conf = max_conf_from_bboxes(det.bbox)
-            if det_max_conf is not None:
-                await sequences.bump_max_conf(matched_sequence.id, det_max_conf)
-            affected_sequences.add(matched_sequence.id)
-        else:
-            det_filters: List[tuple[str, Any]] = [
-                ("camera_id", token_payload.sub),
-                ("pose_id", pose_id),
-                ("sequence_id", None),
-            ]
-            dets_ = await detections.fetch_all(
-                filters=det_filters,
-                inequality_pair=(
-                    "created_at",
-                    ">",
-                    utcnow() - timedelta(seconds=settings.SEQUENCE_MIN_INTERVAL_SECONDS),
-                ),
-                order_by="created_at",
-                order_desc=False,
-            )
-            overlapping_dets: List[Detection] = []
-            for cand in dets_:
-                cand_bbox_strs = _extract_bbox_strings(cand.bbox)
-                if not cand_bbox_strs:
-                    continue
-                cand_bbox = _parse_bbox(cand_bbox_strs[0])
-                if _bboxes_overlap(cand_bbox, det_bbox, settings.SEQUENCE_BBOX_TOLERANCE):
-                    overlapping_dets.append(cand)
-
-            if len(overlapping_dets) >= settings.SEQUENCE_MIN_INTERVAL_DETS:
-                first_det = min(overlapping_dets, key=lambda item: item.created_at)
-                cone_azimuth, cone_angle = resolve_cone(pose.azimuth, first_det.bbox, camera.angle_of_view)
-                seq_max_conf = max_conf_from_bboxes(*[d.bbox for d in overlapping_dets])
-                sequence_ = await sequences.create(
-                    Sequence(
-                        camera_id=token_payload.sub,
-                        pose_id=pose_id,
-                        camera_azimuth=pose.azimuth,
-                        sequence_azimuth=cone_azimuth,
-                        cone_angle=cone_angle,
-                        started_at=first_det.created_at,
-                        last_seen_at=det.created_at,
-                        max_conf=seq_max_conf,
-                    )
-                )
-                for det_ in overlapping_dets:
-                    updated = await detections.update(det_.id, DetectionSequence(sequence_id=sequence_.id))
-                    if det_.id == det.id:
-                        det = updated
-                affected_sequences.add(sequence_.id)
+    if num_frames > settings.MAX_FRAMES_PER_BATCH:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"A batch holds at most {settings.MAX_FRAMES_PER_BATCH} frames.",
+        )
+    # List form fields are not pattern-checked by FastAPI: apply the single route's constraints here.
+    if any(len(raw) > settings.MAX_BBOX_STR_LENGTH or re.fullmatch(BOXES_PATTERN, raw) is None for raw in bboxes):
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid bbox format.")
+    frame_bboxes = [_validate_bbox_strings(raw) for raw in bboxes]
 
-        created.append(det)
+    # Authorize every pose before any S3 upload to avoid orphan objects on 403
+    pose_by_id = {pose.id: pose for pose in await poses.get_in(list(set(pose_ids)), "id")}
+    if any(pose_id not in pose_by_id for pose_id in pose_ids):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Table Pose has no corresponding entry.")
+    for pose in pose_by_id.values():
+        _authorize_pose(pose, token_payload.sub)
 
-    # Continuity pass: a recently-seen sequence of this pose whose object was not detected on
-    # this frame (no bbox matched it, e.g. one of two smokes faded) still gets the frame,
-    # attached with an empty bbox, so its frame timeline stays gapless for the temporal model.
-    # The helper enqueues validation itself, so these sequences stay out of affected_sequences.
-    await _attach_continuity_detections(
-        detections,
-        sequences,
-        await _get_continuity_sequences(sequences, token_payload.sub, pose_id),
-        token_payload.sub,
-        pose_id,
-        bucket_key,
-        effective_recorded_at,
-        skip_sequence_ids=affected_sequences,
+    # One crop per bbox across the whole batch (or none at all), split back per frame.
+    crops = crop_files or []
+    if crops and len(crops) != sum(len(boxes) for boxes in frame_bboxes):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Number of crops must match the number of bboxes.",
+        )
+    frame_crops: List[List[UploadFile]] = []
+    offset = 0
+    for boxes in frame_bboxes:
+        frame_crops.append(crops[offset : offset + len(boxes)] if crops else [])
+        offset += len(boxes)
+
+    # Replay in capture order so sequence matching sees the frames as the camera shot them
+    # (ties keep request order); every frame keeps its own capture time.
+    capture_times = [to_utc_naive(ts) for ts in recorded_at]
+    results: List[Optional[DetectionRead]] = [None] * num_frames
+    for idx in sorted(range(num_frames), key=lambda i: (capture_times[i], i)):
+        det = await _ingest_frame(
+            frame_bboxes[idx],
+            files[idx],
+            frame_crops[idx],
+            pose_by_id[pose_ids[idx]],
+            capture_times[idx],
+            token_payload.organization_id,
+            detections,
+            sequences,
+            cameras,
+        )
+        if det is not None:
+            results[idx] = DetectionRead(**det.model_dump())
+    # Single commit for the whole batch (the CRUDs share the request session): a batch is
+    # applied entirely or not at all
+    await detections.session.commit()
+    await _settle_spooled_frames(
+        detections, token_payload.organization_id, {det.bucket_key for det in results if det is not None}
     )
-
-    # Mark touched sequences due for validation (idempotent: one queue entry per sequence,
-    # whichever uvicorn worker received the detection). The per-process validation worker
-    # claims due sequences from the DB and runs the gated pipeline: triangulation and ALL
-    # notification channels (webhooks, Telegram, Slack) fire only once validated.
-    for seq_id in affected_sequences:
-        await sequences.enqueue_validation(seq_id)
-
-    first_det = cast(Detection, await detections.get(created[0].id, strict=True))
-    return DetectionRead(**first_det.model_dump())
+    return [DetectionBatchItem(frame_index=idx, detection=det) for idx, det in enumerate(results)]
 
 
 @router.get("/{detection_id}", status_code=status.HTTP_200_OK, summary="Fetch the information of a specific detection")
@@ -790,6 +1043,7 @@ async def delete_detection(
     detection_id: int = Path(..., gt=0),
     detections: DetectionCRUD = Depends(get_detection_crud),
     cameras: CameraCRUD = Depends(get_camera_crud),
+    sequences: SequenceCRUD = Depends(get_sequence_crud),
     token_payload: TokenPayload = Security(get_jwt, scopes=[UserRole.ADMIN]),
 ) -> None:
     telemetry_client.capture(token_payload.sub, event="detections-deletion", properties={"detection_id": detection_id})
@@ -799,8 +1053,15 @@ async def delete_detection(
     # The frame object is shared by every detection of the same upload (multi-bbox siblings,
     # continuity rows): only delete it once no other row references it. Crops are per-row.
     sharing = await detections.fetch_all(filters=("bucket_key", detection.bucket_key))
+    # A file still in the write-behind spool must not reach the bucket after its deletion.
     if all(d.id == detection_id for d in sharing):
+        media_spool.discard(camera.organization_id, detection.bucket_key)
         bucket.delete_file(detection.bucket_key)
     if detection.crop_bucket_key:
+        media_spool.discard(camera.organization_id, detection.crop_bucket_key)
         bucket.delete_file(detection.crop_bucket_key)
+    # The sequence may have lost a frame or its last bbox: let the worker rebuild its frame
+    # manifest, and the next frame reload it in every worker (see SequenceIndex)
+    if detection.sequence_id is not None:
+        await sequences.record_detection_removal(detection.sequence_id, commit=False)
     await detections.delete(detection_id)
@@ -8,11 +8,11 @@ from datetime import date, timedelta
 from typing import Any, List, Union, cast
 
 from fastapi import APIRouter, Depends, HTTPException, Path, Query, Security, status
-from sqlmodel import delete, func, select
+from sqlmodel import delete, select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.api.dependencies import get_alert_crud, get_camera_crud, get_detection_crud, get_jwt, get_sequence_crud
-from app.core.time import utcnow
+from app.core.time import day_bounds, utcnow
 from app.crud import AlertCRUD, CameraCRUD, DetectionCRUD, SequenceCRUD
 from app.db import get_session
 from app.models import AlertSequence, AnnotationType, Camera, Detection, Sequence, UserRole
@@ -24,6 +24,7 @@ from app.services.alerts import refresh_alert_state
 from app.services.risk import FwiClass, risk_service
 from app.services.sequence_confidence import max_conf_filter_clause
 from app.services.sequence_counts import get_detection_counts_by_sequence_ids
+from app.services.sequence_index import sequence_index
 from app.services.storage import s3_service
 from app.services.telemetry import telemetry_client
 
@@ -168,7 +169,12 @@ async def fetch_sequences_from_date(
     telemetry_client.capture(token_payload.sub, event="sequence-fetch-from-date")
     is_admin = token_payload.is_admin
 
-    stmt: Any = select(Sequence).where(func.date(Sequence.started_at) == from_date)
+    day_start, day_end = day_bounds(from_date)
+    stmt: Any = (
+        select(Sequence)
+        .where(cast(Any, Sequence.started_at) >= day_start)
+        .where(cast(Any, Sequence.started_at) < day_end)
+    )
     # Admins see every organization's sequences without risk-score filtering
     if not is_admin:
         # Limit to cameras in the same organization
@@ -215,6 +221,7 @@ async def delete_sequence(
     await session.commit()
     # Delete the sequence
     await sequences.delete(sequence_id)
+    sequence_index.discard(sequence_id)
     # Refresh affected alerts
     for aid in alert_ids:
         await refresh_alert_state(aid, session, alerts)
@@ -237,6 +244,7 @@ async def label_sequence(
         await verify_org_rights(token_payload.organization_id, sequence.camera_id, cameras)
 
     updated = await sequences.update(sequence_id, payload)
+    sequence_index.discard(sequence_id)
 
     if payload.is_wildfire is None or payload.is_wildfire == AnnotationType.WILDFIRE_SMOKE:
         return updated
@@ -15,7 +15,16 @@ from pydantic import BaseModel, ValidationError
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
-from app.crud import AlertCRUD, CameraCRUD, DetectionCRUD, OrganizationCRUD, SequenceCRUD, UserCRUD, WebhookCRUD
+from app.crud import (
+    AlertCRUD,
+    CameraCRUD,
+    DetectionCRUD,
+    IdempotencyKeyCRUD,
+    OrganizationCRUD,
+    SequenceCRUD,
+    UserCRUD,
+    WebhookCRUD,
+)
 from app.crud.crud_occlusion_mask import OcclusionMaskCRUD
 from app.crud.crud_pose import PoseCRUD
 from app.db import get_session
@@ -74,6 +83,10 @@ def get_alert_crud(session: AsyncSession = Depends(get_session)) -> AlertCRUD:
     return AlertCRUD(session=session)
 
 
+def get_idempotency_key_crud(session: AsyncSession = Depends(get_session)) -> IdempotencyKeyCRUD:
+    return IdempotencyKeyCRUD(session=session)
+
+
 def decode_token(token: str, authenticate_value: Union[str, None] = None) -> Dict[str, str]:
     try:
         payload = jwt_decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
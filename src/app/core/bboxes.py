@@ -0,0 +1,72 @@
+# Copyright (C) 2026, Pyronear.
+
+# This program is licensed under the Apache License 2.0.
+# See LICENSE or go to <https://www.apache.org/licenses/LICENSE-2.0> for full license details.
+
+import re
+from typing import Iterable, List, Sequence, Tuple, Union
+
+__all__ = [
+    "BOXES_PATTERN",
+    "BOX_PATTERN",
+    "EMPTY_BBOXES",
+    "FLOAT_PATTERN",
+    "BBox",
+    "decode_bbox",
+    "decode_bboxes",
+    "flatten_bboxes",
+    "unflatten_bboxes",
+]
+
+# Regex for a float between 0 and 1, with a maximum of 3 decimals
+FLOAT_PATTERN = r"(0?\.[0-9]{1,3}|0|1)"
+BOX_PATTERN = rf"\({FLOAT_PATTERN},{FLOAT_PATTERN},{FLOAT_PATTERN},{FLOAT_PATTERN},{FLOAT_PATTERN}\)"
+# An empty list is valid: a frame with no detection (kept for sequence continuity).
+BOXES_PATTERN = rf"^\[({BOX_PATTERN}(,{BOX_PATTERN})*)?\]$"
+
+# Stored bbox of a continuity detection: a frame attached to a sequence with no detection on it.
+EMPTY_BBOXES = "[]"
+
+# Relative coords in order xmin, ymin, xmax, ymax, conf
+BBox = Tuple[float, float, float, float, float]
+
+_BOX_RE = re.compile(BOX_PATTERN)
+
+
+def _to_bbox(match: "re.Match[str]") -> BBox:
+    xmin, ymin, xmax, ymax, conf = (float(group) for group in match.groups())
+    return xmin, ymin, xmax, ymax, conf
+
+
+def decode_bbox(bbox_str: str) -> BBox:
+    """Decode a single box of the string API format, e.g. ``(.1,.1,.7,.8,.9)``.
+
+    Raises:
+        ValueError: if the string is not exactly one box
+    """
+    match = _BOX_RE.fullmatch(bbox_str)
+    if match is None:
+        raise ValueError(f"invalid bbox: {bbox_str!r}")
+    return _to_bbox(match)
+
+
+def decode_bboxes(bboxes: Union[str, None]) -> List[BBox]:
+    """Decode the boxes of a bbox list string, e.g. ``[(.1,.1,.7,.8,.9),(...)]``; malformed boxes are skipped."""
+    if not bboxes:
+        return []
+    return [_to_bbox(match) for match in _BOX_RE.finditer(bboxes)]
+
+
+def flatten_bboxes(bboxes: Iterable[BBox]) -> List[float]:
+    """Compact array form of boxes (``[xmin, ymin, xmax, ymax, conf, xmin, ...]``), as stored in the DB."""
+    return [coord for bbox in bboxes for coord in bbox]
+
+
+def unflatten_bboxes(coords: Union[Sequence[float], None]) -> List[BBox]:
+    """Inverse of ``flatten_bboxes``."""
+    if not coords:
+        return []
+    return [
+        (coords[idx], coords[idx + 1], coords[idx + 2], coords[idx + 3], coords[idx + 4])
+        for idx in range(0, len(coords) - 4, 5)
+    ]
@@ -61,6 +61,13 @@ class Settings(BaseSettings):
         + ((MAX_BOXES_PER_DETECTION - 1) - 1) * 2
     )
 
+    # Batch ingest: max frames replayed by a single POST /detections/batch request (frames
+    # buffered on-device during an outage). Bounds the request body and the ingest time.
+    MAX_FRAMES_PER_BATCH: int = int(os.environ.get("MAX_FRAMES_PER_BATCH") or 30)
+    # How long an Idempotency-Key of POST /detections is remembered: must outlast the engine's
+    # retries of a timed-out upload, while keeping the key table small.
+    IDEMPOTENCY_KEY_TTL_SECONDS: int = int(os.environ.get("IDEMPOTENCY_KEY_TTL_SECONDS") or 3600)
+
     # Storage
     S3_ACCESS_KEY: str = os.environ["S3_ACCESS_KEY"]
     S3_SECRET_KEY: str = os.environ["S3_SECRET_KEY"]
@@ -68,6 +75,17 @@ class Settings(BaseSettings):
     S3_ENDPOINT_URL: str = os.environ["S3_ENDPOINT_URL"]
     S3_PROXY_URL: str = os.environ.get("S3_PROXY_URL", "")
     S3_URL_EXPIRATION: int = int(os.environ.get("S3_URL_EXPIRATION") or 24 * 3600)
+    # Max S3 uploads running at once per process. Uploads (blocking boto3 calls) run in worker
+    # threads off the event loop; the frame and crops of a detection are uploaded concurrently.
+    S3_UPLOAD_CONCURRENCY: int = int(os.environ.get("S3_UPLOAD_CONCURRENCY") or 8)
+    # Write-behind mode for detection media: when set, frames and crops are written to this local
+    # directory and the request returns at once; a background uploader drains it to S3 (same
+    # upload slots). The directory must survive restarts and be shared by the processes of a host.
+    # Empty (the default) uploads synchronously within the request.
+    S3_SPOOL_DIR: str = os.environ.get("S3_SPOOL_DIR", "")
+    # Pause between two passes of the spool uploader, and after a pass with failed uploads
+    S3_SPOOL_POLL_SECONDS: float = float(os.environ.get("S3_SPOOL_POLL_SECONDS") or 1.0)
+    S3_SPOOL_RETRY_SECONDS: float = float(os.environ.get("S3_SPOOL_RETRY_SECONDS") or 10.0)
     # Comma-separated browser origins allowed to fetch bucket objects cross-origin (the frontend
     # platform URLs). Applied as a CORS policy at bucket creation so the frontend can fetch()
     # presigned image URLs (e.g. the "download all" buttons). Deployments MUST set this to the
@@ -125,15 +143,58 @@ class Settings(BaseSettings):
     # Generous timeout: the temporal API serializes inference server-side, so with N uvicorn
     # workers a call can wait behind N-1 others; keep N * model latency under this value.
     TEMPORAL_API_TIMEOUT: float = float(os.environ.get("TEMPORAL_API_TIMEOUT") or 30.0)
-    # Validation worker (one loop per uvicorn process, coordinated through the DB):
-    # idle poll interval for due sequences,
-    TEMPORAL_VALIDATION_POLL_SECONDS: float = float(os.environ.get("TEMPORAL_VALIDATION_POLL_SECONDS") or 2.0)
+    # The client is kept for the process lifetime: connecting is bounded separately (an
+    # unreachable API must fail fast), and idle connections are kept alive between jobs.
+    TEMPORAL_API_CONNECT_TIMEOUT: float = float(os.environ.get("TEMPORAL_API_CONNECT_TIMEOUT") or 5.0)
+    TEMPORAL_API_MAX_CONNECTIONS: int = int(os.environ.get("TEMPORAL_API_MAX_CONNECTIONS") or 10)
+    TEMPORAL_API_KEEPALIVE_SECONDS: float = float(os.environ.get("TEMPORAL_API_KEEPALIVE_SECONDS") or 60.0)
+    # HTTP/2 multiplexes the calls of all the validation slots over one connection; needs
+    # the h2 package (httpx[http2]), falls back to HTTP/1.1 without it.
+    TEMPORAL_API_HTTP2: bool = os.getenv("TEMPORAL_API_HTTP2", "").lower() == "true"
+    # Share the circuit breaker of the temporal API across all processes through the DB: an
+    # outage trips it after MAX_CONSECUTIVE_FAILURES failed calls in total, not per process,
+    # and one elected process probes while half-open. Off: each process has its own.
+    TEMPORAL_API_SHARED_BREAKER: bool = os.getenv("TEMPORAL_API_SHARED_BREAKER", "").lower() == "true"
+    # Calls coalesced into one /predict/batch request (1 = no batching; needs a temporal API
+    # serving /predict/batch), and how long the first call waits for others to join it.
+    TEMPORAL_API_BATCH_SIZE: int = int(os.environ.get("TEMPORAL_API_BATCH_SIZE") or 1)
+    TEMPORAL_API_BATCH_WINDOW_SECONDS: float = float(os.environ.get("TEMPORAL_API_BATCH_WINDOW_SECONDS") or 0.05)
+    # Predictions cached per process for identical frame sets (resumed or retried jobs), up to
+    # this many entries (0 disables the cache) and for this long.
+    TEMPORAL_PREDICTION_CACHE_SIZE: int = int(os.environ.get("TEMPORAL_PREDICTION_CACHE_SIZE") or 1024)
+    TEMPORAL_PREDICTION_CACHE_TTL_SECONDS: float = float(
+        os.environ.get("TEMPORAL_PREDICTION_CACHE_TTL_SECONDS") or 600.0
+    )
+    # Validation worker (one loop per process, coordinated through the DB):
+    # safety poll interval for due sequences (workers LISTEN for new due sequences and wake at
+    # once, and sleep until the next retry, deferral or lease expiry; the poll only catches
+    # what was queued while the listen connection was down),
+    TEMPORAL_VALIDATION_POLL_SECONDS: float = float(os.environ.get("TEMPORAL_VALIDATION_POLL_SECONDS") or 30.0)
     # max time a sequence may wait in the queue before failing open on the risk gate alone
     # (bounds validation latency under a backlog; traced as validation_status=fail_open_stale),
     TEMPORAL_VALIDATION_MAX_AGE: float = float(os.environ.get("TEMPORAL_VALIDATION_MAX_AGE") or 300.0)
     # and how long a claimed job is leased before a sibling worker may retry it (must exceed
     # TEMPORAL_API_TIMEOUT plus the DB phases).
     TEMPORAL_VALIDATION_LEASE_SECONDS: float = float(os.environ.get("TEMPORAL_VALIDATION_LEASE_SECONDS") or 120.0)
+    # Jobs each process runs at once (worker slots). Size the total across processes to what the
+    # temporal API can score in parallel, not to the uvicorn worker count.
+    TEMPORAL_VALIDATION_CONCURRENCY: int = int(os.environ.get("TEMPORAL_VALIDATION_CONCURRENCY") or 1)
+    # Head start (seconds) a top-priority job gets in the claim order over one queued at the same
+    # time (high max_conf, high fire risk, cross-camera partners): bounds how long a
+    # low-priority job can be overtaken, so nothing starves. 0 = plain FIFO.
+    TEMPORAL_VALIDATION_PRIORITY_SECONDS: float = float(os.environ.get("TEMPORAL_VALIDATION_PRIORITY_SECONDS") or 120.0)
+    # Jobs of one organization that may run at once across all the workers, so a flooding
+    # camera can't take every slot (organizations also take turns in each claim). 0 = no cap.
+    TEMPORAL_VALIDATION_MAX_IN_FLIGHT_PER_ORG: int = int(
+        os.environ.get("TEMPORAL_VALIDATION_MAX_IN_FLIGHT_PER_ORG") or 0
+    )
+    # Run the validation worker inside every API process. Set to false when validation runs in
+    # dedicated processes (``python -m app.worker``), scaled apart from the API replicas.
+    TEMPORAL_VALIDATION_EMBEDDED: bool = os.environ.get("TEMPORAL_VALIDATION_EMBEDDED", "").lower() != "false"
+    # Export the validation queue gauges (validation_queue_*, read from the DB and the same in every
+    # process) from this process's worker, when PROMETHEUS_ENABLED. Enable it on a single process
+    # (e.g. the app.worker deployment), or aggregate the series with max by (organization_id).
+    TEMPORAL_VALIDATION_QUEUE_METRICS: bool = os.environ.get("TEMPORAL_VALIDATION_QUEUE_METRICS", "").lower() == "true"
 
     # Risk API (daily fire-weather index per camera)
     RISK_API_URL: Union[str, None] = os.environ.get("RISK_API_URL")
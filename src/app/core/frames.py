@@ -0,0 +1,91 @@
+# Copyright (C) 2026, Pyronear.
+
+# This program is licensed under the Apache License 2.0.
+# See LICENSE or go to <https://www.apache.org/licenses/LICENSE-2.0> for full license details.
+
+from typing import Iterable, List, NamedTuple, Sequence, Tuple, Union
+
+__all__ = ["Corners", "FrameManifest"]
+
+# Relative box corners in order xmin, ymin, xmax, ymax
+Corners = Tuple[float, float, float, float]
+
+
+def _to_corners(coords: Sequence[Union[float, None]]) -> Corners:
+    xmin, ymin, xmax, ymax = (float(coord or 0.0) for coord in coords)
+    return xmin, ymin, xmax, ymax
+
+
+def _envelope(first: Union[Corners, None], second: Union[Corners, None]) -> Union[Corners, None]:
+    if first is None or second is None:
+        return first if second is None else second
+    return min(first[0], second[0]), min(first[1], second[1]), max(first[2], second[2]), max(first[3], second[3])
+
+
+class FrameManifest(NamedTuple):
+    """Distinct frames of a sequence, maintained at ingest so the validation worker never re-reads its detections.
+
+    ``frame_count`` counts every distinct frame key attached to the sequence. ``keys`` keeps
+    the most recent ones, oldest first, and ``rois`` the envelope of the sequence's primary
+    bboxes on each of them (None for a frame only attached as continuity).
+    """
+
+    frame_count: int
+    keys: List[str]
+    rois: List[Union[Corners, None]]
+
+    @classmethod
+    def build(cls, frames: Iterable[Tuple[str, Union[Corners, None]]], keep_last: int) -> "FrameManifest":
+        return cls(0, [], []).add(frames, keep_last)
+
+    @classmethod
+    def from_columns(
+        cls,
+        frame_count: int,
+        recent_frame_keys: Union[Sequence[str], None],
+        recent_frame_rois: Union[Sequence[Union[float, None]], None],
+    ) -> "FrameManifest":
+        """Inverse of ``columns``."""
+        coords = list(recent_frame_rois or [])
+        rois: List[Union[Corners, None]] = [
+            None if coords[idx] is None else _to_corners(coords[idx : idx + 4]) for idx in range(0, len(coords), 4)
+        ]
+        return cls(frame_count, list(recent_frame_keys or []), rois)
+
+    def columns(self) -> dict:
+        """Values of the Sequence manifest columns (the envelopes flattened, NULL corners for None)."""
+        return {
+            "frame_count": self.frame_count,
+            "recent_frame_keys": self.keys,
+            "recent_frame_rois": [coord for roi in self.rois for coord in (roi if roi is not None else (None,) * 4)],
+        }
+
+    def add(self, frames: Iterable[Tuple[str, Union[Corners, None]]], keep_last: int) -> "FrameManifest":
+        """Append frames in order, keeping the last ``keep_last``.
+
+        A key already kept is not counted again: its envelope widens instead. Frame keys carry
+        their upload second, so a frame re-attached later than the kept window can't happen
+        in practice.
+        """
+        frame_count, keys, rois = self.frame_count, list(self.keys), list(self.rois)
+        for key, corners in frames:
+            if key in keys:
+                idx = keys.index(key)
+                rois[idx] = _envelope(rois[idx], corners)
+                continue
+            frame_count += 1
+            keys.append(key)
+            rois.append(corners)
+        return FrameManifest(frame_count, keys[-keep_last:], rois[-keep_last:])
+
+    def roi(self, last_n: Union[int, None] = None) -> Union[List[float], None]:
+        """Envelope of the (last ``last_n``) kept frames clamped to the image; None when empty or degenerate."""
+        envelope: Union[Corners, None] = None
+        for corners in self.rois if last_n is None else self.rois[-last_n:]:
+            envelope = _envelope(envelope, corners)
+        if envelope is None:
+            return None
+        roi = [max(0.0, envelope[0]), max(0.0, envelope[1]), min(1.0, envelope[2]), min(1.0, envelope[3])]
+        if not (roi[0] < roi[2] and roi[1] < roi[3]):
+            return None
+        return roi
@@ -3,7 +3,8 @@
 # This program is licensed under the Apache License 2.0.
 # See LICENSE or go to <https://www.apache.org/licenses/LICENSE-2.0> for full license details.
 
-from datetime import datetime, timezone
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Tuple
 
 
 def utcnow() -> datetime:
@@ -21,3 +22,13 @@ def to_utc_naive(value: datetime) -> datetime:
     if value.tzinfo is not None:
         return value.astimezone(timezone.utc).replace(tzinfo=None)
     return value
+
+
+def day_bounds(day: date) -> Tuple[datetime, datetime]:
+    """Naive UTC ``[start, end)`` bounds of a calendar day.
+
+    Filter on ``start <= column < end`` rather than ``func.date(column) == day``: a range
+    predicate can use an index on the column, a function of it can't.
+    """
+    start = datetime.combine(day, time.min)
+    return start, start + timedelta(days=1)
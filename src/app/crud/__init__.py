@@ -6,3 +6,5 @@ from .crud_organization import *
 from .crud_sequence import *
 from .crud_webhook import *
 from .crud_alert import *
+from .crud_idempotency_key import *
+from .crud_temporal_breaker import *
@@ -3,15 +3,15 @@
 # This program is licensed under the Apache License 2.0.
 # See LICENSE or go to <https://www.apache.org/licenses/LICENSE-2.0> for full license details.
 
-from typing import Any, Union, cast
+from typing import Any, Collection, List, Union, cast
 
-from sqlalchemy import desc
+from sqlalchemy import desc, exists, update
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.crud.base import BaseCRUD
 from app.models import Detection
-from app.schemas.detections import EMPTY_BBOXES, DetectionCreate, DetectionSequence
+from app.schemas.detections import DetectionCreate, DetectionSequence
 
 __all__ = ["DetectionCRUD"]
 
@@ -21,13 +21,60 @@ class DetectionCRUD(BaseCRUD[Detection, DetectionCreate, DetectionSequence]):
         super().__init__(session, Detection)
 
     async def get_latest_with_bbox(self, sequence_id: int) -> Union[Detection, None]:
-        """Latest detection of the sequence carrying a real bbox (continuity rows excluded)."""
+        """Latest detection of the sequence carrying a real bbox (continuity rows have no bbox_conf)."""
         statement: Any = (
             select(Detection)
             .where(cast(Any, Detection.sequence_id) == sequence_id)
-            .where(cast(Any, Detection.bbox) != EMPTY_BBOXES)
+            .where(cast(Any, Detection.bbox_conf).is_not(None))
             .order_by(desc(cast(Any, Detection.created_at)))
             .limit(1)
         )
         results = await self.session.exec(statement)
         return results.first()
+
+    async def get_latest_with_bbox_in(self, sequence_ids: List[int]) -> List[Detection]:
+        """Latest detection carrying a real bbox of each given sequence, in a single query."""
+        if not sequence_ids:
+            return []
+        statement: Any = (
+            select(Detection)
+            .distinct(cast(Any, Detection.sequence_id))
+            .where(cast(Any, Detection.sequence_id).in_(sequence_ids))
+            .where(cast(Any, Detection.bbox_conf).is_not(None))
+            .order_by(cast(Any, Detection.sequence_id), desc(cast(Any, Detection.created_at)))
+        )
+        results = await self.session.exec(statement)
+        return list(results.all())
+
+    async def assign_sequence(self, detection_ids: List[int], sequence_id: int, commit: bool = True) -> None:
+        """Attach the given detections to a sequence in a single statement."""
+        if not detection_ids:
+            return
+        stmt: Any = update(Detection).where(cast(Any, Detection.id).in_(detection_ids)).values(sequence_id=sequence_id)
+        await self.session.exec(stmt)
+        if commit:
+            await self.session.commit()
+
+    async def has_spooled_frames(self, bucket_keys: Collection[str]) -> bool:
+        """Whether any of the frames is still in the write-behind spool (not on the bucket yet)."""
+        if not bucket_keys:
+            return False
+        statement: Any = select(
+            exists()
+            .where(cast(Any, Detection.bucket_key).in_(list(bucket_keys)))
+            .where(cast(Any, Detection.frame_spooled).is_(True))
+        )
+        return bool((await self.session.exec(statement)).one())
+
+    async def mark_frames_uploaded(self, bucket_keys: Collection[str]) -> None:
+        """Clear the spool flag of the detections of frames now on the bucket, in a single statement."""
+        if not bucket_keys:
+            return
+        stmt: Any = (
+            update(Detection)
+            .where(cast(Any, Detection.bucket_key).in_(list(bucket_keys)))
+            .where(cast(Any, Detection.frame_spooled).is_(True))
+            .values(frame_spooled=False)
+        )
+        await self.session.exec(stmt)
+        await self.session.commit()
@@ -0,0 +1,61 @@
+# Copyright (C) 2026, Pyronear.
+
+# This program is licensed under the Apache License 2.0.
+# See LICENSE or go to <https://www.apache.org/licenses/LICENSE-2.0> for full license details.
+
+from datetime import timedelta
+from typing import Any, Union, cast
+
+from sqlalchemy import delete, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.time import utcnow
+from app.crud.base import BaseCRUD
+from app.models import IdempotencyKey
+
+__all__ = ["IdempotencyKeyCRUD"]
+
+
+class IdempotencyKeyCRUD(BaseCRUD[IdempotencyKey, IdempotencyKey, IdempotencyKey]):
+    def __init__(self, session: AsyncSession) -> None:
+        super().__init__(session, IdempotencyKey)
+
+    async def claim(self, camera_id: int, key: str, ttl_seconds: float) -> bool:
+        """Reserve the key for an upload of the camera; False when it was already used.
+
+        The camera's expired keys are dropped first, so a key is only remembered for
+        ``ttl_seconds``. The reservation is only flushed: a concurrent upload with the same key
+        blocks on it until this request commits (it then sees the key used) or rolls back (it
+        then takes the key over). Nothing is stored for a failed upload, which the engine can
+        retry with the same key.
+        """
+        now = utcnow()
+        await self.session.exec(
+            cast(
+                Any,
+                delete(IdempotencyKey)
+                .where(cast(Any, IdempotencyKey.camera_id) == camera_id)
+                .where(cast(Any, IdempotencyKey.created_at) < now - timedelta(seconds=ttl_seconds)),
+            )
+        )
+        stmt: Any = (
+            insert(IdempotencyKey)
+            .values(camera_id=camera_id, key=key, created_at=now)
+            .on_conflict_do_nothing()
+            .returning(cast(Any, IdempotencyKey.key))
+        )
+        return (await self.session.exec(stmt)).first() is not None
+
+    async def get_outcome(self, camera_id: int, key: str) -> Union[IdempotencyKey, None]:
+        return await self.session.get(IdempotencyKey, (camera_id, key))
+
+    async def record(self, camera_id: int, key: str, detection_id: Union[int, None]) -> None:
+        """Attach the upload's outcome to its claimed key, in the caller's transaction."""
+        stmt: Any = (
+            update(IdempotencyKey)
+            .where(cast(Any, IdempotencyKey.camera_id) == camera_id)
+            .where(cast(Any, IdempotencyKey.key) == key)
+            .values(detection_id=detection_id)
+        )
+        await self.session.exec(stmt)
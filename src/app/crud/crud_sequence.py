@@ -5,40 +5,63 @@
 
 
 import logging
-from datetime import timedelta
-from typing import Any, Union, cast
+from datetime import datetime, timedelta
+from typing import Any, Collection, Dict, List, Optional, Tuple, Union, cast
 
-from sqlalchemy import case, distinct, func, null, or_, select, update
+from prometheus_client import Counter
+from sqlalchemy import and_, case, distinct, exists, func, literal, null, or_, select, true, update
+from sqlalchemy.orm import aliased
 from sqlmodel import select as select_model
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.frames import Corners, FrameManifest
 from app.core.time import utcnow
 from app.crud.base import BaseCRUD
-from app.models import TERMINAL_VALIDATION_STATUSES, VALIDATION_FAILED, Detection, Sequence
+from app.models import TERMINAL_VALIDATION_STATUSES, VALIDATION_FAILED, AlertSequence, Camera, Detection, Sequence
 from app.schemas.sequences import SequenceLabel, SequenceUpdate
 
-__all__ = ["SequenceCRUD"]
+__all__ = ["VALIDATION_DUE_CHANNEL", "SequenceCRUD"]
 
 logger = logging.getLogger("uvicorn.error")
 
+# Postgres NOTIFY channel waking the validation workers when a sequence becomes due
+VALIDATION_DUE_CHANNEL = "sequence_validation_due"
+
+# Validation jobs claimed, by lease: "expired" when the job still held a lease that ran out
+# (resumed after its worker died mid-job), else "new" (leases released on error, deferral
+# or shutdown are cleared)
+CLAIMED_JOBS = Counter("validation_claimed_jobs_total", "Validation jobs claimed by the workers", ["lease"])
+
 
 class SequenceCRUD(BaseCRUD[Sequence, Sequence, Union[SequenceUpdate, SequenceLabel]]):
     def __init__(self, session: AsyncSession) -> None:
         super().__init__(session, Sequence)
 
-    async def bump_max_conf(self, sequence_id: int, candidate: float) -> None:
-        """Atomically raise sequences.max_conf to candidate if higher (or set if NULL).
+    async def extend_sequences(self, matches: Dict[int, Tuple[datetime, Optional[float]]], commit: bool = True) -> None:
+        """Record the detections matched to sequences in a single statement.
 
-        Uses a portable CASE expression so it runs on SQLite as well as Postgres.
+        ``matches`` maps each sequence id to its new ``last_seen_at`` and the best confidence
+        matched to it: ``max_conf`` is raised to it if higher (or set if NULL), and left as is
+        when None. Uses portable CASE expressions so it runs on SQLite as well as Postgres.
         """
-        max_conf_col = cast(Any, Sequence.max_conf)
-        bumped: Any = cast(Any, case)(
-            (or_(max_conf_col.is_(None), max_conf_col < candidate), candidate),
-            else_=max_conf_col,
-        )
-        stmt: Any = update(Sequence).where(cast(Any, Sequence.id) == sequence_id).values(max_conf=bumped)
+        if not matches:
+            return
+        id_col = cast(Any, Sequence.id)
+        values: Dict[str, Any] = {
+            "last_seen_at": cast(Any, case)({seq_id: seen for seq_id, (seen, _) in matches.items()}, value=id_col)
+        }
+        confs = {seq_id: conf for seq_id, (_, conf) in matches.items() if conf is not None}
+        if confs:
+            max_conf_col = cast(Any, Sequence.max_conf)
+            candidate: Any = cast(Any, case)(confs, value=id_col, else_=max_conf_col)
+            values["max_conf"] = cast(Any, case)(
+                (or_(max_conf_col.is_(None), max_conf_col < candidate), candidate),
+                else_=max_conf_col,
+            )
+        stmt: Any = update(Sequence).where(id_col.in_(list(matches))).values(**values)
         await self.session.exec(stmt)
-        await self.session.commit()
+        if commit:
+            await self.session.commit()
 
     async def set_temporal_score(
         self,
@@ -83,59 +106,325 @@ class SequenceCRUD(BaseCRUD[Sequence, Sequence, Union[SequenceUpdate, SequenceLa
         await self.session.commit()
         return bool(getattr(result, "rowcount", 0))
 
-    async def enqueue_validation(self, sequence_id: int) -> None:
+    async def record_frames(
+        self,
+        frames: Dict[int, List[Tuple[str, Union[Corners, None]]]],
+        keep_last: int,
+        commit: bool = True,
+    ) -> None:
+        """Append the frames just attached to each sequence to its frame manifest.
+
+        ``frames`` maps each sequence id to its new ``(bucket_key, bbox envelope)`` frames, in
+        order. Read-modify-write under the row locks, so concurrent ingests of a sequence (or
+        the worker building its manifest) can't lose a frame. A manifest not built yet is left
+        alone: the worker builds it from the detections, this frame included.
+        """
+        if not frames:
+            return
+        stmt: Any = (
+            select(
+                cast(Any, Sequence.id),
+                cast(Any, Sequence.frame_count),
+                cast(Any, Sequence.recent_frame_keys),
+                cast(Any, Sequence.recent_frame_rois),
+            )
+            .where(cast(Any, Sequence.id).in_(list(frames)))
+            .order_by(cast(Any, Sequence.id))
+            .with_for_update()
+        )
+        for sequence_id, frame_count, keys, flat_rois in (await self.session.exec(stmt)).all():
+            if frame_count is None:
+                continue
+            manifest = FrameManifest.from_columns(frame_count, keys, flat_rois).add(frames[sequence_id], keep_last)
+            update_stmt: Any = (
+                update(Sequence).where(cast(Any, Sequence.id) == sequence_id).values(**manifest.columns())
+            )
+            await self.session.exec(update_stmt)
+        if commit:
+            await self.session.commit()
+
+    async def get_frame_manifest(self, sequence_id: int, keep_last: int) -> FrameManifest:
+        """Frame manifest of the sequence, built from its detections (and stored) if needed.
+
+        A built manifest comes with the row itself. The build locks the row first, so an
+        ingest attaching a frame meanwhile either commits before the detections are read, or
+        appends to the built manifest after.
+        """
+        sequence_ = cast(Sequence, await self.get(sequence_id, strict=True))
+        if (manifest := sequence_.frame_manifest) is not None:
+            return manifest
+        locked_stmt: Any = (
+            select_model(Sequence)
+            .where(cast(Any, Sequence.id) == sequence_id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        sequence_ = (await self.session.exec(locked_stmt)).one()
+        if (manifest := sequence_.frame_manifest) is None:
+            dets_stmt: Any = (
+                select(
+                    cast(Any, Detection.bucket_key),
+                    cast(Any, Detection.bbox_xmin),
+                    cast(Any, Detection.bbox_ymin),
+                    cast(Any, Detection.bbox_xmax),
+                    cast(Any, Detection.bbox_ymax),
+                )
+                .where(cast(Any, Detection.sequence_id) == sequence_id)
+                .order_by(cast(Any, Detection.created_at))
+            )
+            manifest = FrameManifest.build(
+                (
+                    (key, None if any(coord is None for coord in corners) else cast(Corners, tuple(corners)))
+                    for key, *corners in (await self.session.exec(dets_stmt)).all()
+                ),
+                keep_last,
+            )
+            for field, value in manifest.columns().items():
+                setattr(sequence_, field, value)
+            self.session.add(sequence_)
+        await self.session.commit()
+        return manifest
+
+    async def record_detection_removal(self, sequence_id: int, commit: bool = True) -> None:
+        """Drop the frame manifest (a frame may have been removed): the worker rebuilds it.
+
+        Also stamps detection_removed_at, for the sequence indexes of all the workers to reload
+        the last bbox of the sequence.
+        """
+        stmt: Any = (
+            update(Sequence)
+            .where(cast(Any, Sequence.id) == sequence_id)
+            .values(frame_count=None, recent_frame_keys=None, recent_frame_rois=None, detection_removed_at=utcnow())
+        )
+        await self.session.exec(stmt)
+        if commit:
+            await self.session.commit()
+
+    async def enqueue_validation(self, sequence_id: int, commit: bool = True) -> None:
         """Mark the sequence as due for temporal validation (the DB-backed queue).
 
-        Idempotent and FIFO-preserving: ``COALESCE`` keeps the oldest due timestamp, so a
-        sequence already queued is NOT re-queued (one entry per sequence, whichever worker
-        receives the detection). No-op for validated sequences and terminal states
-        (window-exhausted, failed).
+        Idempotent: ``COALESCE`` keeps the oldest due timestamp, so a sequence already queued
+        is NOT re-queued (one entry per sequence, whichever worker receives the detection).
+        No-op for validated sequences and terminal states (window-exhausted, failed).
         """
+        await self.enqueue_validations([sequence_id], commit=commit)
+
+    async def enqueue_validations(
+        self,
+        sequence_ids: Collection[int],
+        commit: bool = True,
+        *,
+        risk_priority: float = 0.0,
+        priority_seconds: float = 0.0,
+    ) -> None:
+        """Set-based ``enqueue_validation``: mark all the given sequences due in one statement.
+
+        Each job is also ranked for the claim order: its enqueue time, moved earlier by up to
+        ``priority_seconds`` by its priority in [0, 1], the mean of the sequence's max_conf,
+        ``risk_priority`` (the camera's fire-risk weight) and whether it already shares an
+        alert with another sequence (a cross-camera partner). A job already queued keeps the
+        earliest of its ranks, so a later, stronger frame can only move it forward. Since a
+        job is overtaken by at most ``priority_seconds``, nothing starves. 0 keeps plain FIFO.
+        """
+        if not sequence_ids:
+            return
         status_col = cast(Any, Sequence.validation_status)
         due_col = cast(Any, Sequence.validation_due_at)
+        rank_col = cast(Any, Sequence.validation_rank_at)
+        queued_col = cast(Any, Sequence.validation_queued_at)
+        now = utcnow()
+        own_link, partner_link = aliased(AlertSequence), aliased(AlertSequence)
+        has_partner: Any = exists().where(
+            cast(Any, own_link.sequence_id) == Sequence.id,
+            cast(Any, partner_link.alert_id) == own_link.alert_id,
+            cast(Any, partner_link.sequence_id) != own_link.sequence_id,
+        )
+        priority = (
+            func.coalesce(cast(Any, Sequence.max_conf), 0.0)
+            + risk_priority
+            + cast(Any, case)((has_partner, 1.0), else_=0.0)
+        ) / 3
+        rank = literal(now) - literal(timedelta(seconds=priority_seconds)) * priority
         stmt: Any = (
             update(Sequence)
-            .where(cast(Any, Sequence.id) == sequence_id)
+            .where(cast(Any, Sequence.id).in_(list(sequence_ids)))
             .where(cast(Any, Sequence.is_validated).is_(False))
             .where(or_(status_col.is_(None), status_col.not_in(TERMINAL_VALIDATION_STATUSES)))
-            .values(validation_due_at=func.coalesce(due_col, utcnow()))
+            .values(
+                validation_due_at=func.coalesce(due_col, now),
+                validation_queued_at=cast(Any, case)(
+                    (due_col.is_(None), now), else_=func.coalesce(queued_col, due_col)
+                ),
+                validation_rank_at=cast(Any, case)(
+                    (due_col.is_(None), rank), else_=func.least(func.coalesce(rank_col, rank), rank)
+                ),
+            )
         )
-        await self.session.exec(stmt)
-        await self.session.commit()
+        result = await self.session.exec(stmt)
+        if getattr(result, "rowcount", 0):
+            await self._notify_due()
+        if commit:
+            await self.session.commit()
+
+    async def _notify_due(self) -> None:
+        """Wake the listening validation workers once the transaction commits.
+
+        Postgres delivers a NOTIFY at commit (dropped on rollback) and folds identical ones
+        sent within a transaction, so a whole ingest batch wakes the workers once.
+        """
+        await self.session.exec(select(func.pg_notify(VALIDATION_DUE_CHANNEL, "")))
 
     async def claim_due_validation(self, lease_seconds: float) -> Union[Sequence, None]:
-        """Claim the oldest due sequence for validation, or None when nothing is due.
+        """Claim the first-ranked due sequence for validation, or None when nothing is due."""
+        claimed = await self.claim_due_validations(1, lease_seconds)
+        return claimed[0] if claimed else None
+
+    async def claim_due_validations(
+        self, limit: int, lease_seconds: float, max_in_flight_per_org: int = 0
+    ) -> List[Sequence]:
+        """Claim up to ``limit`` due sequences for validation, fairly across organizations, in one statement.
 
         ``FOR UPDATE SKIP LOCKED`` keeps concurrent workers (multi-worker uvicorn) off the
-        same row; the lease keeps them off for the duration of the model call, which runs
+        same rows; the lease keeps them off for the duration of the model call, which runs
         long after this transaction commits. ``validation_due_at`` is intentionally NOT
         cleared here: a worker dying mid-job leaves a due row whose lease expires, so the
         job is picked up again instead of being lost. Validated rows are NOT filtered out:
         a still-due validated row means a worker died after winning the validation claim
         but before triangulating/notifying, and the job must be resumed.
+
+        Organizations take turns: each one's claimable jobs are numbered in rank order and
+        the batch is filled turn by turn (rank order within a turn), so a camera flooding the
+        queue only delays its own organization. Only the first ``limit`` jobs of each camera
+        are read (on the per-camera rank index), as no organization takes more turns than
+        that. With ``max_in_flight_per_org`` > 0, an organization is not given more jobs
+        once that many of its jobs hold a live lease (a soft cap: workers claiming at the
+        same instant each see the same count).
+
+        The lease starts now: only claim the jobs that can start right away.
         """
         now = utcnow()
         due_col = cast(Any, Sequence.validation_due_at)
         lease_col = cast(Any, Sequence.validation_lease_until)
-        stmt: Any = (
-            select_model(Sequence)
+        rank_col = cast(Any, Sequence.validation_rank_at)
+        org_col = cast(Any, Camera.organization_id)
+        # The first claimable jobs of each camera
+        firsts: Any = (
+            select(cast(Any, Sequence.id).label("id"), rank_col.label("rank_at"), due_col.label("due_at"))
+            .where(cast(Any, Sequence.camera_id) == cast(Any, Camera.id))
             .where(due_col.is_not(None))
             .where(due_col <= now)
             .where(or_(lease_col.is_(None), lease_col < now))
-            .order_by(due_col)
-            .limit(1)
-            .with_for_update(skip_locked=True)
+            .order_by(rank_col, due_col)
+            .limit(limit)
+            .lateral("firsts")
         )
-        res = await self.session.exec(stmt)
-        sequence_ = res.first()
-        if sequence_ is None:
-            await self.session.commit()
-            return None
-        sequence_.validation_lease_until = now + timedelta(seconds=lease_seconds)
-        self.session.add(sequence_)
+        claimable: Any = (
+            select(
+                firsts.c.id,
+                firsts.c.rank_at,
+                firsts.c.due_at,
+                org_col.label("organization_id"),
+                func
+                .row_number()
+                .over(partition_by=org_col, order_by=(firsts.c.rank_at, firsts.c.due_at))
+                .label("turn"),
+            )
+            .select_from(Camera)
+            .join(firsts, true())
+            .subquery("claimable")
+        )
+        picked: Any = (
+            select(cast(Any, Sequence.id), lease_col.label("previous_lease"))
+            .join(claimable, claimable.c.id == cast(Any, Sequence.id))
+            .order_by(claimable.c.turn, claimable.c.rank_at, claimable.c.due_at)
+            .limit(limit)
+            # Only the claimed rows are locked (the turns are numbered over a snapshot of the queue)
+            .with_for_update(of=Sequence, skip_locked=True)
+        )
+        if max_in_flight_per_org > 0:
+            # The live leases of each organization (the lease index only holds the jobs in flight)
+            in_flight: Any = (
+                select(org_col.label("organization_id"), func.count().label("in_flight"))
+                .join(Sequence, cast(Any, Sequence.camera_id) == cast(Any, Camera.id))
+                .where(lease_col >= now)
+                .group_by(org_col)
+                .subquery("in_flight")
+            )
+            picked = picked.outerjoin(in_flight, in_flight.c.organization_id == claimable.c.organization_id).where(
+                func.coalesce(in_flight.c.in_flight, 0) + claimable.c.turn <= max_in_flight_per_org
+            )
+        picked = picked.subquery("picked")
+        stmt: Any = (
+            update(Sequence)
+            .where(cast(Any, Sequence.id) == picked.c.id)
+            .values(validation_lease_until=now + timedelta(seconds=lease_seconds))
+            # The previous lease tells the jobs resumed after a worker died
+            .returning(Sequence, picked.c.previous_lease)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        rows = (await self.session.exec(stmt)).all()
+        claimed = sorted(
+            (sequence_ for sequence_, _ in rows),
+            # Rank order (NULLS LAST: jobs queued outside enqueue_validations); the batch
+            # never exceeds the idle slots, so every claimed job starts right away anyway
+            key=lambda sequence_: (
+                sequence_.validation_rank_at is None,
+                sequence_.validation_rank_at or sequence_.validation_due_at,
+            ),
+        )
+        expired = sum(previous_lease is not None for _, previous_lease in rows)
+        CLAIMED_JOBS.labels(lease="new").inc(len(rows) - expired)
+        CLAIMED_JOBS.labels(lease="expired").inc(expired)
         await self.session.commit()
-        await self.session.refresh(sequence_)
-        return sequence_
+        return claimed
+
+    async def next_validation_claim(self) -> Tuple[Union[datetime, None], bool]:
+        """When the queue next has a job to claim, for the workers to idle until then.
+
+        Returns the earliest time a queued job not claimable yet becomes claimable (its retry
+        backoff or deferral ends, or its lease expires), and whether jobs are claimable right
+        now (left behind by a claim: held back by the in-flight cap, or locked by a sibling).
+        Neither moment sends a NOTIFY.
+        """
+        now = utcnow()
+        due_col = cast(Any, Sequence.validation_due_at)
+        lease_col = cast(Any, Sequence.validation_lease_until)
+        claimable_at = func.greatest(due_col, func.coalesce(lease_col, due_col))
+        stmt: Any = select(
+            func.min(claimable_at).filter(claimable_at > now),
+            func.count().filter(claimable_at <= now),
+        ).where(due_col.is_not(None))
+        next_at, n_claimable = (await self.session.exec(stmt)).one()
+        return next_at, n_claimable > 0
+
+    async def validation_queue_stats(self) -> List[Tuple[int, int, int, Union[datetime, None]]]:
+        """Validation queue of each organization with queued jobs.
+
+        Returns ``(organization_id, waiting, in_flight, oldest_due_at)`` tuples: the due jobs
+        not leased, the ones under a live lease, and the due time of the oldest waiting one
+        (None when the organization only has jobs in flight or scheduled for later).
+        """
+        now = utcnow()
+        due_col = cast(Any, Sequence.validation_due_at)
+        lease_col = cast(Any, Sequence.validation_lease_until)
+        org_col = cast(Any, Camera.organization_id)
+        waiting = and_(due_col <= now, or_(lease_col.is_(None), lease_col < now))
+        stmt: Any = (
+            select(
+                org_col,
+                func.count().filter(waiting),
+                func.count().filter(lease_col >= now),
+                func.min(due_col).filter(waiting),
+            )
+            .join(Camera, cast(Any, Camera.id) == cast(Any, Sequence.camera_id))
+            .where(due_col.is_not(None))
+            .group_by(org_col)
+            .order_by(org_col)
+        )
+        res = await self.session.exec(stmt)
+        return [
+            (int(org_id), int(n_waiting), int(n_in_flight), oldest) for org_id, n_waiting, n_in_flight, oldest in res
+        ]
 
     async def finish_validation_job(
         self,
@@ -149,7 +438,8 @@ class SequenceCRUD(BaseCRUD[Sequence, Sequence, Union[SequenceUpdate, SequenceLa
         exactly that many distinct frames — frames that arrived while the model was scoring
         keep the job due, so the worker re-runs it with the fresh frame set instead of
         waiting for (or losing, if the sequence just ended) the next detection. The
-        comparison runs inside the UPDATE so it can't race a concurrent enqueue.
+        comparison runs inside the UPDATE, against the frame manifest (counted from the
+        detections when it isn't built), so it can't race a concurrent enqueue.
         ``validation_status`` records how validation concluded (observability, incl.
         explicit fail-open reasons) in the same UPDATE.
 
@@ -159,32 +449,58 @@ class SequenceCRUD(BaseCRUD[Sequence, Sequence, Union[SequenceUpdate, SequenceLa
         expected volume.
         """
         due_col = cast(Any, Sequence.validation_due_at)
+        queued_col = cast(Any, Sequence.validation_queued_at)
         if frame_count is None:
             new_due: Any = null()
+            new_queued: Any = null()
         else:
             count_select: Any = select(func.count(distinct(cast(Any, Detection.bucket_key)))).where(
                 cast(Any, Detection.sequence_id) == sequence_id
             )
             count_sq = count_select.scalar_subquery()
-            new_due = cast(Any, case)((count_sq == frame_count, null()), else_=due_col)
+            unchanged = func.coalesce(cast(Any, Sequence.frame_count), count_sq) == frame_count
+            new_due = cast(Any, case)((unchanged, null()), else_=due_col)
+            new_queued = cast(Any, case)((unchanged, null()), else_=queued_col)
         # Completing a job also resets the consecutive-error counter, so the dead-letter
         # cap counts consecutive failures, not lifetime ones.
-        values: dict = {"validation_due_at": new_due, "validation_lease_until": None, "validation_attempts": 0}
+        values: dict = {
+            "validation_due_at": new_due,
+            "validation_queued_at": new_queued,
+            "validation_lease_until": None,
+            "validation_attempts": 0,
+        }
         if validation_status is not None:
             values["validation_status"] = validation_status
         stmt: Any = update(Sequence).where(cast(Any, Sequence.id) == sequence_id).values(**values)
         await self.session.exec(stmt)
         await self.session.commit()
 
-    async def fail_or_retry_validation(self, sequence_id: int, *, max_attempts: int, retry_in_seconds: float) -> None:
-        """Error path: release the lease and either back off the retry or dead-letter.
+    async def defer_validation(self, sequence_id: int, retry_in_seconds: float) -> None:
+        """Release the job without running it: it stays queued, claimable again in ``retry_in_seconds``.
+
+        Neither an error (the attempts counter is untouched) nor a new enqueue (the enqueue
+        time, which the staleness fail-open reads, and the rank are kept): only the due time
+        moves. The lease is dropped, so a deferred job is not counted in flight meanwhile.
+        """
+        values: dict = {"validation_lease_until": None}
+        if retry_in_seconds > 0:
+            values["validation_due_at"] = utcnow() + timedelta(seconds=retry_in_seconds)
+        stmt: Any = update(Sequence).where(cast(Any, Sequence.id) == sequence_id).values(**values)
+        await self.session.exec(stmt)
+        if retry_in_seconds <= 0:
+            # Claimable right away: let a sibling pick it up now rather than at its next poll
+            await self._notify_due()
+        await self.session.commit()
+
+    async def fail_or_retry_validation(self, sequence_id: int, *, max_attempts: int, retry_in_seconds: float) -> bool:
+        """Error path: release the lease and either back off the retry or dead-letter (returns True).
 
         Increments the consecutive-error counter; below ``max_attempts`` the job stays due,
         pushed ``retry_in_seconds`` into the future (no tight retry loop). At the cap the
         job dead-letters: terminal ``validation_status='failed'``, due cleared, never
         retried nor re-enqueued — a poison job must not starve the serial worker forever.
-        Note the staleness fail-open can't bound this (each retry refreshes the due time),
-        hence the explicit attempts cap.
+        Note the staleness fail-open can't bound this (a job failing before the model call
+        never reaches it), hence the explicit attempts cap.
         """
         sequence_ = cast(Sequence, await self.get(sequence_id, strict=True))
         attempts = (sequence_.validation_attempts or 0) + 1
@@ -192,9 +508,11 @@ class SequenceCRUD(BaseCRUD[Sequence, Sequence, Union[SequenceUpdate, SequenceLa
         if attempts >= max_attempts:
             values["validation_status"] = VALIDATION_FAILED
             values["validation_due_at"] = None
+            values["validation_queued_at"] = None
             logger.error("Sequence %s failed validation %d times; giving up", sequence_id, attempts)
         else:
             values["validation_due_at"] = utcnow() + timedelta(seconds=retry_in_seconds)
         stmt: Any = update(Sequence).where(cast(Any, Sequence.id) == sequence_id).values(**values)
         await self.session.exec(stmt)
         await self.session.commit()
+        return attempts >= max_attempts
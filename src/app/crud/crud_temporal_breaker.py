@@ -0,0 +1,107 @@
+# Copyright (C) 2026, Pyronear.
+
+# This program is licensed under the Apache License 2.0.
+# See LICENSE or go to <https://www.apache.org/licenses/LICENSE-2.0> for full license details.
+
+from datetime import datetime, timedelta
+from typing import Any, Callable, Union, cast
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.time import utcnow
+from app.crud.base import BaseCRUD
+from app.models import TemporalBreaker
+
+__all__ = ["TemporalBreakerCRUD"]
+
+BREAKER_ID = 1
+
+
+def _is_closed(state: TemporalBreaker) -> bool:
+    """Closed with a clean record: a success has nothing to reset."""
+    return state.paused_until is None and not state.consecutive_failures and not state.open_count
+
+
+class TemporalBreakerCRUD(BaseCRUD[TemporalBreaker, TemporalBreaker, TemporalBreaker]):
+    def __init__(self, session: AsyncSession) -> None:
+        super().__init__(session, TemporalBreaker)
+        # Pause of the breaker as of the last acquire / record (None: closed), for its state gauge
+        self.paused_until: Union[datetime, None] = None
+
+    async def _lock(self) -> TemporalBreaker:
+        """The breaker row, locked until the transaction ends (created closed if missing)."""
+        await self.session.exec(cast(Any, insert(TemporalBreaker).values(id=BREAKER_ID).on_conflict_do_nothing()))
+        stmt: Any = (
+            select(TemporalBreaker)
+            .where(cast(Any, TemporalBreaker.id) == BREAKER_ID)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        return (await self.session.exec(stmt)).one()
+
+    async def acquire(self, probe_seconds: float) -> bool:
+        """Whether this process may call the API now.
+
+        Closed: yes, read without a lock. Open: no. Half-open (pause elapsed): only the first
+        process to ask, which takes the probe lease for ``probe_seconds``; the others wait for
+        its verdict, or for the lease to expire if it died mid-probe.
+        """
+        state = await self.session.get(TemporalBreaker, BREAKER_ID)
+        self.paused_until = state.paused_until if state is not None else None
+        if state is None or state.paused_until is None:
+            return True
+        now = utcnow()
+        if state.paused_until > now:
+            return False
+        state = await self._lock()
+        self.paused_until = state.paused_until
+        if state.paused_until is not None and (
+            state.paused_until > now or (state.probe_until is not None and state.probe_until > now)
+        ):
+            await self.session.commit()
+            return False
+        if state.paused_until is not None:
+            state.probe_until = now + timedelta(seconds=probe_seconds)
+            self.session.add(state)
+        await self.session.commit()
+        return True
+
+    async def record(
+        self, success: bool, max_failures: int, pause_seconds: Callable[[int], float]
+    ) -> Union[float, None]:
+        """Count a call outcome; returns the pause when the failure opens the breaker.
+
+        A success closes it. A failure opens it after ``max_failures`` in a row across all
+        processes, or at once when the call was the half-open probe, for
+        ``pause_seconds(trip number)``. A success on a closed breaker, the steady state, is
+        read without a lock (like ``acquire``): the row is only locked to change it.
+        """
+        if success:
+            state = await self.session.get(TemporalBreaker, BREAKER_ID)
+            if state is None or _is_closed(state):
+                self.paused_until = None
+                return None
+        state = await self._lock()
+        pause: Union[float, None] = None
+        if success:
+            if _is_closed(state):  # closed by another process meanwhile
+                await self.session.commit()
+                self.paused_until = None
+                return None
+            state.consecutive_failures, state.open_count = 0, 0
+            state.paused_until, state.probe_until = None, None
+        else:
+            state.consecutive_failures += 1
+            probing = state.paused_until is not None and state.paused_until <= utcnow()
+            if probing or state.consecutive_failures >= max_failures:
+                state.open_count += 1
+                pause = pause_seconds(state.open_count)
+                state.consecutive_failures = 0
+                state.paused_until = utcnow() + timedelta(seconds=pause)
+                state.probe_until = None
+        self.paused_until = state.paused_until
+        self.session.add(state)
+        await self.session.commit()
+        return pause
@@ -8,7 +8,6 @@ import contextlib
 import logging
 import time
 from contextlib import asynccontextmanager
-from datetime import datetime, timedelta, timezone
 
 import sentry_sdk
 from fastapi import FastAPI, Request, status
@@ -23,8 +22,10 @@ from sentry_sdk.integrations.starlette import StarletteIntegration
 from app.api.api_v1.router import api_router
 from app.core.config import settings
 from app.schemas.base import Status
-from app.services.risk import risk_service
-from app.services.validation import validation_worker_loop
+from app.services.risk import risk_refresh_loop, risk_service
+from app.services.storage import media_spool, spool_uploader_loop
+from app.services.temporal import temporal_service
+from app.services.validation import drain_notifications, validation_worker_loop
 
 logger = logging.getLogger("uvicorn.error")
 
@@ -46,46 +47,38 @@ if isinstance(settings.SENTRY_DSN, str):
     logger.info(f"Sentry middleware enabled on server {settings.SERVER_NAME}")
 
 
-def _seconds_until_next_utc_hour(target_hour: int) -> float:
-    hour = max(0, min(23, target_hour))
-    now = datetime.now(tz=timezone.utc)
-    target = now.replace(hour=hour, minute=0, second=0, microsecond=0)
-    if target <= now:
-        target += timedelta(days=1)
-    return (target - now).total_seconds()
-
-
-async def _risk_refresh_loop() -> None:
-    while True:
-        try:
-            await asyncio.sleep(_seconds_until_next_utc_hour(settings.RISK_REFRESH_HOUR_UTC))
-            await risk_service.refresh()
-        except asyncio.CancelledError:
-            raise
-        except Exception:
-            logger.exception("Risk refresh loop iteration failed; continuing")
-
-
 @asynccontextmanager
 async def lifespan(_: FastAPI):
     if risk_service.is_configured:
         await risk_service.refresh()
-        risk_task = asyncio.create_task(_risk_refresh_loop())
+        risk_task = asyncio.create_task(risk_refresh_loop())
     else:
         risk_task = None
         logger.info("Risk API not configured; skipping daily refresh")
-    # One validation worker per uvicorn process; coordination happens in the DB, so any
-    # number of processes is safe. Runs even without the temporal API configured: the
-    # pipeline then validates on the risk gate alone (fail-open).
-    validation_task = asyncio.create_task(validation_worker_loop())
+    # One validation worker per uvicorn process unless validation runs in dedicated processes
+    # (app.worker); coordination happens in the DB, so any number of processes is safe. Runs
+    # even without the temporal API configured: the pipeline then validates on the risk gate
+    # alone (fail-open).
+    if settings.TEMPORAL_VALIDATION_EMBEDDED:
+        validation_task = asyncio.create_task(validation_worker_loop())
+        if temporal_service.is_configured:
+            temporal_service.open()
+    else:
+        validation_task = None
+        logger.info("Embedded validation worker disabled; validation runs in app.worker processes")
+    # Write-behind media: drain what this or a previous process left in the spool
+    spool_task = asyncio.create_task(spool_uploader_loop()) if media_spool.is_enabled else None
     try:
         yield
     finally:
-        for task in (risk_task, validation_task):
+        for task in (risk_task, validation_task, spool_task):
             if task is not None:
                 task.cancel()
                 with contextlib.suppress(asyncio.CancelledError):
                     await task
+        # After the worker: in-flight calls were cancelled with it
+        await drain_notifications()
+        await temporal_service.close()
 
 
 app = FastAPI(
@@ -5,11 +5,16 @@
 
 from datetime import datetime
 from enum import Enum
-from typing import Union
+from typing import List, Union, cast
 
+from sqlalchemy import Connection, Float, Index, String, event, inspect, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Mapper
 from sqlmodel import Field, SQLModel
 
+from app.core.bboxes import BBox, decode_bboxes, flatten_bboxes
 from app.core.config import settings
+from app.core.frames import FrameManifest
 from app.core.time import utcnow
 
 __all__ = ["Alert", "AlertSequence", "Camera", "Detection", "Organization", "Pose", "Sequence", "User"]
@@ -83,6 +88,24 @@ class OcclusionMask(SQLModel, table=True):
 
 class Detection(SQLModel, table=True):
     __tablename__ = "detections"
+    # Hot query paths (built concurrently by migration e2b6c8d4f0a1)
+    __table_args__ = (
+        Index("ix_detections_sequence_id_created_at", "sequence_id", "created_at"),
+        Index(
+            "ix_detections_sequence_id_created_at_with_bbox",
+            "sequence_id",
+            "created_at",
+            postgresql_where=text("bbox_conf IS NOT NULL"),
+        ),
+        Index(
+            "ix_detections_camera_id_pose_id_sequence_id_created_at",
+            "camera_id",
+            "pose_id",
+            "sequence_id",
+            "created_at",
+        ),
+        Index("ix_detections_bucket_key", "bucket_key"),
+    )
     id: int = Field(None, primary_key=True)
     camera_id: int = Field(..., foreign_key="cameras.id", nullable=False)
     pose_id: int = Field(..., foreign_key="poses.id", nullable=False)
@@ -97,6 +120,58 @@ class Detection(SQLModel, table=True):
         nullable=False,
         description="UTC timestamp of when the image was captured on-device. Defaults to created_at when unknown.",
     )
+    # Decoded copy of bbox / others_bboxes, kept in sync on every flush (see _sync_bbox_columns):
+    # the strings stay the API format, the numeric columns are what the server reads and queries.
+    # NULL for continuity rows (empty bbox); excluded from API serialization.
+    bbox_xmin: Union[float, None] = Field(None, nullable=True, exclude=True)
+    bbox_ymin: Union[float, None] = Field(None, nullable=True, exclude=True)
+    bbox_xmax: Union[float, None] = Field(None, nullable=True, exclude=True)
+    bbox_ymax: Union[float, None] = Field(None, nullable=True, exclude=True)
+    bbox_conf: Union[float, None] = Field(None, nullable=True, exclude=True)
+    # Flattened others_bboxes: [xmin, ymin, xmax, ymax, conf, xmin, ...]
+    others_coords: Union[List[float], None] = Field(None, sa_type=ARRAY(Float), nullable=True, exclude=True)
+    frame_spooled: bool = Field(
+        default=False,
+        nullable=False,
+        exclude=True,
+        description=(
+            "Whether the frame (bucket_key) is still in the write-behind spool of the host that received it, "
+            "not on the bucket yet. Cleared once uploaded; the validation worker waits for it to score."
+        ),
+    )
+
+    @property
+    def primary_bbox(self) -> Union[BBox, None]:
+        """Primary box as decoded at ingest, or None for a continuity row."""
+        coords = (self.bbox_xmin, self.bbox_ymin, self.bbox_xmax, self.bbox_ymax, self.bbox_conf)
+        if any(coord is None for coord in coords):
+            return None
+        return cast(BBox, coords)
+
+
+def _sync_bbox_columns(detection: Detection) -> None:
+    boxes = decode_bboxes(detection.bbox)
+    primary = boxes[0] if boxes else (None, None, None, None, None)
+    (
+        detection.bbox_xmin,
+        detection.bbox_ymin,
+        detection.bbox_xmax,
+        detection.bbox_ymax,
+        detection.bbox_conf,
+    ) = primary
+    detection.others_coords = flatten_bboxes(decode_bboxes(detection.others_bboxes)) or None
+
+
+@event.listens_for(Detection, "before_insert")
+def _detection_before_insert(_mapper: Mapper, _connection: Connection, target: Detection) -> None:
+    _sync_bbox_columns(target)
+
+
+@event.listens_for(Detection, "before_update")
+def _detection_before_update(_mapper: Mapper, _connection: Connection, target: Detection) -> None:
+    state = inspect(target)
+    if state.attrs.bbox.history.has_changes() or state.attrs.others_bboxes.history.has_changes():
+        _sync_bbox_columns(target)
 
 
 # sequences.validation_status values — the single source of truth (enforced by a DB CHECK
@@ -112,6 +187,26 @@ TERMINAL_VALIDATION_STATUSES = (WINDOW_EXHAUSTED, VALIDATION_FAILED)
 
 class Sequence(SQLModel, table=True):
     __tablename__ = "sequences"
+    __table_args__ = (
+        Index("ix_sequences_camera_id_pose_id_last_seen_at", "camera_id", "pose_id", "last_seen_at"),
+        Index("ix_sequences_started_at", "started_at"),
+        Index(
+            "ix_sequences_last_seen_at_unlabeled",
+            "last_seen_at",
+            postgresql_where=text("is_wildfire IS NULL"),
+        ),
+        Index(
+            "ix_sequences_camera_id_validation_rank_at",
+            "camera_id",
+            "validation_rank_at",
+            postgresql_where=text("validation_due_at IS NOT NULL"),
+        ),
+        Index(
+            "ix_sequences_validation_lease_until",
+            "validation_lease_until",
+            postgresql_where=text("validation_lease_until IS NOT NULL"),
+        ),
+    )
     id: int = Field(None, primary_key=True)
     camera_id: int = Field(..., foreign_key="cameras.id", nullable=False)
     pose_id: Union[int, None] = Field(None, foreign_key="poses.id", nullable=True)
@@ -157,16 +252,36 @@ class Sequence(SQLModel, table=True):
             "Only validated sequences are triangulated and notified."
         ),
     )
-    # The three validation-job fields below are internal plumbing (the DB-backed queue);
+    # The validation-job fields below are internal plumbing (the DB-backed queue);
     # they are excluded from API serialization.
     validation_due_at: Union[datetime, None] = Field(
         None,
         nullable=True,
         exclude=True,
         description=(
-            "When set, the sequence is queued for temporal validation (set on each new detection, "
-            "kept at its oldest value while queued so ordering is FIFO). Cleared once the worker "
-            "reaches a verdict for the current frame set or a terminal state."
+            "When set, the sequence is queued for temporal validation, claimable from then on (set on "
+            "each new detection, kept at its oldest value while queued, pushed forward by retries and "
+            "deferrals). Cleared once the worker reaches a verdict for the current frame set or a "
+            "terminal state."
+        ),
+    )
+    validation_queued_at: Union[datetime, None] = Field(
+        None,
+        nullable=True,
+        exclude=True,
+        description=(
+            "When the queued job was enqueued: unlike validation_due_at, never moved by retries nor "
+            "deferrals, so the staleness fail-open bounds the whole wait. Cleared with validation_due_at."
+        ),
+    )
+    validation_rank_at: Union[datetime, None] = Field(
+        None,
+        nullable=True,
+        exclude=True,
+        description=(
+            "Claim order of the queued job: its enqueue time moved earlier by its priority (max_conf, "
+            "camera fire risk, cross-camera partners), at most TEMPORAL_VALIDATION_PRIORITY_SECONDS. "
+            "Only ever moves earlier while queued. Meaningless once validation_due_at is cleared."
         ),
     )
     validation_lease_until: Union[datetime, None] = Field(
@@ -202,10 +317,37 @@ class Sequence(SQLModel, table=True):
             "instead of retrying forever."
         ),
     )
+    # Frame manifest (see app.core.frames.FrameManifest), maintained at ingest so the
+    # validation worker reads the frames to score from this row alone. NULL frame_count: not
+    # built yet (or invalidated by a detection deletion); the worker rebuilds it.
+    frame_count: Union[int, None] = Field(
+        None, nullable=True, exclude=True, description="Distinct frames attached to the sequence."
+    )
+    recent_frame_keys: Union[List[str], None] = Field(None, sa_type=ARRAY(String), nullable=True, exclude=True)
+    # Flattened envelopes of the recent frames: [xmin, ymin, xmax, ymax, xmin, ...], NULLs for no bbox
+    recent_frame_rois: Union[List[Union[float, None]], None] = Field(
+        None, sa_type=ARRAY(Float), nullable=True, exclude=True
+    )
+    detection_removed_at: Union[datetime, None] = Field(
+        None,
+        nullable=True,
+        exclude=True,
+        description=(
+            "Last time a detection of the sequence was deleted. Unlike last_seen_at it moves on "
+            "removals, so every worker's sequence index reloads the last bbox of the sequence."
+        ),
+    )
+
+    @property
+    def frame_manifest(self) -> Union[FrameManifest, None]:
+        if self.frame_count is None:
+            return None
+        return FrameManifest.from_columns(self.frame_count, self.recent_frame_keys, self.recent_frame_rois)
 
 
 class Alert(SQLModel, table=True):
     __tablename__ = "alerts"
+    __table_args__ = (Index("ix_alerts_organization_id_started_at", "organization_id", "started_at"),)
     id: int = Field(None, primary_key=True)
     organization_id: int = Field(..., foreign_key="organizations.id", nullable=False)
     lat: Union[float, None] = Field(default=None, gt=-90, lt=90, nullable=True)
@@ -216,10 +358,43 @@ class Alert(SQLModel, table=True):
 
 class AlertSequence(SQLModel, table=True):
     __tablename__ = "alerts_sequences"
+    # The composite primary key leads with alert_id
+    __table_args__ = (Index("ix_alerts_sequences_sequence_id", "sequence_id"),)
     alert_id: int = Field(primary_key=True, foreign_key="alerts.id")
     sequence_id: int = Field(primary_key=True, foreign_key="sequences.id")
 
 
+class IdempotencyKey(SQLModel, table=True):
+    """Outcome of a detection upload, keyed by the client-supplied ``Idempotency-Key``.
+
+    A camera retrying a timed-out upload resends the same key and gets the original
+    detection back instead of a duplicate. ``detection_id`` is None when the frame stored
+    nothing (204). Rows expire after ``IDEMPOTENCY_KEY_TTL_SECONDS``.
+    """
+
+    __tablename__ = "idempotency_keys"
+    camera_id: int = Field(..., primary_key=True, foreign_key="cameras.id")
+    key: str = Field(..., primary_key=True, max_length=255)
+    detection_id: Union[int, None] = Field(None, nullable=True)
+    created_at: datetime = Field(default_factory=utcnow, nullable=False)
+
+
+class TemporalBreaker(SQLModel, table=True):
+    """Circuit-breaker state of the temporal API shared by every process (TEMPORAL_API_SHARED_BREAKER).
+
+    A single row (id 1), created on first use. ``paused_until`` set: the breaker is open
+    until then, half-open once it elapsed; ``probe_until`` is the lease of the one process
+    elected to probe the API while half-open.
+    """
+
+    __tablename__ = "temporal_breaker"
+    id: int = Field(None, primary_key=True)
+    consecutive_failures: int = Field(default=0, nullable=False)
+    open_count: int = Field(default=0, nullable=False)
+    paused_until: Union[datetime, None] = Field(None, nullable=True)
+    probe_until: Union[datetime, None] = Field(None, nullable=True)
+
+
 class Organization(SQLModel, table=True):
     __tablename__ = "organizations"
     id: int = Field(None, primary_key=True)
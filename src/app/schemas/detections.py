@@ -8,26 +8,28 @@ from typing import Optional, Union
 
 from pydantic import BaseModel, Field
 
+from app.core.bboxes import BOX_PATTERN, BOXES_PATTERN, EMPTY_BBOXES, FLOAT_PATTERN
 from app.core.config import settings
-from app.models import AnnotationType, Detection
-
-__all__ = ["EMPTY_BBOXES", "DetectionCreate", "DetectionLabel", "DetectionRead", "DetectionUrl", "DetectionWithUrl"]
+from app.models import AnnotationType
+
+__all__ = [
+    "BOXES_PATTERN",
+    "BOX_PATTERN",
+    "EMPTY_BBOXES",
+    "FLOAT_PATTERN",
+    "DetectionBatchItem",
+    "DetectionCreate",
+    "DetectionLabel",
+    "DetectionRead",
+    "DetectionUrl",
+    "DetectionWithUrl",
+]
 
 
 class DetectionLabel(BaseModel):
     is_wildfire: AnnotationType
 
 
-# Regex for a float between 0 and 1, with a maximum of 3 decimals
-FLOAT_PATTERN = r"(0?\.[0-9]{1,3}|0|1)"
-BOX_PATTERN = rf"\({FLOAT_PATTERN},{FLOAT_PATTERN},{FLOAT_PATTERN},{FLOAT_PATTERN},{FLOAT_PATTERN}\)"
-# An empty list is valid: a frame with no detection (kept for sequence continuity).
-BOXES_PATTERN = rf"^\[({BOX_PATTERN}(,{BOX_PATTERN})*)?\]$"
-
-# Stored bbox of a continuity detection: a frame attached to a sequence with no detection on it.
-EMPTY_BBOXES = "[]"
-
-
 class DetectionCreate(BaseModel):
     camera_id: int = Field(..., gt=0)
     pose_id: int = Field(..., gt=0)
@@ -41,12 +43,14 @@ class DetectionCreate(BaseModel):
         json_schema_extra={"examples": ["[(0.1, 0.1, 0.9, 0.9, 0.5)]"]},
     )
     others_bboxes: Optional[str] = Field(None, max_length=settings.MAX_BBOX_STR_LENGTH_OTHERS)
-    # Only set when the sequence is known at creation time (continuity rows); real detections
-    # are matched to a sequence after creation.
+    # Set when the sequence is known at creation time (continuity rows and detections matching an
+    # open sequence); a detection seeding a new sequence is attached to it after creation.
     sequence_id: Optional[int] = Field(None, gt=0)
     recorded_at: Optional[datetime] = Field(
         None, description="UTC timestamp of when the image was captured on-device. Defaults to server now if omitted."
     )
+    # Set when the frame was written to the write-behind spool instead of the bucket
+    frame_spooled: bool = False
 
 
 class DetectionUrl(BaseModel):
@@ -54,11 +58,33 @@ class DetectionUrl(BaseModel):
     crop_url: Optional[str] = Field(None, description="temporary URL to access the cropped media content, if any")
 
 
-class DetectionRead(Detection):
+class _DetectionResponse(BaseModel):
+    # Public columns of a detection: the decoded bbox columns and the spool flag of the table
+    # model are internal, and left out of the responses.
+    id: int
+    camera_id: int
+    pose_id: int
+    sequence_id: Union[int, None] = None
+    bucket_key: str
+    crop_bucket_key: Union[str, None] = None
+    bbox: str
+    others_bboxes: Union[str, None] = None
+    created_at: datetime
+    recorded_at: datetime
+
+
+class DetectionRead(_DetectionResponse):
     pass
 
 
-class DetectionWithUrl(Detection):
+class DetectionBatchItem(BaseModel):
+    frame_index: int = Field(..., ge=0, description="position of the frame in the batch request")
+    detection: Optional[DetectionRead] = Field(
+        None, description="first detection registered for the frame, null if the frame stored nothing"
+    )
+
+
+class DetectionWithUrl(_DetectionResponse):
     url: str = Field(..., description="temporary URL to access the media content")
     crop_url: Optional[str] = Field(None, description="temporary URL to access the cropped media content, if any")
 
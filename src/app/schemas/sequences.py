@@ -4,9 +4,12 @@
 # See LICENSE or go to <https://opensource.org/licenses/Apache-2.0> for full license details.
 
 from datetime import datetime
-from typing import Union
+from typing import List, Union
 
 from pydantic import BaseModel, Field
+from sqlalchemy import Float, String
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlmodel import Field as SQLModelField
 
 from app.models import AnnotationType, Sequence
 
@@ -25,8 +28,15 @@ class SequenceLabel(BaseModel):
 class SequenceRead(Sequence):
     detections_count: int = 0
     # Validation-job plumbing: re-declared so the subclass gets plain None defaults (the
-    # inherited attributes are SQLAlchemy-instrumented) and stays excluded from responses.
+    # inherited attributes are SQLAlchemy-instrumented) and stays excluded from responses. A
+    # list has no implicit SQL type, so the frame manifest arrays also spell out their column type.
     validation_due_at: Union[datetime, None] = Field(None, exclude=True)
+    validation_queued_at: Union[datetime, None] = Field(None, exclude=True)
+    validation_rank_at: Union[datetime, None] = Field(None, exclude=True)
     validation_lease_until: Union[datetime, None] = Field(None, exclude=True)
     validation_status: Union[str, None] = Field(None, exclude=True)
     validation_attempts: int = Field(0, exclude=True)
+    frame_count: Union[int, None] = Field(None, exclude=True)
+    recent_frame_keys: Union[List[str], None] = SQLModelField(None, sa_type=ARRAY(String), exclude=True)
+    recent_frame_rois: Union[List[Union[float, None]], None] = SQLModelField(None, sa_type=ARRAY(Float), exclude=True)
+    detection_removed_at: Union[datetime, None] = Field(None, exclude=True)
@@ -0,0 +1,64 @@
+# Copyright (C) 2026, Pyronear.
+
+# This program is licensed under the Apache License 2.0.
+# See LICENSE or go to <https://www.apache.org/licenses/LICENSE-2.0> for full license details.
+
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.bboxes import BBox
+
+__all__ = ["assign_boxes", "match_matrices"]
+
+
+def _as_array(boxes: Sequence[BBox]) -> np.ndarray:
+    return np.asarray(boxes, dtype=float).reshape(-1, 5)
+
+
+def match_matrices(boxes: Sequence[BBox], targets: Sequence[BBox], tolerance: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Pairwise match feasibility and score between two sets of boxes, in one vectorized pass.
+
+    A pair is feasible when the boxes intersect, or are apart by less than ``tolerance``
+    (relative coords) on each axis, so a plume whose bbox drifts between frames still matches.
+    The score ranks feasible pairs: their IoU when they intersect, else minus their widest gap.
+
+    Returns:
+        ``(feasible, score)``, both of shape ``(len(boxes), len(targets))``
+    """
+    left, right = _as_array(boxes)[:, None, :], _as_array(targets)[None, :, :]
+    inter_w = np.minimum(left[..., 2], right[..., 2]) - np.maximum(left[..., 0], right[..., 0])
+    inter_h = np.minimum(left[..., 3], right[..., 3]) - np.maximum(left[..., 1], right[..., 1])
+    feasible = (inter_w > -tolerance) & (inter_h > -tolerance)
+    inter = np.clip(inter_w, 0, None) * np.clip(inter_h, 0, None)
+    area_l = (left[..., 2] - left[..., 0]) * (left[..., 3] - left[..., 1])
+    area_r = (right[..., 2] - right[..., 0]) * (right[..., 3] - right[..., 1])
+    union = area_l + area_r - inter
+    iou = np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+    score = np.where(inter > 0, iou, np.minimum(inter_w, inter_h))
+    return feasible, score
+
+
+def assign_boxes(boxes: Sequence[BBox], targets: Sequence[BBox], tolerance: float) -> List[Optional[int]]:
+    """Index of the target each box is assigned to, or None when no target is within reach.
+
+    Feasible pairs are taken best score first, one box per target, so a box never takes a
+    target that fits another box better. Boxes left over once their feasible targets are all
+    taken (several boxes on the same plume) join the best of them.
+    Ties keep the order of ``targets``.
+    """
+    if not boxes or not targets:
+        return [None] * len(boxes)
+    feasible, score = match_matrices(boxes, targets, tolerance)
+    rows, cols = np.nonzero(feasible)
+    order = np.lexsort((cols, rows, -score[rows, cols]))
+    assigned: List[Optional[int]] = [None] * len(boxes)
+    taken = np.zeros(len(targets), dtype=bool)
+    for row, col in zip(rows[order].tolist(), cols[order].tolist(), strict=True):
+        if assigned[row] is None and not taken[col]:
+            assigned[row] = col
+            taken[col] = True
+    for row in range(len(boxes)):
+        if assigned[row] is None and feasible[row].any():
+            assigned[row] = int(np.argmax(np.where(feasible[row], score[row], -np.inf)))
+    return assigned
@@ -3,14 +3,14 @@
 # This program is licensed under the Apache License 2.0.
 # See LICENSE or go to <https://www.apache.org/licenses/LICENSE-2.0> for full license details.
 
-from ast import literal_eval
 from operator import itemgetter
-from typing import Tuple
+from typing import Sequence, Tuple
 
+from app.core.bboxes import BBox
 
-def resolve_cone(azimuth: float, bboxes_str: str, aov: float) -> Tuple[float, float]:
-    """Compute the cone azimuth and opening angle using the most confident bbox."""
-    bboxes = literal_eval(bboxes_str)
+
+def cone_from_bboxes(azimuth: float, bboxes: Sequence[BBox], aov: float) -> Tuple[float, float]:
+    """Compute the cone azimuth and opening angle using the bbox with the rightmost edge."""
     xmin, _, xmax, _, _ = max(bboxes, key=itemgetter(2))
     cone_azimuth = round(azimuth + aov * ((xmin + xmax) / 2 - 0.5), 1) % 360
     cone_angle = round(aov * (xmax - xmin), 1)
@@ -10,15 +10,13 @@ import itertools
 import logging
 from collections import defaultdict
 from datetime import timedelta
-from math import atan2, cos, radians, sin, sqrt
+from math import atan2, ceil, cos, radians, sin, sqrt
 from typing import Any, Dict, List, Optional, Tuple
 
 import networkx as nx
 import numpy as np
 import pandas as pd
-import pyproj
-from geopy.distance import geodesic
-from pyproj import Transformer
+from pyproj import Geod, Transformer
 from shapely.geometry import Polygon
 from shapely.geometry.base import BaseGeometry
 from shapely.ops import transform as shapely_transform
@@ -27,6 +25,17 @@ from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Geodesic solver (WGS84, as geopy's geodesic) and projections, built once: cone building runs
+# for every sequence of every overlap computation, always on the event loop thread
+_GEOD = Geod(ellps="WGS84")
+_TO_3857 = Transformer.from_crs("EPSG:4326", "EPSG:3857", always_xy=True)
+_TO_4326 = Transformer.from_crs("EPSG:3857", "EPSG:4326", always_xy=True)
+# Cone arcs get a point every ARC_STEP_DEGREES (a chord then strays < 2 m from a 30 km arc),
+# between MIN_ARC_POINTS for narrow cones and MAX_ARC_POINTS for wide ones
+ARC_STEP_DEGREES = 1.0
+MIN_ARC_POINTS = 3
+MAX_ARC_POINTS = 36
+
 
 def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """
@@ -71,11 +80,26 @@ def get_centroid_latlon(geom: BaseGeometry) -> Tuple[float, float]:
         Latitude and longitude of the centroid in EPSG:4326.
     """
     centroid = geom.centroid
-    transformer = pyproj.Transformer.from_crs("EPSG:3857", "EPSG:4326", always_xy=True)
-    lon, lat = transformer.transform(centroid.x, centroid.y)
+    lon, lat = _TO_4326.transform(centroid.x, centroid.y)
     return float(lat), float(lon)
 
 
+def _arc_resolution(opening_angle: float) -> int:
+    """Number of points sampling a cone arc of ``opening_angle`` degrees."""
+    return min(max(ceil(opening_angle / ARC_STEP_DEGREES) + 1, MIN_ARC_POINTS), MAX_ARC_POINTS)
+
+
+def _arc_points(lat: float, lon: float, azimuths: np.ndarray, dist_km: float) -> List[Tuple[float, float]]:
+    """(lon, lat) of the points ``dist_km`` away from the apex along each azimuth, in one geodesic solve."""
+    lons, lats, _ = _GEOD.fwd(
+        np.full(azimuths.shape, lon),
+        np.full(azimuths.shape, lat),
+        azimuths % 360,
+        np.full(azimuths.shape, dist_km * 1000),
+    )
+    return list(zip(lons.tolist(), lats.tolist(), strict=True))
+
+
 def _build_cone_polygon(
     lat: float,
     lon: float,
@@ -83,10 +107,10 @@ def _build_cone_polygon(
     opening_angle: float,
     dist_km: float,
     r_min_km: float,
-    resolution: int = 36,
+    resolution: Optional[int] = None,
 ) -> Polygon:
     """
-    Build a cone sector polygon on the sphere then return it in geographic coordinates.
+    Build a cone sector polygon on the ellipsoid then return it in geographic coordinates.
 
     Parameters
     ----------
@@ -102,8 +126,8 @@ def _build_cone_polygon(
         Outer radius in kilometers.
     r_min_km : float
         Inner radius in kilometers.
-    resolution : int
-        Number of points to sample the arc.
+    resolution : int, optional
+        Number of points to sample the arc, chosen from the opening angle by default.
 
     Returns
     -------
@@ -111,16 +135,14 @@ def _build_cone_polygon(
         Cone polygon in EPSG:4326 coordinates.
     """
     half_angle = opening_angle / 2.0
-    angles = np.linspace(azimuth - half_angle, azimuth + half_angle, resolution)
+    angles = np.linspace(azimuth - half_angle, azimuth + half_angle, resolution or _arc_resolution(opening_angle))
 
     # Outer arc points
-    outer_arc = [geodesic(kilometers=dist_km).destination((lat, lon), float(az % 360)) for az in angles]
-    outer_points = [(p.longitude, p.latitude) for p in outer_arc]
+    outer_points = _arc_points(lat, lon, angles, dist_km)
 
     if r_min_km > 0:
         # Inner arc points, walk reversed so ring orientation stays valid
-        inner_arc = [geodesic(kilometers=r_min_km).destination((lat, lon), float(az % 360)) for az in reversed(angles)]
-        inner_points = [(p.longitude, p.latitude) for p in inner_arc]
+        inner_points = _arc_points(lat, lon, angles[::-1], r_min_km)
         # Outer ring with a hole for the inner radius
         return Polygon(outer_points + inner_points, holes=[inner_points]).buffer(0)
     # Triangle like sector with apex at camera position
@@ -141,8 +163,7 @@ def _project_polygon_from_4326_to_3857(polygon: Polygon) -> Polygon:
     Polygon
         Geometry in EPSG:3857.
     """
-    transformer = Transformer.from_crs("EPSG:4326", "EPSG:3857", always_xy=True)
-    return shapely_transform(transformer.transform, polygon)
+    return shapely_transform(_TO_3857.transform, polygon)
 
 
 def get_projected_cone(row: pd.Series, r_km: float, r_min_km: float) -> Polygon:
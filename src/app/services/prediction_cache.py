@@ -0,0 +1,91 @@
+# Copyright (C) 2026, Pyronear.
+
+# This program is licensed under the Apache License 2.0.
+# See LICENSE or go to <https://www.apache.org/licenses/LICENSE-2.0> for full license details.
+
+import time
+from collections import OrderedDict
+from typing import List, Tuple, Union
+
+from prometheus_client import Counter
+
+from app.core.config import settings
+from app.services.temporal import TemporalPrediction
+
+__all__ = ["PredictionCache", "prediction_cache"]
+
+# Lookups of the prediction cache by result (hit, miss), served by the instrumentator's /metrics
+CACHE_LOOKUPS = Counter(
+    "temporal_prediction_cache_lookups_total", "Lookups of the temporal prediction cache", ["result"]
+)
+
+# ROI corners are rounded to this many decimals in the key (a thousandth of the frame):
+# envelopes rebuilt from the same boxes must not miss on float noise.
+ROI_DECIMALS = 3
+
+CacheKey = Tuple[Union[str, None], str, Tuple[str, ...], Union[Tuple[float, ...], None]]
+
+
+class PredictionCache:
+    """Per-process LRU cache of temporal predictions, keyed by the exact frame set scored.
+
+    The model is deterministic for a given model release, frame list and ROI, so scoring the
+    same set again (a job resumed after a lost lease, a retry after a post-score failure, a
+    continuity row landing on an already-scored frame) can reuse the previous verdict.
+    Entries are keyed under the model version last reported by the temporal API: a redeploy
+    shows up with the first prediction of the new release, and the stale entries are
+    dropped then. Only scored predictions are kept, for ``TEMPORAL_PREDICTION_CACHE_TTL_SECONDS``
+    and at most ``TEMPORAL_PREDICTION_CACHE_SIZE`` of them (0 disables the cache). Shared by
+    the validation slots of the process; each process keeps its own, like the breaker.
+    """
+
+    def __init__(self) -> None:
+        self._entries: "OrderedDict[CacheKey, Tuple[float, TemporalPrediction]]" = OrderedDict()
+        self._model_version: Union[str, None] = None
+
+    def _key(self, bucket: str, frames: List[str], roi_xyxyn: Union[List[float], None]) -> CacheKey:
+        roi = None if roi_xyxyn is None else tuple(round(coord, ROI_DECIMALS) for coord in roi_xyxyn)
+        return self._model_version, bucket, tuple(frames), roi
+
+    def get(
+        self, bucket: str, frames: List[str], roi_xyxyn: Union[List[float], None] = None
+    ) -> Union[TemporalPrediction, None]:
+        """Cached prediction for this frame set, or None (counted as a miss)."""
+        if settings.TEMPORAL_PREDICTION_CACHE_SIZE <= 0:
+            return None
+        key = self._key(bucket, frames, roi_xyxyn)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self._entries.move_to_end(key)
+            CACHE_LOOKUPS.labels(result="hit").inc()
+            return entry[1]
+        if entry is not None:
+            del self._entries[key]
+        CACHE_LOOKUPS.labels(result="miss").inc()
+        return None
+
+    def put(
+        self,
+        bucket: str,
+        frames: List[str],
+        roi_xyxyn: Union[List[float], None],
+        prediction: TemporalPrediction,
+    ) -> None:
+        if settings.TEMPORAL_PREDICTION_CACHE_SIZE <= 0 or prediction.probability is None:
+            return
+        if prediction.model_version != self._model_version:
+            # New model release: what was cached scores with the previous one
+            self._entries.clear()
+            self._model_version = prediction.model_version
+        key = self._key(bucket, frames, roi_xyxyn)
+        self._entries[key] = (time.monotonic() + settings.TEMPORAL_PREDICTION_CACHE_TTL_SECONDS, prediction)
+        self._entries.move_to_end(key)
+        while len(self._entries) > settings.TEMPORAL_PREDICTION_CACHE_SIZE:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._model_version = None
+
+
+prediction_cache = PredictionCache()
@@ -3,8 +3,9 @@
 # This program is licensed under the Apache License 2.0.
 # See LICENSE or go to <https://www.apache.org/licenses/LICENSE-2.0> for full license details.
 
+import asyncio
 import logging
-from datetime import date
+from datetime import date, datetime, timedelta, timezone
 from typing import Literal, Union, cast
 
 import httpx
@@ -13,7 +14,7 @@ from app.core.config import settings
 
 logger = logging.getLogger("uvicorn.error")
 
-__all__ = ["FWI_MIN_CONF", "FwiClass", "min_confidence_for_class", "risk_service"]
+__all__ = ["FWI_MIN_CONF", "FWI_PRIORITY", "FwiClass", "min_confidence_for_class", "risk_refresh_loop", "risk_service"]
 
 # FWI classes accepted by the risk-api and as a manual ``risk_score`` override.
 FwiClass = Literal["very_low", "low", "moderate", "high", "very_high", "extreme"]
@@ -29,12 +30,27 @@ FWI_MIN_CONF: dict[str, float] = {
     "extreme": 0.0,
 }
 
+# Validation priority weight per FWI class, in [0, 1]: under a backlog, sequences of cameras
+# under a higher fire risk are scored first. Unknown classes weigh as "moderate".
+FWI_PRIORITY: dict[str, float] = {
+    "very_low": 0.0,
+    "low": 0.2,
+    "moderate": 0.4,
+    "high": 0.6,
+    "very_high": 0.8,
+    "extreme": 1.0,
+}
+
+
+def _normalize_class(fwi_class: str) -> str:
+    return fwi_class.strip().lower().replace(" ", "_")
+
 
 def min_confidence_for_class(fwi_class: Union[str, None]) -> Union[float, None]:
     """Return the min confidence required for this FWI class, or None if no filter applies."""
     if not fwi_class:
         return None
-    threshold = FWI_MIN_CONF.get(fwi_class.strip().lower().replace(" ", "_"))
+    threshold = FWI_MIN_CONF.get(_normalize_class(fwi_class))
     return threshold or None
 
 
@@ -80,6 +96,12 @@ class RiskService:
         """Return the min confidence required for this camera (today), or None if no filter."""
         return min_confidence_for_class(self._scores.get(camera_id))
 
+    def priority(self, camera_id: int) -> float:
+        """Return the validation priority weight of this camera's FWI class (today)."""
+        fwi_class = self._scores.get(camera_id)
+        default = FWI_PRIORITY["moderate"]
+        return FWI_PRIORITY.get(_normalize_class(fwi_class), default) if fwi_class else default
+
     async def _fetch(self, path: str, params: Union[dict, None] = None) -> object:
         risk_api_url = settings.RISK_API_URL
         risk_api_login = settings.RISK_API_LOGIN
@@ -119,3 +141,24 @@ class RiskService:
 
 
 risk_service = RiskService()
+
+
+def _seconds_until_next_utc_hour(target_hour: int) -> float:
+    hour = max(0, min(23, target_hour))
+    now = datetime.now(tz=timezone.utc)
+    target = now.replace(hour=hour, minute=0, second=0, microsecond=0)
+    if target <= now:
+        target += timedelta(days=1)
+    return (target - now).total_seconds()
+
+
+async def risk_refresh_loop() -> None:
+    """Refresh the cache every day at RISK_REFRESH_HOUR_UTC, in every process reading it."""
+    while True:
+        try:
+            await asyncio.sleep(_seconds_until_next_utc_hour(settings.RISK_REFRESH_HOUR_UTC))
+            await risk_service.refresh()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Risk refresh loop iteration failed; continuing")
@@ -5,8 +5,6 @@
 
 
 import logging
-import re
-from ast import literal_eval
 from typing import Any, Dict, List, Union, cast
 from typing import Sequence as TypingSequence
 
@@ -14,33 +12,11 @@ from sqlalchemy import case, or_
 from sqlalchemy.sql import ColumnElement
 
 from app.models import Sequence
-from app.schemas.detections import BOX_PATTERN
 from app.services.risk import min_confidence_for_class
 
 logger = logging.getLogger("uvicorn.error")
 
-__all__ = ["filter_by_class_per_camera", "max_conf_filter_clause", "max_conf_from_bboxes"]
-
-
-def max_conf_from_bboxes(*bbox_strings: Union[str, None]) -> Union[float, None]:
-    """Return the highest confidence found across the given bbox strings, or None if none parse."""
-    best: Union[float, None] = None
-    for raw in bbox_strings:
-        if not raw:
-            continue
-        for match in re.finditer(BOX_PATTERN, raw):
-            try:
-                bbox = literal_eval(match.group(0))
-            except (SyntaxError, ValueError):
-                continue
-            if not isinstance(bbox, tuple) or len(bbox) != 5:
-                continue
-            conf = bbox[4]
-            if not isinstance(conf, (int, float)):
-                continue
-            if best is None or conf > best:
-                best = float(conf)
-    return best
+__all__ = ["filter_by_class_per_camera", "max_conf_filter_clause"]
 
 
 def max_conf_filter_clause(class_per_camera: Dict[int, Union[str, None]]) -> Union[ColumnElement[bool], None]:
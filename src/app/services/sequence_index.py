@@ -0,0 +1,100 @@
+# Copyright (C) 2026, Pyronear.
+
+# This program is licensed under the Apache License 2.0.
+# See LICENSE or go to <https://www.apache.org/licenses/LICENSE-2.0> for full license details.
+
+from datetime import datetime
+from typing import Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+from app.core.bboxes import BBox
+
+__all__ = ["ActiveSequence", "SequenceIndex", "sequence_index"]
+
+
+class ActiveSequence(NamedTuple):
+    last_seen_at: datetime
+    # Last real bbox of the sequence (continuity rows excluded), None if it has none
+    bbox: Optional[BBox]
+    # detection_removed_at of the sequence when indexed
+    detection_removed_at: Optional[datetime] = None
+
+
+class SequenceIndex:
+    """Per-process index of the active sequences of each (camera, pose) and their last bbox.
+
+    Spares the ingest path one latest-detection query (plus parsing) per candidate sequence.
+    The DB stays the source of truth, shared by all uvicorn workers: callers sync the index
+    against the pose's active sequences on every frame, and an entry is only trusted while
+    its last_seen_at and detection_removed_at match the DB: every real detection appended to
+    a sequence refreshes the former, every detection deleted from it the latter, whichever
+    worker served the request. Entries are dropped as soon as their sequence leaves the
+    active window.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[Tuple[int, int], Dict[int, ActiveSequence]] = {}
+        self._key_by_sequence: Dict[int, Tuple[int, int]] = {}
+
+    def sync(
+        self, camera_id: int, pose_id: int, versions_by_id: Mapping[int, Tuple[datetime, Optional[datetime]]]
+    ) -> List[int]:
+        """Align the pose entries on its active sequences, returning the ids whose bbox must be (re)loaded.
+
+        Args:
+            camera_id: camera of the pose
+            pose_id: pose whose active sequences are given
+            versions_by_id: (last_seen_at, detection_removed_at) of each active sequence, from the DB
+
+        Returns:
+            the ids of the sequences unknown to the index or changed since indexed
+        """
+        key = (camera_id, pose_id)
+        entries = self._entries.setdefault(key, {})
+        for seq_id in [seq_id for seq_id in entries if seq_id not in versions_by_id]:
+            self.discard(seq_id)
+        if not versions_by_id:
+            self._entries.pop(key, None)
+            return []
+        return [
+            seq_id
+            for seq_id, version in versions_by_id.items()
+            if (entry := entries.get(seq_id)) is None or (entry.last_seen_at, entry.detection_removed_at) != version
+        ]
+
+    def put(
+        self,
+        camera_id: int,
+        pose_id: int,
+        sequence_id: int,
+        last_seen_at: datetime,
+        bbox: Optional[BBox],
+        detection_removed_at: Optional[datetime] = None,
+    ) -> None:
+        key = (camera_id, pose_id)
+        self._entries.setdefault(key, {})[sequence_id] = ActiveSequence(last_seen_at, bbox, detection_removed_at)
+        self._key_by_sequence[sequence_id] = key
+
+    def extend(self, sequence_id: int, last_seen_at: datetime, bbox: BBox) -> None:
+        """Record a detection appended to an indexed sequence, keeping its removal marker."""
+        key = self._key_by_sequence.get(sequence_id)
+        if key is not None:
+            entries = self._entries[key]
+            entries[sequence_id] = entries[sequence_id]._replace(last_seen_at=last_seen_at, bbox=bbox)
+
+    def active(self, camera_id: int, pose_id: int) -> List[Tuple[int, ActiveSequence]]:
+        """Indexed sequences of the pose, most recently seen first."""
+        entries = self._entries.get((camera_id, pose_id), {})
+        return sorted(entries.items(), key=lambda item: item[1].last_seen_at, reverse=True)
+
+    def discard(self, sequence_id: int) -> None:
+        """Forget a sequence (deleted or relabeled): rebuilt from the DB on next use."""
+        key = self._key_by_sequence.pop(sequence_id, None)
+        if key is not None:
+            self._entries.get(key, {}).pop(sequence_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._key_by_sequence.clear()
+
+
+sequence_index = SequenceIndex()
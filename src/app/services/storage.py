@@ -3,24 +3,48 @@
 # This program is licensed under the Apache License 2.0.
 # See LICENSE or go to <https://opensource.org/licenses/Apache-2.0> for full license details.
 
+import asyncio
+import base64
+import contextlib
 import hashlib
 import logging
+import os
+import shutil
+import time
+from functools import lru_cache
+from itertools import starmap
 from mimetypes import guess_extension
-from typing import Any, BinaryIO, Dict, Union
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, List, Tuple, Union, cast
 
 import boto3
 import magic
+from anyio import CapacityLimiter, to_thread
 from botocore.exceptions import ClientError, EndpointConnectionError, NoCredentialsError, PartialCredentialsError
 from fastapi import HTTPException, UploadFile, status
+from prometheus_client import Histogram
 
 from app.core.config import settings
 from app.core.time import utcnow
 
-__all__ = ["s3_service", "upload_file"]
+__all__ = ["media_spool", "s3_service", "spool_uploader_loop", "upload_file"]
 
 
 logger = logging.getLogger("uvicorn.warning")
 
+# Read size of the hashing pass over uploaded files
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Direct uploads, by phase (queue: wait for an S3_UPLOAD_CONCURRENCY slot; transfer: hashing,
+# upload and integrity check), served by the instrumentator's /metrics: a growing queue share
+# means the limiter is saturated
+UPLOAD_SECONDS = Histogram(
+    "s3_upload_seconds",
+    "Duration of the S3 uploads of the process, by phase",
+    ["phase"],
+    buckets=(0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
 
 class S3Bucket:
     """S3 bucket manager
@@ -56,10 +80,26 @@ class S3Bucket:
             logger.warning(e)
             return False
 
-    def upload_file(self, bucket_key: str, file_binary: BinaryIO) -> bool:
-        """Upload a file to bucket and return whether the upload succeeded"""
-        # https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3.html#S3.Bucket.upload_fileobj
-        self._s3.upload_fileobj(file_binary, self.name, bucket_key)
+    def upload_file(self, bucket_key: str, file_binary: BinaryIO, content_md5: Union[str, None] = None) -> bool:
+        """Upload a file to bucket and return whether the upload succeeded
+
+        Args:
+            bucket_key: the key of the file on the bucket
+            file_binary: the file to upload
+            content_md5: base64-encoded MD5 digest of the file. When given, the body is streamed in a
+                single PUT carrying it as Content-MD5, so S3 itself rejects a body corrupted in transit.
+        """
+        if content_md5 is None:
+            # https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3.html#S3.Bucket.upload_fileobj
+            self._s3.upload_fileobj(file_binary, self.name, bucket_key)
+            return True
+        # https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/s3.html#S3.Client.put_object
+        try:
+            self._s3.put_object(Bucket=self.name, Key=bucket_key, Body=file_binary, ContentMD5=content_md5)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in {"BadDigest", "InvalidDigest"}:
+                return False
+            raise
         return True
 
     def delete_file(self, bucket_key: str) -> None:
@@ -192,35 +232,137 @@ class S3Service:
         return f"{settings.SERVER_NAME}-alert-api-{organization_id!s}"
 
 
-async def upload_file(file: UploadFile, organization_id: int, camera_id: int, key_prefix: str = "") -> str:
-    """Upload a file to S3 storage and return the public URL"""
-    # Concatenate the first 8 chars (to avoid system interactions issues) of SHA256 hash with file extension
-    sha_hash = hashlib.sha256(file.file.read()).hexdigest()
-    await file.seek(0)
-    # Use MD5 to verify upload
-    md5_hash = hashlib.md5(file.file.read()).hexdigest()  # ruff:ignore[hashlib-insecure-hash-function]
-    await file.seek(0)
+class MediaSpool:
+    """Write-behind buffer of media bound for S3, on local disk
+
+    Files are laid out as ``<root>/<organization_id>/<bucket_key>``, written to a temporary
+    name then renamed, so a spooled file is always complete. A file leaves the spool once it
+    is stored on the bucket: delivery is at-least-once (a crash between the upload and the
+    removal uploads it again, to the same key with the same bytes).
+
+    Args:
+        root: the spool directory, empty to disable the spool
+    """
+
+    def __init__(self, root: str) -> None:
+        self.root = Path(root) if root else None
+
+    @property
+    def is_enabled(self) -> bool:
+        return self.root is not None
+
+    def _path(self, organization_id: int, bucket_key: str) -> Path:
+        return cast(Path, self.root) / str(organization_id) / bucket_key
+
+    def put(self, organization_id: int, bucket_key: str, file_binary: BinaryIO) -> None:
+        """Durably write a file to the spool"""
+        path = self._path(organization_id, bucket_key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Dot-prefixed temporary name: never picked up by the uploader
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with tmp_path.open("wb") as spooled:
+            shutil.copyfileobj(file_binary, spooled, UPLOAD_CHUNK_SIZE)
+            spooled.flush()
+            os.fsync(spooled.fileno())
+        tmp_path.replace(path)
+
+    def pending(self, organization_id: int, bucket_keys: Iterable[str]) -> bool:
+        """Whether any of the files is still waiting for its upload"""
+        return self.is_enabled and any(self._path(organization_id, key).exists() for key in bucket_keys)
+
+    def discard(self, organization_id: int, bucket_key: str) -> None:
+        """Drop a file that must not reach the bucket anymore (its detection was deleted)"""
+        if self.is_enabled:
+            with contextlib.suppress(FileNotFoundError):
+                self._path(organization_id, bucket_key).unlink()
+
+    def entries(self) -> List[Tuple[int, str]]:
+        """``(organization_id, bucket_key)`` of the spooled files, oldest first"""
+        if self.root is None or not self.root.is_dir():
+            return []
+        files = [
+            path
+            for org_dir in self.root.iterdir()
+            if org_dir.is_dir() and org_dir.name.isdigit()
+            for path in org_dir.iterdir()
+            if not path.name.startswith(".")
+        ]
+        with_mtimes = []
+        for path in files:
+            # Another process may upload and remove a file while we list
+            with contextlib.suppress(FileNotFoundError):
+                with_mtimes.append((path.stat().st_mtime, int(path.parent.name), path.name))
+        return [(organization_id, key) for _, organization_id, key in sorted(with_mtimes)]
+
+    def flush_file(self, organization_id: int, bucket_key: str) -> bool:
+        """Upload a spooled file to the bucket, then remove it from the spool; returns whether it was uploaded"""
+        path = self._path(organization_id, bucket_key)
+        try:
+            spooled = path.open("rb")
+        except FileNotFoundError:
+            # Already flushed by a sibling process, or discarded
+            return False
+        with spooled:
+            md5_hash = hashlib.md5()  # ruff:ignore[hashlib-insecure-hash-function]
+            while chunk := spooled.read(UPLOAD_CHUNK_SIZE):
+                md5_hash.update(chunk)
+            spooled.seek(0)
+            bucket = s3_service.get_bucket(s3_service.resolve_bucket_name(organization_id))
+            if not bucket.upload_file(bucket_key, spooled, content_md5=base64.b64encode(md5_hash.digest()).decode()):
+                raise ValueError(f"{bucket_key} was corrupted during upload")
+        with contextlib.suppress(FileNotFoundError):
+            path.unlink()
+        return True
+
+    async def flush(self) -> Tuple[List[str], int]:
+        """Upload every spooled file, S3_UPLOAD_CONCURRENCY at a time; returns ``(uploaded keys, failed)``
+
+        A failed upload is logged and left in the spool for the next pass.
+        """
+
+        async def _flush_one(organization_id: int, bucket_key: str) -> Union[bool, None]:
+            try:
+                async with _get_upload_limiter():
+                    return await to_thread.run_sync(self.flush_file, organization_id, bucket_key)
+            except Exception:
+                logger.exception(f"Spooled file {bucket_key} could not be uploaded; retrying later")
+                return None
+
+        entries = self.entries()
+        results = await asyncio.gather(*starmap(_flush_one, entries))
+        uploaded = [bucket_key for (_, bucket_key), result in zip(entries, results, strict=True) if result]
+        return uploaded, sum(result is None for result in results)
+
+
+def _upload_file_sync(
+    file_binary: BinaryIO, organization_id: int, camera_id: int, key_prefix: str, spool: bool = False
+) -> str:
+    # Single chunked pass: both hashes plus the MIME sniff, memory bounded by the chunk size
+    file_binary.seek(0)
+    sha_hash = hashlib.sha256()
+    # Content-MD5 lets S3 verify the upload
+    md5_hash = hashlib.md5()  # ruff:ignore[hashlib-insecure-hash-function]
+    head = b""
+    while chunk := file_binary.read(UPLOAD_CHUNK_SIZE):
+        if not head:
+            head = chunk
+        sha_hash.update(chunk)
+        md5_hash.update(chunk)
     # guess_extension will return none if this fails
-    extension = guess_extension(magic.from_buffer(file.file.read(), mime=True)) or ""
-    # Concatenate timestamp & hash; key_prefix lets callers segregate distinct uploads in the
-    # same request (e.g. frame vs crop) so identical bytes don't collide on the same key.
-    bucket_key = f"{key_prefix}{camera_id}-{utcnow().strftime('%Y%m%d%H%M%S')}-{sha_hash[:8]}{extension}"
+    extension = guess_extension(magic.from_buffer(head, mime=True)) or ""
+    # Concatenate the first 8 chars (to avoid system interactions issues) of SHA256 hash with file extension,
+    # after the timestamp; key_prefix lets callers segregate distinct uploads in the same request (e.g. frame
+    # vs crop) so identical bytes don't collide on the same key.
+    bucket_key = f"{key_prefix}{camera_id}-{utcnow().strftime('%Y%m%d%H%M%S')}-{sha_hash.hexdigest()[:8]}{extension}"
     # Reset byte position of the file (cf. https://fastapi.tiangolo.com/tutorial/request-files/#uploadfile)
-    await file.seek(0)
+    file_binary.seek(0)
+    if spool and media_spool.is_enabled:
+        media_spool.put(organization_id, bucket_key, file_binary)
+        return bucket_key
     bucket_name = s3_service.resolve_bucket_name(organization_id)
     bucket = s3_service.get_bucket(bucket_name)
-    # Upload the file
-    if not bucket.upload_file(bucket_key, file.file):
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed upload")
-    logger.info(f"File uploaded to bucket {bucket_name} with key {bucket_key}.")
-
-    # Data integrity check
-    file_meta = bucket.get_file_metadata(bucket_key)
-    # Corrupted file
-    if md5_hash != file_meta["ETag"].replace('"', ""):
-        # Delete the corrupted upload
-        bucket.delete_file(bucket_key)
-        # Raise the exception
+    # Upload the file: S3 rejects the body if it doesn't match the digest, nothing is stored then
+    if not bucket.upload_file(bucket_key, file_binary, content_md5=base64.b64encode(md5_hash.digest()).decode()):
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Data was corrupted during upload",
@@ -228,6 +370,81 @@ async def upload_file(file: UploadFile, organization_id: int, camera_id: int, ke
     return bucket_key
 
 
+@lru_cache(maxsize=1)
+def _get_upload_limiter() -> CapacityLimiter:
+    # Created lazily: a limiter needs the running event loop of the process
+    return CapacityLimiter(settings.S3_UPLOAD_CONCURRENCY)
+
+
+async def upload_file(
+    file: UploadFile, organization_id: int, camera_id: int, key_prefix: str = "", spool: bool = False
+) -> str:
+    """Upload a file to S3 storage and return its bucket key
+
+    boto3 is blocking: hashing, upload and integrity check run in a worker thread so a slow S3
+    call never stalls the event loop, and concurrent uploads of a process share
+    S3_UPLOAD_CONCURRENCY threads (excess uploads wait for a free slot).
+
+    With ``spool`` set and S3_SPOOL_DIR configured, the file is written to the local spool
+    instead and uploaded later by ``spool_uploader_loop``: the key is returned right away,
+    without waiting for an upload slot nor for S3.
+    """
+    if spool and media_spool.is_enabled:
+        bucket_key = await to_thread.run_sync(
+            _upload_file_sync, file.file, organization_id, camera_id, key_prefix, True
+        )
+        logger.info(f"File spooled for bucket {s3_service.resolve_bucket_name(organization_id)} with key {bucket_key}.")
+        return bucket_key
+    queued_at = time.perf_counter()
+    async with _get_upload_limiter():
+        started_at = time.perf_counter()
+        bucket_key = await to_thread.run_sync(_upload_file_sync, file.file, organization_id, camera_id, key_prefix)
+    done_at = time.perf_counter()
+    UPLOAD_SECONDS.labels(phase="queue").observe(started_at - queued_at)
+    UPLOAD_SECONDS.labels(phase="transfer").observe(done_at - started_at)
+    logger.info(
+        f"File uploaded to bucket {s3_service.resolve_bucket_name(organization_id)} with key {bucket_key} "
+        f"in {done_at - started_at:.3f}s (waited {started_at - queued_at:.3f}s for an upload slot)."
+    )
+    return bucket_key
+
+
+async def _mark_frames_uploaded(bucket_keys: List[str]) -> None:
+    # Imported lazily: app.db imports this module
+    from app.crud import DetectionCRUD
+    from app.db import session_factory
+
+    async with session_factory() as session:
+        await DetectionCRUD(session).mark_frames_uploaded(bucket_keys)
+
+
+async def spool_uploader_loop() -> None:
+    """Drain the media spool to S3 for the lifetime of the process
+
+    Every process of a host runs one and they share the spool: a file flushed by two of them
+    is uploaded twice to the same key, which is harmless. Once uploaded, the frames are marked
+    as such on their detections, which is what the validation workers of every host wait for
+    (the flags that could not be cleared are retried on the next pass). A file leaves the
+    spool before its flag is cleared, so the ingest committing a detection after the upload
+    clears it instead (see ``_settle_spooled_frames``).
+    """
+    unmarked: List[str] = []
+    while True:
+        try:
+            uploaded, failed = await media_spool.flush()
+            unmarked.extend(uploaded)
+            if unmarked:
+                await _mark_frames_uploaded(unmarked)
+                unmarked = []
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Spool uploader pass failed; continuing")
+            failed = 1
+        await asyncio.sleep(settings.S3_SPOOL_RETRY_SECONDS if failed else settings.S3_SPOOL_POLL_SECONDS)
+
+
 s3_service = S3Service(
     settings.S3_REGION, settings.S3_ENDPOINT_URL, settings.S3_ACCESS_KEY, settings.S3_SECRET_KEY, settings.S3_PROXY_URL
 )
+media_spool = MediaSpool(settings.S3_SPOOL_DIR)
@@ -3,19 +3,44 @@
 # This program is licensed under the Apache License 2.0.
 # See LICENSE or go to <https://www.apache.org/licenses/LICENSE-2.0> for full license details.
 
+import asyncio
 import logging
 import random
-from datetime import timedelta
-from typing import List, NamedTuple, Union
+import time
+from datetime import datetime, timedelta
+from importlib.util import find_spec
+from typing import List, NamedTuple, Tuple, Union
 
 import httpx
+from prometheus_client import Counter, Gauge, Histogram
 
 from app.core.config import settings
 from app.core.time import utcnow
+from app.crud import TemporalBreakerCRUD
+from app.db import session_factory
 
 logger = logging.getLogger("uvicorn.error")
 
-__all__ = ["TemporalPrediction", "TemporalUnavailableError", "temporal_service"]
+__all__ = ["TemporalPrediction", "TemporalRequest", "TemporalUnavailableError", "temporal_service"]
+
+# Round-trip latency of the temporal API calls, by path (/predict, /predict/batch) and outcome
+# (ok, 4xx, 5xx, error), served by the instrumentator's /metrics
+PREDICT_SECONDS = Histogram(
+    "temporal_predict_seconds",
+    "Duration of the temporal API /predict and /predict/batch calls",
+    ["path", "outcome"],
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+# Breaker states (0 closed, 1 half-open, 2 open): the process breaker's is read at scrape time,
+# the shared one's (with TEMPORAL_API_SHARED_BREAKER) as of the process's last read of its row.
+# Trips of the process breaker and of the shared one (counted by the process that opened it).
+BREAKER_STATE = Gauge("temporal_breaker_state", "State of the temporal API breaker", ["scope"])
+BREAKER_TRIPS = Counter("temporal_breaker_trips_total", "Times the temporal API breaker opened", ["scope"])
+
+
+def _observe_shared_breaker(paused_until: Union[datetime, None]) -> None:
+    """Report the state of the shared breaker, from the pause of its row as just read."""
+    BREAKER_STATE.labels(scope="shared").set(0 if paused_until is None else 2 if paused_until > utcnow() else 1)
 
 
 class TemporalUnavailableError(Exception):
@@ -36,16 +61,25 @@ class TemporalPrediction(NamedTuple):
     api_version: Union[str, None] = None
 
 
+class TemporalRequest(NamedTuple):
+    """One sequence to score: the bucket, its ordered frame keys and the optional ROI."""
+
+    bucket: str
+    frames: List[str]
+    roi_xyxyn: Union[List[float], None] = None
+
+
 class TemporalModelService:
     """Client for the temporal smoke classifier API with an in-memory circuit breaker.
 
     The model needs an ordered list of frame keys; the validation worker queries a sequence
     once it holds at least ``MIN_FRAMES`` distinct frames (window rules live in the worker).
 
-    Concurrency: the temporal API itself serializes inference server-side (single process,
-    lock around the model), so this client enforces no limit. Each pyro-api process runs one
-    validation worker, so with N uvicorn workers at most N calls are in flight — safe as
-    long as ``N * model_latency < TEMPORAL_API_TIMEOUT``.
+    Concurrency: this client enforces no limit. Each pyro-api process runs
+    ``TEMPORAL_VALIDATION_CONCURRENCY`` validation slots, so with N uvicorn workers at most
+    ``N * TEMPORAL_VALIDATION_CONCURRENCY`` calls are in flight — size it to what the temporal
+    API scores in parallel: calls it queues server-side must still answer within
+    ``TEMPORAL_API_TIMEOUT``.
 
     Breaker: after ``MAX_CONSECUTIVE_FAILURES`` outage-like failures (network errors, 5xx)
     in a row, calls are paused with exponential backoff — ``BASE_PAUSE_SECONDS`` doubled on
@@ -54,7 +88,19 @@ class TemporalModelService:
     immediately at the next backoff tier (no need for 3 more failures). 4xx responses fail
     the call (callers fail open) but CLOSE the breaker: the API answered, so it's reachable —
     a config/input problem, not an outage. State is per-process, like the risk cache: with N
-    uvicorn workers each process keeps its own breaker.
+    uvicorn workers each process keeps its own breaker. With ``TEMPORAL_API_SHARED_BREAKER``
+    the same state lives in one DB row instead (see :class:`TemporalBreakerCRUD`): every
+    process backs off after ``MAX_CONSECUTIVE_FAILURES`` failures in total, and a single
+    elected process probes while half-open.
+
+    Batching: the API scores a batch far more efficiently than single items, and serializes
+    inference anyway. With ``TEMPORAL_API_BATCH_SIZE`` > 1 the concurrent calls of a
+    process's validation slots are coalesced (up to that size, or for
+    ``TEMPORAL_API_BATCH_WINDOW_SECONDS``) into one ``/predict/batch`` round-trip.
+
+    Connections: one ``httpx.AsyncClient`` per process, opened in the app lifespan (or on
+    first use) and closed at shutdown, so consecutive calls reuse kept-alive connections
+    instead of paying a TCP/TLS handshake each.
     """
 
     MIN_FRAMES: int = 4
@@ -69,6 +115,37 @@ class TemporalModelService:
         self._open_count: int = 0
         self._paused_until: Union[float, None] = None
         self._half_open: bool = False
+        self._client: Union[httpx.AsyncClient, None] = None
+        # Coalesced calls waiting for the next /predict/batch request
+        self._batch: List[Tuple[TemporalRequest, asyncio.Future]] = []
+        self._batch_timer: Union[asyncio.TimerHandle, None] = None
+        self._batch_tasks: set = set()
+
+    def open(self) -> None:
+        """Open the process-lifetime HTTP client (idempotent)."""
+        self._get_client()
+
+    async def close(self) -> None:
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.aclose()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            http2 = settings.TEMPORAL_API_HTTP2
+            if http2 and find_spec("h2") is None:
+                logger.warning("TEMPORAL_API_HTTP2 is set but the h2 package is missing; using HTTP/1.1")
+                http2 = False
+            self._client = httpx.AsyncClient(
+                http2=http2,
+                timeout=httpx.Timeout(settings.TEMPORAL_API_TIMEOUT, connect=settings.TEMPORAL_API_CONNECT_TIMEOUT),
+                limits=httpx.Limits(
+                    max_connections=settings.TEMPORAL_API_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.TEMPORAL_API_MAX_CONNECTIONS,
+                    keepalive_expiry=settings.TEMPORAL_API_KEEPALIVE_SECONDS,
+                ),
+            )
+        return self._client
 
     @property
     def is_configured(self) -> bool:
@@ -88,18 +165,69 @@ class TemporalModelService:
             self._half_open = True
         return True
 
+    def breaker_state(self) -> int:
+        """State of the process breaker, without side effects: 0 closed, 1 half-open, 2 open."""
+        if self._paused_until is not None:
+            return 2 if utcnow().timestamp() < self._paused_until else 1
+        return 1 if self._half_open else 0
+
+    async def acquire(self) -> bool:
+        """Whether a call may go out now, per the shared breaker when enabled (else :meth:`is_available`).
+
+        The shared breaker failing (DB unreachable) falls back to the process's own.
+        """
+        if not settings.TEMPORAL_API_SHARED_BREAKER or not self.is_configured:
+            return self.is_available()
+        try:
+            async with session_factory() as session:
+                breaker = TemporalBreakerCRUD(session)
+                allowed = await breaker.acquire(settings.TEMPORAL_API_TIMEOUT + settings.TEMPORAL_API_CONNECT_TIMEOUT)
+        except Exception:
+            logger.exception("Shared temporal breaker unavailable; using the process breaker")
+            return self.is_available()
+        _observe_shared_breaker(breaker.paused_until)
+        return allowed
+
+    async def _report(self, success: bool) -> None:
+        """Count a call outcome for the process breaker, and the shared one when enabled."""
+        if success:
+            self._record_success()
+        else:
+            self._record_failure()
+        await self._share(success)
+
+    async def _share(self, success: bool) -> None:
+        if not settings.TEMPORAL_API_SHARED_BREAKER:
+            return
+        try:
+            async with session_factory() as session:
+                breaker = TemporalBreakerCRUD(session)
+                pause = await breaker.record(success, self.MAX_CONSECUTIVE_FAILURES, self._pause_seconds)
+        except Exception:
+            logger.exception("Shared temporal breaker unavailable; outcome not shared")
+            return
+        _observe_shared_breaker(breaker.paused_until)
+        if pause is not None:
+            BREAKER_TRIPS.labels(scope="shared").inc()
+            logger.warning("Shared temporal API breaker opened for %.0fs", pause)
+
     def _record_success(self) -> None:
         self._consecutive_failures = 0
         self._open_count = 0
         self._paused_until = None
         self._half_open = False
 
+    def _pause_seconds(self, open_count: int) -> float:
+        """Pause of the ``open_count``-th trip in a row: exponential backoff, capped, with jitter."""
+        pause = min(self.BASE_PAUSE_SECONDS * 2 ** (open_count - 1), self.MAX_PAUSE_SECONDS)
+        return pause * (1 + random.uniform(-self.JITTER_RATIO, self.JITTER_RATIO))  # ruff:ignore[suspicious-non-cryptographic-random-usage] - jitter, not crypto
+
     def _open(self) -> None:
         self._open_count += 1
-        pause = min(self.BASE_PAUSE_SECONDS * 2 ** (self._open_count - 1), self.MAX_PAUSE_SECONDS)
-        pause *= 1 + random.uniform(-self.JITTER_RATIO, self.JITTER_RATIO)  # ruff:ignore[suspicious-non-cryptographic-random-usage] - jitter, not crypto
+        pause = self._pause_seconds(self._open_count)
         self._paused_until = (utcnow() + timedelta(seconds=pause)).timestamp()
         self._half_open = False
+        BREAKER_TRIPS.labels(scope="process").inc()
         logger.warning("Temporal API breaker opened for %.0fs (trip #%d)", pause, self._open_count)
 
     def _record_failure(self) -> None:
@@ -123,32 +251,136 @@ class TemporalModelService:
 
         Sends ``Authorization: Bearer`` when ``TEMPORAL_API_TOKEN`` is set (the temporal API
         guards /predict with a shared token); unset matches a server with auth disabled.
+
+        With ``TEMPORAL_API_BATCH_SIZE`` > 1, the call is coalesced with the concurrent calls
+        of the other validation slots into one :meth:`predict_batch` request.
+        """
+        request = TemporalRequest(bucket, frames, roi_xyxyn)
+        if settings.TEMPORAL_API_BATCH_SIZE > 1:
+            return await self._predict_coalesced(request)
+        data = await self._post("/predict", self._payload(request))
+        await self._report(True)
+        return self._parse_prediction(data)
+
+    async def predict_batch(
+        self, requests: List[TemporalRequest]
+    ) -> List[Union[TemporalPrediction, TemporalUnavailableError]]:
+        """Score several sequences in one ``/predict/batch`` round-trip.
+
+        Returns one outcome per request, in order: a prediction, or the error of that item.
+        Each item counts for the process breaker like a call of its own (an item-level 4xx
+        closes it, any other item error counts as a failure), and the batch once for the
+        shared breaker (a success if any item was answered); a failed round-trip raises
+        :class:`TemporalUnavailableError` for the whole batch and counts once.
         """
+        data = await self._post("/predict/batch", {"items": [self._payload(request) for request in requests]})
+        results = data.get("results") if isinstance(data, dict) else None
+        if not isinstance(results, list) or len(results) != len(requests):
+            await self._report(False)
+            raise TemporalUnavailableError("Malformed /predict/batch response")
+        outcomes: List[Union[TemporalPrediction, TemporalUnavailableError]] = []
+        answered = False
+        for result in results:
+            error = result.get("error") if isinstance(result, dict) else "Malformed batch item"
+            if error is None:
+                self._record_success()
+                answered = True
+                outcomes.append(self._parse_prediction(result))
+                continue
+            status_code = result.get("status") if isinstance(result, dict) else None
+            if isinstance(status_code, int) and status_code < 500:
+                self._record_success()
+                answered = True
+            else:
+                self._record_failure()
+            outcomes.append(TemporalUnavailableError(str(error)))
+        await self._share(answered)
+        return outcomes
+
+    async def _predict_coalesced(self, request: TemporalRequest) -> TemporalPrediction:
+        """Queue the request for the next batch: sent when full or once the batch window elapses."""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        self._batch.append((request, future))
+        if len(self._batch) >= settings.TEMPORAL_API_BATCH_SIZE:
+            self._flush_batch()
+        elif self._batch_timer is None:
+            self._batch_timer = loop.call_later(settings.TEMPORAL_API_BATCH_WINDOW_SECONDS, self._flush_batch)
+        return await future
+
+    def _flush_batch(self) -> None:
+        if self._batch_timer is not None:
+            self._batch_timer.cancel()
+            self._batch_timer = None
+        batch, self._batch = self._batch, []
+        if batch:
+            task = asyncio.create_task(self._send_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _send_batch(self, batch: List[Tuple[TemporalRequest, asyncio.Future]]) -> None:
+        try:
+            outcomes = await self.predict_batch([request for request, _ in batch])
+            for (_, future), outcome in zip(batch, outcomes, strict=True):
+                if future.done():  # caller gone
+                    continue
+                if isinstance(outcome, TemporalUnavailableError):
+                    future.set_exception(outcome)
+                else:
+                    future.set_result(outcome)
+        except asyncio.CancelledError:
+            # Batch cancelled at shutdown: so are its callers
+            for _, future in batch:
+                if not future.done():
+                    future.cancel()
+            raise
+        except Exception as exc:
+            # Never leave a caller waiting, nor hand it a cancellation it would not survive:
+            # an unexpected error fails the calls like an unreachable model
+            if not isinstance(exc, TemporalUnavailableError):
+                logger.exception("Temporal API batch failed")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(TemporalUnavailableError(str(exc)))
+
+    async def _post(self, path: str, payload: dict) -> object:
+        """POST to the temporal API and return the decoded body; failures count for the breaker."""
         host = (settings.TEMPORAL_API_URL or "").rstrip("/")
         headers = {"Authorization": f"Bearer {settings.TEMPORAL_API_TOKEN}"} if settings.TEMPORAL_API_TOKEN else None
-        payload: dict = {"bucket": bucket, "frames": frames}
-        if roi_xyxyn is not None:
-            payload["roi_xyxyn"] = roi_xyxyn
+        started_at = time.perf_counter()
         try:
-            async with httpx.AsyncClient(timeout=settings.TEMPORAL_API_TIMEOUT) as client:
-                response = await client.post(f"{host}/predict", json=payload, headers=headers)
-                response.raise_for_status()
-                data = response.json()
+            response = await self._get_client().post(f"{host}{path}", json=payload, headers=headers)
+            response.raise_for_status()
+            data = response.json()
         except httpx.HTTPStatusError as exc:
             logger.warning("Temporal API call failed: %r", exc)
+            status_class = "4xx" if exc.response.status_code < 500 else "5xx"
+            PREDICT_SECONDS.labels(path, status_class).observe(time.perf_counter() - started_at)
             if exc.response.status_code < 500:
                 # Config/input problem (auth, bad payload), not an outage: the API answered,
                 # so it's reachable — close the breaker, but fail the call so the caller
                 # fails open.
-                self._record_success()
+                await self._report(True)
             else:
-                self._record_failure()
+                await self._report(False)
             raise TemporalUnavailableError(str(exc)) from exc
         except (httpx.HTTPError, ValueError) as exc:
             logger.warning("Temporal API call failed: %r", exc)
-            self._record_failure()
+            PREDICT_SECONDS.labels(path, "error").observe(time.perf_counter() - started_at)
+            await self._report(False)
             raise TemporalUnavailableError(str(exc)) from exc
-        self._record_success()
+        PREDICT_SECONDS.labels(path, "ok").observe(time.perf_counter() - started_at)
+        return data
+
+    @staticmethod
+    def _payload(request: TemporalRequest) -> dict:
+        payload: dict = {"bucket": request.bucket, "frames": request.frames}
+        if request.roi_xyxyn is not None:
+            payload["roi_xyxyn"] = request.roi_xyxyn
+        return payload
+
+    @staticmethod
+    def _parse_prediction(data: object) -> TemporalPrediction:
         probability = data.get("probability") if isinstance(data, dict) else None
         # The response's "version" block ({"api": ..., "model": ...}) carries the serving
         # image tag and the packaged model release; absent on older servers, values null on
@@ -163,3 +395,4 @@ class TemporalModelService:
 
 
 temporal_service = TemporalModelService()
+BREAKER_STATE.labels(scope="process").set_function(temporal_service.breaker_state)
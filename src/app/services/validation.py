@@ -6,11 +6,15 @@
 """DB-coordinated temporal validation worker.
 
 Each detection marks its sequence as due (``sequences.validation_due_at``, one entry per
-sequence); one worker loop per uvicorn process claims due sequences with ``FOR UPDATE SKIP
-LOCKED`` + a lease and runs the risk + temporal pipeline. Postgres is the coordination
-point, so the design holds with any number of uvicorn workers: no duplicate model calls,
-no in-memory queue lost on restart, and a worker dying mid-job just leaves an expired
-lease for a sibling to pick up.
+sequence); each uvicorn process runs ``TEMPORAL_VALIDATION_CONCURRENCY`` worker slots that
+run the risk + temporal pipeline, fed by a dispatcher that leases due sequences in batches
+(``FOR UPDATE SKIP LOCKED`` + a lease, one statement per batch) and sleeps on LISTEN/NOTIFY
+in between. Postgres is the coordination point, so the design holds with any number of
+uvicorn workers: no duplicate model calls, no in-memory queue lost on restart (a process
+only holds the jobs its idle slots start at once), and a worker dying mid-job just leaves
+an expired lease for a sibling to pick up. Claims interleave the organizations (with an
+optional cap on the jobs each one has in flight), so a flooding camera only delays its own
+organization's sequences.
 
 Frames are read at scoring time (not at enqueue time), so a sequence queued behind a
 backlog is scored with its freshest frame set. The job pipeline runs in three phases so
@@ -19,17 +23,27 @@ the (slow) model call never holds a DB session.
 
 import asyncio
 import logging
-from contextlib import asynccontextmanager
-from typing import AsyncIterator, Dict, List, Optional, Set, Tuple, cast
+import time
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime
+from typing import AsyncIterator, Iterator, List, Optional, Tuple, cast
 
 from anyio import to_thread
-from fastapi import HTTPException
+from prometheus_client import Counter, Gauge, Histogram
 from sqlalchemy import text
 
 from app.api.dependencies import dispatch_webhook
 from app.core.config import settings
 from app.core.time import utcnow
-from app.crud import AlertCRUD, CameraCRUD, DetectionCRUD, OrganizationCRUD, SequenceCRUD, WebhookCRUD
+from app.crud import (
+    VALIDATION_DUE_CHANNEL,
+    AlertCRUD,
+    CameraCRUD,
+    DetectionCRUD,
+    OrganizationCRUD,
+    SequenceCRUD,
+    WebhookCRUD,
+)
 from app.db import engine, session_factory
 from app.models import (
     FAIL_OPEN_STALE,
@@ -41,6 +55,7 @@ from app.models import (
     Sequence,
 )
 from app.services.i18n import build_alert_message
+from app.services.prediction_cache import prediction_cache
 from app.services.risk import risk_service
 from app.services.slack import slack_client
 from app.services.storage import s3_service
@@ -50,12 +65,15 @@ from app.services.temporal import TemporalPrediction, TemporalUnavailableError,
 logger = logging.getLogger("uvicorn.error")
 
 __all__ = [
+    "DECLINED",
     "FAIL_OPEN_STALE",
     "FAIL_OPEN_UNAVAILABLE",
     "VALIDATED_BY_MODEL",
     "VALIDATION_FAILED",
     "WINDOW_EXHAUSTED",
+    "drain_notifications",
     "process_next_due_validation",
+    "refresh_queue_metrics",
     "validation_worker_loop",
 ]
 
@@ -66,14 +84,68 @@ RETRY_DELAY_SECONDS = 30.0
 # must not starve the serial worker forever (the staleness fail-open can't bound this, as
 # each retry refreshes the due time).
 MAX_VALIDATION_ATTEMPTS = 5
+# Delay before re-opening a lost LISTEN connection (each reconnection wakes the dispatcher,
+# so what was queued meanwhile is claimed then, not at the next safety poll).
+LISTEN_RETRY_SECONDS = 5.0
 
 # Detached notification tasks (fired after job completion, off the worker's critical path).
 # Strong references so the tasks aren't garbage-collected mid-flight.
 _pending_notifications: set = set()
+# How long a stopping process waits for them (each channel call has its own timeout).
+NOTIFICATION_DRAIN_SECONDS = 10.0
 
 # Advisory-lock namespace (arbitrary app-wide constant) for per-organization alert attachment.
 _ALERT_LOCK_NAMESPACE = 7341
 
+# Per-slot worker metrics, served by the instrumentator's /metrics (or the standalone
+# worker's metrics port)
+SLOT_BUSY = Gauge("validation_slot_busy", "Whether the validation worker slot is running a job", ["slot"])
+SLOT_JOBS = Counter("validation_slot_jobs_total", "Validation jobs run by the worker slot", ["slot", "outcome"])
+SLOT_JOB_SECONDS = Histogram(
+    "validation_slot_job_seconds",
+    "Duration of the validation jobs of the worker slot",
+    ["slot"],
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+)
+# Pipeline metrics: time spent in each phase of a job (read: state and frames, up to the
+# model call; model: the prediction, cache misses only; triangulate: alert attachment;
+# notify: the detached channel calls), the latency from the detection that queued a job
+# to its verdict, by validation_status, and the jobs dead-lettered after repeated errors
+PHASE_SECONDS = Histogram(
+    "validation_phase_seconds",
+    "Duration of the phases of the validation jobs",
+    ["phase"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+VALIDATION_LATENCY_SECONDS = Histogram(
+    "validation_latency_seconds",
+    "Time from the detection that queued a validation job to its verdict",
+    ["validation_status"],
+    buckets=(1, 2.5, 5, 10, 20, 30, 60, 120, 300, 600),
+)
+# Latency label of the jobs the model scored below threshold (they keep no validation_status)
+DECLINED = "declined"
+DEAD_LETTERS = Counter("validation_dead_letters_total", "Validation jobs given up after repeated errors")
+# Per-organization queue metrics, refreshed every QUEUE_METRICS_SECONDS by the worker loop of the
+# processes with TEMPORAL_VALIDATION_QUEUE_METRICS (DB-wide values: export them from one process)
+QUEUE_WAITING = Gauge("validation_queue_waiting", "Due validation jobs waiting for a slot", ["organization_id"])
+QUEUE_IN_FLIGHT = Gauge("validation_queue_in_flight", "Validation jobs under a live lease", ["organization_id"])
+QUEUE_OLDEST_AGE = Gauge(
+    "validation_queue_oldest_age_seconds", "Time the oldest waiting validation job has been due", ["organization_id"]
+)
+QUEUE_METRICS_SECONDS = 15.0
+# Organizations currently reported, so the ones whose queue emptied are dropped
+_queue_metric_orgs: set = set()
+
+
+@contextmanager
+def _timed_phase(phase: str) -> Iterator[None]:
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        PHASE_SECONDS.labels(phase).observe(time.perf_counter() - started_at)
+
 
 @asynccontextmanager
 async def _organization_alert_lock(organization_id: int) -> AsyncIterator[None]:
@@ -96,55 +168,25 @@ async def _organization_alert_lock(organization_id: int) -> AsyncIterator[None]:
 
 
 async def _sequence_frames_and_roi(
-    detections: DetectionCRUD, sequence_id: int, last_n: Optional[int] = None
+    sequences: SequenceCRUD, sequence_id: int, last_n: Optional[int] = None
 ) -> Tuple[int, List[str], Optional[List[float]]]:
     """Distinct frame keys of the sequence (oldest first) and the ROI covering their bboxes.
 
-    Returns ``(total_distinct, frames, roi)``. With ``last_n`` set, ``frames`` is truncated
-    to the most recent ``last_n`` distinct frames (the most informative ones for smoke) and
-    the ROI only covers the kept frames; ``total_distinct`` always reports the full count so
-    the caller can apply the window rules.
+    Returns ``(total_distinct, frames, roi)``. ``frames`` holds the most recent distinct
+    frames the manifest keeps (the most informative ones for smoke), truncated to the last
+    ``last_n`` when set, and the ROI only covers the kept frames; ``total_distinct`` always
+    reports the full count so the caller can apply the window rules.
 
     The ROI is the union envelope of the kept detections' primary bboxes (normalized xyxyn
     corners), scoping the temporal verdict to the tracked region so unrelated activity
-    elsewhere in the frame can't pollute it. ``None`` when no bbox parses (full-frame).
-    """
-    # Imported lazily: the endpoints module imports services at module load.
-    from app.api.api_v1.endpoints.detections import _extract_bbox_strings, _parse_bbox
+    elsewhere in the frame can't pollute it. ``None`` when no kept detection has a bbox (full-frame).
 
-    dets = await detections.fetch_all(
-        filters=("sequence_id", sequence_id),
-        order_by="created_at",
-        order_desc=False,
-    )
-    frames: List[str] = []
-    seen: Set[str] = set()
-    corners_by_frame: Dict[str, List[Tuple[float, float, float, float]]] = {}
-    for det in dets:
-        if det.bucket_key not in seen:
-            seen.add(det.bucket_key)
-            frames.append(det.bucket_key)
-        bbox_strs = _extract_bbox_strings(det.bbox)
-        if bbox_strs:
-            try:
-                xmin, ymin, xmax, ymax, _ = _parse_bbox(bbox_strs[0])
-                corners_by_frame.setdefault(det.bucket_key, []).append((xmin, ymin, xmax, ymax))
-            except HTTPException:
-                logger.debug("Skipping unparseable bbox on detection %s", det.id)
-    total = len(frames)
-    kept = frames if last_n is None or total <= last_n else frames[-last_n:]
-    corners = [c for frame in kept for c in corners_by_frame.get(frame, [])]
-    if not corners:
-        return total, kept, None
-    roi = [
-        max(0.0, min(c[0] for c in corners)),
-        max(0.0, min(c[1] for c in corners)),
-        min(1.0, max(c[2] for c in corners)),
-        min(1.0, max(c[3] for c in corners)),
-    ]
-    if not (roi[0] < roi[2] and roi[1] < roi[3]):
-        return total, kept, None
-    return total, kept, roi
+    Read from the sequence's frame manifest, maintained at ingest: no detection is read,
+    however long the sequence (except to build the manifest of a sequence that has none).
+    """
+    manifest = await sequences.get_frame_manifest(sequence_id, keep_last=temporal_service.MAX_FRAMES)
+    kept = manifest.keys if last_n is None else manifest.keys[-last_n:]
+    return manifest.frame_count, kept, manifest.roi(last_n)
 
 
 async def _notify_for_sequence(sequence_id: int, organization_id: int, alert_id: Optional[int]) -> None:
@@ -158,45 +200,50 @@ async def _notify_for_sequence(sequence_id: int, organization_id: int, alert_id:
     is the alert row created by triangulation. Each channel is independent: one failing
     never blocks the others. Owns its session so it can outlive the worker's.
     """
-    try:
-        async with session_factory() as session:
-            sequences = SequenceCRUD(session)
-            detections = DetectionCRUD(session)
-            sequence_ = await sequences.get(sequence_id)
-            if sequence_ is None:
-                return
-            camera = await CameraCRUD(session).get(sequence_.camera_id)
-            # Latest real detection: continuity rows (empty bbox) must never reach a channel.
-            det = await detections.get_latest_with_bbox(sequence_id)
-            if camera is None or det is None:
-                return
-            org = await OrganizationCRUD(session).get(organization_id)
-
-            for webhook in await WebhookCRUD(session).fetch_all():
-                try:
-                    await dispatch_webhook(webhook.url, det)
-                except Exception as exc:  # ruff:ignore[blind-except] - best-effort: never let a webhook failure block the rest
-                    logger.warning("Webhook dispatch to %s failed for sequence %s (%s)", webhook.url, sequence_id, exc)
-
-            base_url = settings.PLATFORM_URL.rstrip("/")
-            platform_url = f"{base_url}/alert/{alert_id}" if alert_id is not None else f"{base_url}/"
-            message = build_alert_message(
-                camera.lat, camera.lon, det.created_at, camera.name, sequence_.sequence_azimuth, platform_url
-            )
-
-            if telegram_client.is_enabled and org is not None and org.telegram_id:
-                try:
-                    await to_thread.run_sync(telegram_client.notify, org.telegram_id, message.as_text())
-                except Exception as exc:  # ruff:ignore[blind-except] - best-effort: never let a Telegram failure block the rest
-                    logger.warning("Telegram notification failed for sequence %s (%s)", sequence_id, exc)
-
-            if slack_client.is_enabled and org is not None and org.slack_hook:
-                try:
-                    await to_thread.run_sync(slack_client.notify, org.slack_hook, message.title, message.as_mrkdwn())
-                except Exception as exc:  # ruff:ignore[blind-except] - best-effort: never let a Slack failure block the rest
-                    logger.warning("Slack notification failed for sequence %s (%s)", sequence_id, exc)
-    except Exception:
-        logger.exception("Notification dispatch failed for sequence %s", sequence_id)
+    with _timed_phase("notify"):
+        try:
+            async with session_factory() as session:
+                sequences = SequenceCRUD(session)
+                detections = DetectionCRUD(session)
+                sequence_ = await sequences.get(sequence_id)
+                if sequence_ is None:
+                    return
+                camera = await CameraCRUD(session).get(sequence_.camera_id)
+                # Latest real detection: continuity rows (empty bbox) must never reach a channel.
+                det = await detections.get_latest_with_bbox(sequence_id)
+                if camera is None or det is None:
+                    return
+                org = await OrganizationCRUD(session).get(organization_id)
+
+                for webhook in await WebhookCRUD(session).fetch_all():
+                    try:
+                        await dispatch_webhook(webhook.url, det)
+                    except Exception as exc:  # ruff:ignore[blind-except] - best-effort: never let a webhook failure block the rest
+                        logger.warning(
+                            "Webhook dispatch to %s failed for sequence %s (%s)", webhook.url, sequence_id, exc
+                        )
+
+                base_url = settings.PLATFORM_URL.rstrip("/")
+                platform_url = f"{base_url}/alert/{alert_id}" if alert_id is not None else f"{base_url}/"
+                message = build_alert_message(
+                    camera.lat, camera.lon, det.created_at, camera.name, sequence_.sequence_azimuth, platform_url
+                )
+
+                if telegram_client.is_enabled and org is not None and org.telegram_id:
+                    try:
+                        await to_thread.run_sync(telegram_client.notify, org.telegram_id, message.as_text())
+                    except Exception as exc:  # ruff:ignore[blind-except] - best-effort: never let a Telegram failure block the rest
+                        logger.warning("Telegram notification failed for sequence %s (%s)", sequence_id, exc)
+
+                if slack_client.is_enabled and org is not None and org.slack_hook:
+                    try:
+                        await to_thread.run_sync(
+                            slack_client.notify, org.slack_hook, message.title, message.as_mrkdwn()
+                        )
+                    except Exception as exc:  # ruff:ignore[blind-except] - best-effort: never let a Slack failure block the rest
+                        logger.warning("Slack notification failed for sequence %s (%s)", sequence_id, exc)
+        except Exception:
+            logger.exception("Notification dispatch failed for sequence %s", sequence_id)
 
 
 def _dispatch_notifications(sequence_id: int, organization_id: int, alert_id: Optional[int]) -> None:
@@ -206,6 +253,24 @@ def _dispatch_notifications(sequence_id: int, organization_id: int, alert_id: Op
     task.add_done_callback(_pending_notifications.discard)
 
 
+async def drain_notifications() -> None:
+    """Wait (up to NOTIFICATION_DRAIN_SECONDS) for the detached notifications still in flight, at shutdown."""
+    pending = list(_pending_notifications)
+    if not pending:
+        return
+    _, undelivered = await asyncio.wait(pending, timeout=NOTIFICATION_DRAIN_SECONDS)
+    if undelivered:
+        logger.warning("Dropping %d undelivered sequence notification(s) at shutdown", len(undelivered))
+        for task in undelivered:
+            task.cancel()
+
+
+def _observe_latency(queued_since: Optional[datetime], verdict: str) -> None:
+    """Time from the detection that queued the job to its verdict, retries and deferrals included."""
+    if queued_since is not None:
+        VALIDATION_LATENCY_SECONDS.labels(verdict).observe(max(0.0, (utcnow() - queued_since).total_seconds()))
+
+
 async def _finish_job(
     sequence_id: int, frame_count: Optional[int] = None, validation_status: Optional[str] = None
 ) -> None:
@@ -219,14 +284,15 @@ async def _process_claimed_sequence(sequence_id: int) -> None:
     Takes only the id on purpose: ALL state is read fresh from the DB (a detection can bump
     max_conf while the job sits in the queue, and a prior run may have persisted a score or
     the validated flag before dying — a claim-time snapshot would be stale). Three phases so
-    the (possibly slow) model call never holds a DB session: read state and apply the risk
-    gate, call the model, then persist + triangulate + notify.
+    the (possibly slow) model call never holds a DB session: read state (the sequence row
+    alone, frame manifest included) and apply the risk gate, call the model, then persist +
+    triangulate + notify.
     """
     # Phase 1 — read state and apply the risk gate (short-lived session).
+    read_started_at = time.perf_counter()
     async with session_factory() as session:
         sequences = SequenceCRUD(session)
         cameras = CameraCRUD(session)
-        detections = DetectionCRUD(session)
         sequence_ = await sequences.get(sequence_id)
         if sequence_ is None:
             await _finish_job(sequence_id)
@@ -236,14 +302,14 @@ async def _process_claimed_sequence(sequence_id: int) -> None:
             # post-claim work (the due marker only clears on completion): resume it.
             await _complete_validated_sequence(sequence_id, validation_status=None, claim=False)
             return
-        due_since = sequence_.validation_due_at
+        queued_since = sequence_.validation_queued_at
         camera = await cameras.get(sequence_.camera_id)
         if camera is None:
             await _finish_job(sequence_id)
             return
         organization_id = camera.organization_id
         total_frames, frames, roi_xyxyn = await _sequence_frames_and_roi(
-            detections, sequence_id, last_n=temporal_service.MAX_FRAMES
+            sequences, sequence_id, last_n=temporal_service.MAX_FRAMES
         )
         # Risk pre-gate: in low fire-risk weather, low-confidence sequences are filtered out.
         # The finish is conditional on the frame count (read BEFORE the gate) so a detection
@@ -253,6 +319,12 @@ async def _process_claimed_sequence(sequence_id: int) -> None:
         if threshold is not None and (sequence_.max_conf is None or sequence_.max_conf < threshold):
             await _finish_job(sequence_id, frame_count=total_frames)
             return
+        # The model reads the frames from the bucket: a frame still in the write-behind spool of
+        # the host that received it (flagged on its detections until uploaded) can't be scored yet.
+        frames_spooled = total_frames >= temporal_service.MIN_FRAMES and (
+            await DetectionCRUD(session).has_spooled_frames(frames)
+        )
+    PHASE_SECONDS.labels("read").observe(time.perf_counter() - read_started_at)
 
     prediction: Optional[TemporalPrediction] = None
     validation_status: Optional[str] = None
@@ -269,56 +341,76 @@ async def _process_claimed_sequence(sequence_id: int) -> None:
         if prior_score > settings.TEMPORAL_MODEL_THRESHOLD:
             await _complete_validated_sequence(sequence_id, VALIDATED_BY_MODEL, claim=True)
             return
+        _observe_latency(queued_since, WINDOW_EXHAUSTED)
         await _finish_job(sequence_id, validation_status=WINDOW_EXHAUSTED)
         return
 
-    if not temporal_service.is_available():
-        # Not configured, unreachable, or breaker open: trust the risk gate already passed.
-        validated = True
-        validation_status = FAIL_OPEN_UNAVAILABLE
-    elif total_frames < temporal_service.MIN_FRAMES:
-        # Too few frames for the model to score; the next detection re-enqueues. By design a
-        # sequence that never reaches MIN_FRAMES is not validated while the model is reachable
-        # (short/noise sequences are suppressed); only the unavailable fail-open above lets
-        # them through. Checked BEFORE staleness on purpose: a short sequence isn't waiting
-        # on the model — if its job went stale at <MIN_FRAMES, the sequence stopped emitting,
-        # and failing it open would notify on noise.
-        await _finish_job(sequence_id, frame_count=total_frames)
+    # The same frame set may have been scored already (resumed or retried job): reuse the
+    # score without going through the breaker gate, the staleness bound nor the model.
+    bucket = s3_service.resolve_bucket_name(organization_id)
+    prediction = prediction_cache.get(bucket, frames, roi_xyxyn)
+    stale = (
+        queued_since is not None and (utcnow() - queued_since).total_seconds() > settings.TEMPORAL_VALIDATION_MAX_AGE
+    )
+    if prediction is None and frames_spooled and not stale:
+        # Wait for the upload before taking a model slot (a half-open breaker lends a single
+        # probe, which a deferred job would waste). Not past the staleness bound though: a
+        # frame whose upload never lands (spool lost with its host, upload failing every
+        # time) must not hold the job back forever, it fails open as stale instead.
+        async with session_factory() as session:
+            await SequenceCRUD(session).defer_validation(sequence_id, settings.S3_SPOOL_RETRY_SECONDS)
         return
-    elif due_since is not None and (utcnow() - due_since).total_seconds() > settings.TEMPORAL_VALIDATION_MAX_AGE:
-        # Queued past the useful scoring window (sustained backlog): bound the latency by
-        # failing open EXPLICITLY rather than scoring too late to matter. Traced in
-        # validation_status so overload-induced fail-opens are observable.
-        validated = True
-        validation_status = FAIL_OPEN_STALE
-        logger.warning(
-            "Sequence %s queued for >%ss; failing open on the risk gate alone",
-            sequence_id,
-            settings.TEMPORAL_VALIDATION_MAX_AGE,
-        )
-    else:
-        if total_frames > temporal_service.MAX_FRAMES:
+
+    if prediction is None:
+        if not await temporal_service.acquire():
+            # Not configured, unreachable, or breaker open: trust the risk gate already passed.
+            validated = True
+            validation_status = FAIL_OPEN_UNAVAILABLE
+        elif total_frames < temporal_service.MIN_FRAMES:
+            # Too few frames for the model to score; the next detection re-enqueues. By design a
+            # sequence that never reaches MIN_FRAMES is not validated while the model is reachable
+            # (short/noise sequences are suppressed); only the unavailable fail-open above lets
+            # them through. Checked BEFORE staleness on purpose: a short sequence isn't waiting
+            # on the model — if its job went stale at <MIN_FRAMES, the sequence stopped emitting,
+            # and failing it open would notify on noise.
+            await _finish_job(sequence_id, frame_count=total_frames)
+            return
+        elif stale:
+            # Queued past the useful scoring window (sustained backlog): bound the latency by
+            # failing open EXPLICITLY rather than scoring too late to matter. Traced in
+            # validation_status so overload-induced fail-opens are observable.
+            validated = True
+            validation_status = FAIL_OPEN_STALE
             logger.warning(
-                "Sequence %s exceeded %d frames before first scoring; scoring the last %d",
+                "Sequence %s queued for >%ss; failing open on the risk gate alone",
                 sequence_id,
-                temporal_service.MAX_FRAMES,
-                temporal_service.MAX_FRAMES,
+                settings.TEMPORAL_VALIDATION_MAX_AGE,
             )
-        # Phase 2 — model call, with NO DB session held.
-        bucket = s3_service.resolve_bucket_name(organization_id)
-        try:
-            prediction = await temporal_service.predict(bucket, frames, roi_xyxyn=roi_xyxyn)
-        except TemporalUnavailableError:
-            validated = True
-            validation_status = FAIL_OPEN_UNAVAILABLE
         else:
-            if prediction.probability is None:
-                # Successful but scoreless response (uncalibrated model): cannot confirm,
-                # retry on the next frame set.
-                await _finish_job(sequence_id, frame_count=total_frames)
-                return
-            validated = prediction.probability > settings.TEMPORAL_MODEL_THRESHOLD
-            validation_status = VALIDATED_BY_MODEL if validated else None
+            if total_frames > temporal_service.MAX_FRAMES:
+                logger.warning(
+                    "Sequence %s exceeded %d frames before first scoring; scoring the last %d",
+                    sequence_id,
+                    temporal_service.MAX_FRAMES,
+                    temporal_service.MAX_FRAMES,
+                )
+            # Phase 2 — model call, with NO DB session held.
+            try:
+                with _timed_phase("model"):
+                    prediction = await temporal_service.predict(bucket, frames, roi_xyxyn=roi_xyxyn)
+            except TemporalUnavailableError:
+                validated = True
+                validation_status = FAIL_OPEN_UNAVAILABLE
+            else:
+                prediction_cache.put(bucket, frames, roi_xyxyn, prediction)
+    if prediction is not None:
+        if prediction.probability is None:
+            # Successful but scoreless response (uncalibrated model): cannot confirm,
+            # retry on the next frame set.
+            await _finish_job(sequence_id, frame_count=total_frames)
+            return
+        validated = prediction.probability > settings.TEMPORAL_MODEL_THRESHOLD
+        validation_status = VALIDATED_BY_MODEL if validated else None
 
     # Phase 3 — persist the score (with its version provenance) and, once validated,
     # claim + triangulate + notify.
@@ -335,10 +427,12 @@ async def _process_claimed_sequence(sequence_id: int) -> None:
             # The model just had its LAST chance (first scoring past the window, on the
             # last MAX_FRAMES) and declined: terminal right away, consistent with the
             # stored-score-below-threshold rule above.
+            _observe_latency(queued_since, WINDOW_EXHAUSTED)
             await _finish_job(sequence_id, validation_status=WINDOW_EXHAUSTED)
             return
         # Below threshold in-window: keep the score, retry when the frame set grows (the
         # conditional finish keeps the job due if frames arrived during scoring).
+        _observe_latency(queued_since, DECLINED)
         await _finish_job(sequence_id, frame_count=total_frames)
         return
     await _complete_validated_sequence(sequence_id, validation_status, claim=True)
@@ -371,12 +465,15 @@ async def _complete_validated_sequence(sequence_id: int, validation_status: Opti
         cameras = CameraCRUD(session)
         alerts = AlertCRUD(session)
         sequence_ = cast(Sequence, await sequences.get(sequence_id, strict=True))
+        if claim:
+            _observe_latency(sequence_.validation_queued_at, cast(str, validation_status))
         camera = cast(Camera, await cameras.get(sequence_.camera_id, strict=True))
         organization_id = camera.organization_id
         # Two workers validating two sequences of the same event concurrently must not
         # both create an alert: serialize attachment per organization.
-        async with _organization_alert_lock(organization_id):
-            alert_id = await _attach_sequence_to_alert(sequence_, camera, cameras, sequences, alerts)
+        with _timed_phase("triangulate"):
+            async with _organization_alert_lock(organization_id):
+                alert_id = await _attach_sequence_to_alert(sequence_, camera, cameras, sequences, alerts)
         # Validated is terminal: complete the job (the due marker is the completion record
         # that makes this block resumable), THEN notify off the critical path — a slow
         # channel must never delay the next sequence's scoring.
@@ -384,42 +481,231 @@ async def _complete_validated_sequence(sequence_id: int, validation_status: Opti
     _dispatch_notifications(sequence_id, organization_id, alert_id)
 
 
-async def process_next_due_validation() -> bool:
-    """Claim and process one due sequence. Returns True when a job was claimed.
+async def _release_job(sequence_id: int) -> None:
+    async with session_factory() as session:
+        await SequenceCRUD(session).defer_validation(sequence_id, 0)
+
+
+async def _claim_due_jobs(limit: int) -> List[int]:
+    async with session_factory() as session:
+        claimed = await SequenceCRUD(session).claim_due_validations(
+            limit, settings.TEMPORAL_VALIDATION_LEASE_SECONDS, settings.TEMPORAL_VALIDATION_MAX_IN_FLIGHT_PER_ORG
+        )
+    return [cast(int, sequence_.id) for sequence_ in claimed]
+
+
+async def _run_job(sequence_id: int, slot: int) -> None:
+    """Process one claimed sequence on a worker slot.
 
     An error releases the lease and backs the retry off; after MAX_VALIDATION_ATTEMPTS
     consecutive errors the job dead-letters (validation_status='failed') so a poison job
-    can't starve the serial worker.
+    can't hold a worker slot forever. A job cancelled at shutdown releases its lease, so a
+    sibling process picks it up at once rather than when the lease expires.
     """
-    async with session_factory() as session:
-        sequence_ = await SequenceCRUD(session).claim_due_validation(settings.TEMPORAL_VALIDATION_LEASE_SECONDS)
-    if sequence_ is None:
-        return False
-    sequence_id = sequence_.id
+    label = str(slot)
+    SLOT_BUSY.labels(label).set(1)
+    started_at = time.perf_counter()
+    outcome = "done"
     try:
         await _process_claimed_sequence(sequence_id)
+    except asyncio.CancelledError:
+        outcome = "cancelled"
+        await asyncio.shield(_release_job(sequence_id))
+        raise
     except Exception:
+        outcome = "error"
         logger.exception("Sequence validation failed for sequence %s", sequence_id)
         async with session_factory() as session:
-            await SequenceCRUD(session).fail_or_retry_validation(
+            if await SequenceCRUD(session).fail_or_retry_validation(
                 sequence_id, max_attempts=MAX_VALIDATION_ATTEMPTS, retry_in_seconds=RETRY_DELAY_SECONDS
-            )
+            ):
+                DEAD_LETTERS.inc()
+    finally:
+        SLOT_BUSY.labels(label).set(0)
+        SLOT_JOBS.labels(label, outcome).inc()
+        SLOT_JOB_SECONDS.labels(label).observe(time.perf_counter() - started_at)
+
+
+async def process_next_due_validation(slot: int = 0) -> bool:
+    """Claim and process one due sequence. Returns True when a job was claimed."""
+    claimed = await _claim_due_jobs(1)
+    if not claimed:
+        return False
+    await _run_job(claimed[0], slot)
     return True
 
 
-async def validation_worker_loop() -> None:
-    """Per-process validation worker: drains due sequences, then idles on a short poll.
+async def _validation_slot(
+    slot: int,
+    jobs: "asyncio.Queue[int]",
+    idle_slots: asyncio.Semaphore,
+    job_done: asyncio.Event,
+) -> None:
+    """One worker slot: runs the jobs handed over by the dispatcher, one at a time.
 
-    Supervised by construction — every iteration is wrapped, so no exception can silently
-    kill the loop (only cancellation at shutdown stops it).
+    Supervised by construction — every job is wrapped, so no exception can silently kill
+    the slot (only cancellation at shutdown stops it).
     """
-    logger.info("Temporal validation worker started")
     while True:
+        sequence_id = await jobs.get()
         try:
-            if not await process_next_due_validation():
-                await asyncio.sleep(settings.TEMPORAL_VALIDATION_POLL_SECONDS)
+            await _run_job(sequence_id, slot)
         except asyncio.CancelledError:
             raise
         except Exception:
-            logger.exception("Validation worker iteration failed; continuing")
-            await asyncio.sleep(settings.TEMPORAL_VALIDATION_POLL_SECONDS)
+            logger.exception("Validation worker slot %d iteration failed; continuing", slot)
+        finally:
+            idle_slots.release()
+            job_done.set()
+
+
+async def _reserve_idle_slots(idle_slots: asyncio.Semaphore) -> int:
+    """Wait for an idle slot, then reserve every other idle one too. Returns the count."""
+    await idle_slots.acquire()
+    reserved = 1
+    while not idle_slots.locked():
+        await idle_slots.acquire()
+        reserved += 1
+    return reserved
+
+
+async def _listen_for_due_validations(wakeup: asyncio.Event) -> None:
+    """Hold a LISTEN connection on the validation channel, setting ``wakeup`` on every NOTIFY.
+
+    NOTIFYs sent while nobody listens are lost, so every (re)connection sets ``wakeup`` too.
+    """
+    closed = asyncio.Event()
+
+    def on_notify(*_args: object) -> None:
+        wakeup.set()
+
+    def on_close(*_args: object) -> None:
+        closed.set()
+
+    while True:
+        try:
+            async with engine.connect() as conn:
+                driver = (await conn.get_raw_connection()).driver_connection
+                closed.clear()
+                driver.add_termination_listener(on_close)
+                await driver.add_listener(VALIDATION_DUE_CHANNEL, on_notify)
+                wakeup.set()
+                try:
+                    await closed.wait()
+                finally:
+                    # The connection goes back to the pool: leave it as it was
+                    driver.remove_termination_listener(on_close)
+                    if not driver.is_closed():
+                        await driver.remove_listener(VALIDATION_DUE_CHANNEL, on_notify)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Validation LISTEN connection failed; retrying")
+        await asyncio.sleep(LISTEN_RETRY_SECONDS)
+
+
+async def refresh_queue_metrics() -> None:
+    """Update the per-organization queue gauges from the DB."""
+    async with session_factory() as session:
+        stats = await SequenceCRUD(session).validation_queue_stats()
+    now = utcnow()
+    reported = set()
+    for organization_id, waiting, in_flight, oldest_due_at in stats:
+        label = str(organization_id)
+        reported.add(label)
+        QUEUE_WAITING.labels(label).set(waiting)
+        QUEUE_IN_FLIGHT.labels(label).set(in_flight)
+        QUEUE_OLDEST_AGE.labels(label).set(
+            0.0 if oldest_due_at is None else max(0.0, (now - oldest_due_at).total_seconds())
+        )
+    for label in _queue_metric_orgs - reported:
+        for gauge in (QUEUE_WAITING, QUEUE_IN_FLIGHT, QUEUE_OLDEST_AGE):
+            gauge.remove(label)
+    _queue_metric_orgs.clear()
+    _queue_metric_orgs.update(reported)
+
+
+async def _queue_metrics_loop() -> None:
+    while True:
+        try:
+            await refresh_queue_metrics()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Refreshing the validation queue metrics failed; continuing")
+        await asyncio.sleep(QUEUE_METRICS_SECONDS)
+
+
+async def _wait_for_due(wakeup: asyncio.Event, job_done: asyncio.Event) -> None:
+    """Idle until a job can be claimed, or the safety poll interval elapses.
+
+    A sequence becoming due sends a NOTIFY (``wakeup``), but a queued job becoming claimable
+    (retry backoff or deferral over, lease expired) sends none: sleep until the earliest of
+    those instead. Jobs the last claim left behind (in-flight cap) are claimable once one
+    of this process's jobs ends (``job_done``, cleared before the claim).
+    """
+    timeout = settings.TEMPORAL_VALIDATION_POLL_SECONDS
+    held_back = False
+    try:
+        async with session_factory() as session:
+            next_at, held_back = await SequenceCRUD(session).next_validation_claim()
+    except Exception:
+        logger.exception("Reading the next validation claim time failed; polling")
+    else:
+        if next_at is not None:
+            timeout = min(timeout, max(0.0, (next_at - utcnow()).total_seconds()))
+    waiters = [asyncio.create_task(event.wait()) for event in ((wakeup, job_done) if held_back else (wakeup,))]
+    try:
+        await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for waiter in waiters:
+            waiter.cancel()
+    wakeup.clear()
+
+
+async def validation_worker_loop(slots: Optional[int] = None) -> None:
+    """Validation worker: ``slots`` slots (default TEMPORAL_VALIDATION_CONCURRENCY), each running one job at a time.
+
+    A dispatcher leases due sequences in batches of as many jobs as there are idle slots
+    (one statement for the whole batch) and hands them over through a local queue. Once the
+    queue is drained it sleeps until a NOTIFY from ``enqueue_validation`` wakes it or a
+    queued job becomes claimable, with TEMPORAL_VALIDATION_POLL_SECONDS as a safety poll. Never
+    claiming more than the idle slots keeps every leased job running right away, so no lease
+    ticks down while its job waits in the process. Cancelling the loop cancels every slot;
+    in-flight jobs release their leases on the way out, as do the ones not started yet.
+    """
+    slots = max(1, settings.TEMPORAL_VALIDATION_CONCURRENCY if slots is None else slots)
+    logger.info("Temporal validation worker started with %d slot(s)", slots)
+    jobs: "asyncio.Queue[int]" = asyncio.Queue()
+    idle_slots = asyncio.Semaphore(slots)
+    job_done = asyncio.Event()
+    slot_tasks = [asyncio.create_task(_validation_slot(slot, jobs, idle_slots, job_done)) for slot in range(slots)]
+    wakeup = asyncio.Event()
+    listener = asyncio.create_task(_listen_for_due_validations(wakeup))
+    helpers = [listener]
+    if settings.PROMETHEUS_ENABLED and settings.TEMPORAL_VALIDATION_QUEUE_METRICS:
+        helpers.append(asyncio.create_task(_queue_metrics_loop()))
+    try:
+        while True:
+            reserved = await _reserve_idle_slots(idle_slots)
+            job_done.clear()
+            try:
+                claimed = await _claim_due_jobs(reserved)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Claiming due validation jobs failed; continuing")
+                claimed = []
+            for sequence_id in claimed:
+                jobs.put_nowait(sequence_id)
+            for _ in range(reserved - len(claimed)):
+                idle_slots.release()
+            if len(claimed) < reserved:
+                # The queue is drained (or unreachable): idle until woken up
+                await _wait_for_due(wakeup, job_done)
+    finally:
+        for task in (*helpers, *slot_tasks):
+            task.cancel()
+        await asyncio.gather(*helpers, *slot_tasks, return_exceptions=True)
+        while not jobs.empty():
+            await asyncio.shield(_release_job(jobs.get_nowait()))
@@ -0,0 +1,106 @@
+# Copyright (C) 2026, Pyronear.
+
+# This program is licensed under the Apache License 2.0.
+# See LICENSE or go to <https://www.apache.org/licenses/LICENSE-2.0> for full license details.
+
+"""Standalone validation worker: ``python -m app.worker [--concurrency N]``.
+
+Runs the temporal validation loop and its notifications outside of the API, so validation
+capacity scales with worker replicas instead of uvicorn processes. Jobs are coordinated
+through the DB like the embedded workers: any mix of API-embedded and standalone workers
+is safe. Set TEMPORAL_VALIDATION_EMBEDDED=false on the API to leave validation to these.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import logging
+import signal
+from typing import List, Optional, Sequence, cast
+
+import sentry_sdk
+from prometheus_client import start_http_server
+
+from app.core.config import settings
+from app.db import engine
+from app.services.risk import risk_refresh_loop, risk_service
+from app.services.temporal import temporal_service
+from app.services.validation import drain_notifications, validation_worker_loop
+
+logger = logging.getLogger("uvicorn.error")
+
+__all__ = ["main", "run_worker"]
+
+
+async def run_worker(concurrency: Optional[int] = None) -> None:
+    """Run the validation worker until cancelled, then release its jobs and connections.
+
+    The risk cache is loaded and refreshed here too: the validation gate reads it.
+    """
+    tasks: List[asyncio.Task] = []
+    if risk_service.is_configured:
+        await risk_service.refresh()
+        tasks.append(asyncio.create_task(risk_refresh_loop()))
+    else:
+        logger.info("Risk API not configured; skipping daily refresh")
+    if temporal_service.is_configured:
+        temporal_service.open()
+    tasks.append(asyncio.create_task(validation_worker_loop(concurrency)))
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        # After the worker: in-flight calls were cancelled with it
+        await drain_notifications()
+        await temporal_service.close()
+        await engine.dispose()
+
+
+async def _serve(concurrency: Optional[int]) -> None:
+    # SIGTERM (container stop) shuts down like Ctrl+C: leases released, notifications flushed
+    main_task = cast(asyncio.Task, asyncio.current_task())
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, main_task.cancel)
+    with contextlib.suppress(asyncio.CancelledError):
+        await run_worker(concurrency)
+    logger.info("Temporal validation worker stopped")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Pyronear temporal validation worker")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="validation jobs run at once (default: TEMPORAL_VALIDATION_CONCURRENCY)",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=9090,
+        help="port serving the Prometheus metrics when PROMETHEUS_ENABLED (default: 9090)",
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s:     %(message)s")
+    if isinstance(settings.SENTRY_DSN, str):
+        sentry_sdk.init(
+            settings.SENTRY_DSN,
+            enable_tracing=False,
+            traces_sample_rate=0.0,
+            release=settings.VERSION,
+            server_name=settings.SERVER_NAME,
+            debug=settings.DEBUG,
+            environment=None if settings.DEBUG else "production",
+        )
+    if settings.PROMETHEUS_ENABLED:
+        start_http_server(args.metrics_port)
+        logger.info("Serving the worker metrics on port %d", args.metrics_port)
+    asyncio.run(_serve(args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
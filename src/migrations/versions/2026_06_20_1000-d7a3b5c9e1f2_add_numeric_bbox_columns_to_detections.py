@@ -0,0 +1,82 @@
+"""add numeric bbox columns to detections and backfill from the bbox strings
+
+Revision ID: d7a3b5c9e1f2
+Revises: c4e9f1a2b3d5
+Create Date: 2026-06-20 10:00:00.000000
+
+"""
+
+import logging
+import re
+from typing import List, Sequence, Tuple, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "d7a3b5c9e1f2"
+down_revision: Union[str, None] = "c4e9f1a2b3d5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+_BATCH_SIZE = 5000
+_FLOAT = r"\s*(-?\d+(?:\.\d+)?|-?\.\d+)\s*"
+_BOX_RE = re.compile(rf"\({_FLOAT},{_FLOAT},{_FLOAT},{_FLOAT},{_FLOAT}\)")
+_BBOX_COLUMNS = ("bbox_xmin", "bbox_ymin", "bbox_xmax", "bbox_ymax", "bbox_conf")
+
+
+def _decode(raw: Union[str, None]) -> List[Tuple[float, ...]]:
+    if not raw:
+        return []
+    return [tuple(float(group) for group in match.groups()) for match in _BOX_RE.finditer(raw)]
+
+
+def upgrade() -> None:
+    for column in _BBOX_COLUMNS:
+        op.add_column("detections", sa.Column(column, sa.Float(), nullable=True))
+    op.add_column("detections", sa.Column("others_coords", postgresql.ARRAY(sa.Float()), nullable=True))
+
+    bind = op.get_bind()
+    update = sa.text(
+        "UPDATE detections SET bbox_xmin = :xmin, bbox_ymin = :ymin, bbox_xmax = :xmax, bbox_ymax = :ymax, "
+        "bbox_conf = :conf, others_coords = :others WHERE id = :id"
+    ).bindparams(sa.bindparam("others", type_=postgresql.ARRAY(sa.Float())))
+    # Keyset batches on id: bounded memory and short statements on large tables.
+    last_id, total = 0, 0
+    while True:
+        rows = bind.execute(
+            sa.text("SELECT id, bbox, others_bboxes FROM detections WHERE id > :last_id ORDER BY id LIMIT :limit"),
+            {"last_id": last_id, "limit": _BATCH_SIZE},
+        ).fetchall()
+        if not rows:
+            break
+        params = []
+        for det_id, bbox, others_bboxes in rows:
+            primary = _decode(bbox)
+            others = [coord for box in _decode(others_bboxes) for coord in box]
+            if not primary and not others:
+                continue
+            xmin, ymin, xmax, ymax, conf = primary[0] if primary else (None,) * 5
+            params.append({
+                "id": det_id,
+                "xmin": xmin,
+                "ymin": ymin,
+                "xmax": xmax,
+                "ymax": ymax,
+                "conf": conf,
+                "others": others or None,
+            })
+        if params:
+            bind.execute(update, params)
+        total += len(params)
+        last_id = rows[-1][0]
+    logger.info("Backfilled numeric bbox columns for %d detection(s)", total)
+
+
+def downgrade() -> None:
+    op.drop_column("detections", "others_coords")
+    for column in reversed(_BBOX_COLUMNS):
+        op.drop_column("detections", column)
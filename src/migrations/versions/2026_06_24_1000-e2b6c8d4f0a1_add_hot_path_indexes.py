@@ -0,0 +1,61 @@
+"""add indexes on the hot query paths of detections, sequences and alerts
+
+Revision ID: e2b6c8d4f0a1
+Revises: d7a3b5c9e1f2
+Create Date: 2026-06-24 10:00:00.000000
+
+"""
+
+from typing import Dict, List, Sequence, Tuple, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e2b6c8d4f0a1"
+down_revision: Union[str, None] = "d7a3b5c9e1f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns, extra kwargs) — mirrored by the __table_args__ of app.models
+_INDEXES: List[Tuple[str, str, List[str], Dict[str, sa.TextClause]]] = [
+    # Frames of a sequence, oldest/latest first (validation worker, sequence detections route)
+    ("ix_detections_sequence_id_created_at", "detections", ["sequence_id", "created_at"], {}),
+    # Latest detection of a sequence with a real bbox: continuity rows have no bbox_conf
+    (
+        "ix_detections_sequence_id_created_at_with_bbox",
+        "detections",
+        ["sequence_id", "created_at"],
+        {"postgresql_where": sa.text("bbox_conf IS NOT NULL")},
+    ),
+    # Unassigned recent detections of a pose (sequence seeding at ingest)
+    (
+        "ix_detections_camera_id_pose_id_sequence_id_created_at",
+        "detections",
+        ["camera_id", "pose_id", "sequence_id", "created_at"],
+        {},
+    ),
+    # Siblings sharing a frame object (delete_detection)
+    ("ix_detections_bucket_key", "detections", ["bucket_key"], {}),
+    # Active sequences of a pose (matching and continuity at ingest)
+    ("ix_sequences_camera_id_pose_id_last_seen_at", "sequences", ["camera_id", "pose_id", "last_seen_at"], {}),
+    ("ix_sequences_started_at", "sequences", ["started_at"], {}),
+    # The composite primary key leads with alert_id
+    ("ix_alerts_sequences_sequence_id", "alerts_sequences", ["sequence_id"], {}),
+    ("ix_alerts_organization_id_started_at", "alerts", ["organization_id", "started_at"], {}),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY can't run in a transaction, and keeps the tables writable
+    # while the indexes build. IF NOT EXISTS lets a rerun skip what an interrupted one built
+    # (an interrupted concurrent build leaves an INVALID index to drop by hand).
+    with op.get_context().autocommit_block():
+        for name, table, columns, kwargs in _INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True, **kwargs)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
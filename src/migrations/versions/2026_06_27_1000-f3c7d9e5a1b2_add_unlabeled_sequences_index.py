@@ -0,0 +1,42 @@
+"""add a partial index on the last_seen_at of unlabeled sequences
+
+Revision ID: f3c7d9e5a1b2
+Revises: e2b6c8d4f0a1
+Create Date: 2026-06-27 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f3c7d9e5a1b2"
+down_revision: Union[str, None] = "e2b6c8d4f0a1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The unlabeled feeds filter on a recent last_seen_at across every camera of an
+    # organization: ix_sequences_camera_id_pose_id_last_seen_at can't lead with it.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_sequences_last_seen_at_unlabeled",
+            "sequences",
+            ["last_seen_at"],
+            postgresql_where=sa.text("is_wildfire IS NULL"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_sequences_last_seen_at_unlabeled",
+            table_name="sequences",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,35 @@
+"""add idempotency_keys for retried detection uploads
+
+Revision ID: a8d2e4f6b0c3
+Revises: f3c7d9e5a1b2
+Create Date: 2026-07-01 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+import sqlmodel
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a8d2e4f6b0c3"
+down_revision: Union[str, None] = "f3c7d9e5a1b2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "idempotency_keys",
+        sa.Column("camera_id", sa.Integer(), nullable=False),
+        sa.Column("key", sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+        sa.Column("detection_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["camera_id"], ["cameras.id"]),
+        sa.PrimaryKeyConstraint("camera_id", "key"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("idempotency_keys")
@@ -0,0 +1,33 @@
+"""add the frame manifest columns to sequences
+
+Revision ID: b9e3f5a7c1d4
+Revises: a8d2e4f6b0c3
+Create Date: 2026-07-08 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "b9e3f5a7c1d4"
+down_revision: Union[str, None] = "a8d2e4f6b0c3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # No backfill: a NULL frame_count means "not built yet", and the validation worker builds
+    # the manifest of a sequence from its detections the first time it scores it.
+    op.add_column("sequences", sa.Column("frame_count", sa.Integer(), nullable=True))
+    op.add_column("sequences", sa.Column("recent_frame_keys", postgresql.ARRAY(sa.String()), nullable=True))
+    op.add_column("sequences", sa.Column("recent_frame_rois", postgresql.ARRAY(sa.Float()), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("sequences", "recent_frame_rois")
+    op.drop_column("sequences", "recent_frame_keys")
+    op.drop_column("sequences", "frame_count")
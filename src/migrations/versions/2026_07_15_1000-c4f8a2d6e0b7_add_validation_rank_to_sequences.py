@@ -0,0 +1,59 @@
+"""order the validation queue by a priority rank
+
+Revision ID: c4f8a2d6e0b7
+Revises: b9e3f5a7c1d4
+Create Date: 2026-07-15 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c4f8a2d6e0b7"
+down_revision: Union[str, None] = "b9e3f5a7c1d4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("sequences", sa.Column("validation_rank_at", sa.DateTime(), nullable=True))
+    # Jobs queued before the upgrade keep their FIFO position
+    op.execute("UPDATE sequences SET validation_rank_at = validation_due_at WHERE validation_due_at IS NOT NULL")
+    # The claim now orders the due rows by rank: the due-time index has no other reader
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_sequences_validation_rank_at",
+            "sequences",
+            ["validation_rank_at"],
+            postgresql_where=sa.text("validation_due_at IS NOT NULL"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_sequences_validation_due_at",
+            table_name="sequences",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_sequences_validation_due_at",
+            "sequences",
+            ["validation_due_at"],
+            postgresql_where=sa.text("validation_due_at IS NOT NULL"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_sequences_validation_rank_at",
+            table_name="sequences",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_column("sequences", "validation_rank_at")
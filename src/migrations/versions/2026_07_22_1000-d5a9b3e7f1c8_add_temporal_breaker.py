@@ -0,0 +1,35 @@
+"""add temporal_breaker for the circuit breaker shared across processes
+
+Revision ID: d5a9b3e7f1c8
+Revises: c4f8a2d6e0b7
+Create Date: 2026-07-22 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d5a9b3e7f1c8"
+down_revision: Union[str, None] = "c4f8a2d6e0b7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Single row, created closed on first use
+    op.create_table(
+        "temporal_breaker",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("consecutive_failures", sa.Integer(), nullable=False),
+        sa.Column("open_count", sa.Integer(), nullable=False),
+        sa.Column("paused_until", sa.DateTime(), nullable=True),
+        sa.Column("probe_until", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("temporal_breaker")
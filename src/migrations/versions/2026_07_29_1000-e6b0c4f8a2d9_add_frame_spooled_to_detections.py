@@ -0,0 +1,30 @@
+"""flag the detections whose frame is still in the write-behind spool
+
+Revision ID: e6b0c4f8a2d9
+Revises: d5a9b3e7f1c8
+Create Date: 2026-07-29 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e6b0c4f8a2d9"
+down_revision: Union[str, None] = "d5a9b3e7f1c8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Every existing frame is on the bucket already
+    op.add_column(
+        "detections",
+        sa.Column("frame_spooled", sa.Boolean(), nullable=False, server_default=sa.false()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("detections", "frame_spooled")
@@ -0,0 +1,28 @@
+"""keep the enqueue time of the validation jobs apart from their due time
+
+Revision ID: f7c1d5a9b3e0
+Revises: e6b0c4f8a2d9
+Create Date: 2026-08-05 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f7c1d5a9b3e0"
+down_revision: Union[str, None] = "e6b0c4f8a2d9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("sequences", sa.Column("validation_queued_at", sa.DateTime(), nullable=True))
+    # Jobs queued before the upgrade: their due time is the best enqueue time known
+    op.execute("UPDATE sequences SET validation_queued_at = validation_due_at WHERE validation_due_at IS NOT NULL")
+
+
+def downgrade() -> None:
+    op.drop_column("sequences", "validation_queued_at")
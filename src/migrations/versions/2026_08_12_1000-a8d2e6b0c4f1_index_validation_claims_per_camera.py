@@ -0,0 +1,70 @@
+"""index the validation queue per camera, and the live leases
+
+Revision ID: a8d2e6b0c4f1
+Revises: f7c1d5a9b3e0
+Create Date: 2026-08-12 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a8d2e6b0c4f1"
+down_revision: Union[str, None] = "f7c1d5a9b3e0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        # The claim takes the first jobs of each camera in rank order, then interleaves the organizations
+        op.create_index(
+            "ix_sequences_camera_id_validation_rank_at",
+            "sequences",
+            ["camera_id", "validation_rank_at"],
+            postgresql_where=sa.text("validation_due_at IS NOT NULL"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_sequences_validation_rank_at",
+            table_name="sequences",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        # Jobs in flight, counted per organization for the in-flight cap
+        op.create_index(
+            "ix_sequences_validation_lease_until",
+            "sequences",
+            ["validation_lease_until"],
+            postgresql_where=sa.text("validation_lease_until IS NOT NULL"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_sequences_validation_lease_until",
+            table_name="sequences",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.create_index(
+            "ix_sequences_validation_rank_at",
+            "sequences",
+            ["validation_rank_at"],
+            postgresql_where=sa.text("validation_due_at IS NOT NULL"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_sequences_camera_id_validation_rank_at",
+            table_name="sequences",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
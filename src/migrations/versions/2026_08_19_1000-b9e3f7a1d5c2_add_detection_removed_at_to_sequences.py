@@ -0,0 +1,26 @@
+"""stamp the sequences losing a detection, for every worker's sequence index to notice
+
+Revision ID: b9e3f7a1d5c2
+Revises: a8d2e6b0c4f1
+Create Date: 2026-08-19 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b9e3f7a1d5c2"
+down_revision: Union[str, None] = "a8d2e6b0c4f1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("sequences", sa.Column("detection_removed_at", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("sequences", "detection_removed_at")
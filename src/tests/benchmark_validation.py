@@ -0,0 +1,325 @@
+# Copyright (C) 2026, Pyronear.
+
+# This program is licensed under the Apache License 2.0.
+# See LICENSE or go to <https://www.apache.org/licenses/LICENSE-2.0> for full license details.
+
+"""Validation load benchmark: ``python -m tests.benchmark_validation [--workers 1,2,4] ...``.
+
+Queues thousands of synthetic sequences, drains them with validation workers scoring against
+the temporal simulator, and reports the throughput (jobs/sec), the p50/p99 latency from
+enqueue to completion and the share of each ``validation_status``, for every combination of
+worker count and settings given (``--set TEMPORAL_VALIDATION_LEASE_SECONDS=60,120``).
+
+Writes to the database of the environment (POSTGRES_URL): run it against a throwaway one,
+e.g. ``make benchmark-validation`` in the dev compose stack. The workers run in this process,
+each like a uvicorn process of its own (coordinated through the DB), but they share its
+connection pool (15 connections) and temporal client: keep ``workers * (concurrency + 1)``
+under the pool, and use ``--temporal-url`` against a served simulator
+(``python -m tests.temporal_simulator``) with standalone workers for larger set-ups.
+"""
+
+import argparse
+import asyncio
+import itertools
+import statistics
+import time
+from collections import Counter
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import httpx
+from sqlalchemy import text
+from sqlmodel import SQLModel
+
+from app.core.config import settings
+from app.core.time import utcnow
+from app.crud import SequenceCRUD
+from app.db import engine, session_factory
+from app.services.prediction_cache import prediction_cache
+from app.services.temporal import temporal_service
+from app.services.validation import drain_notifications, validation_worker_loop
+from tests.temporal_simulator import TemporalSimulator
+
+__all__ = ["BenchmarkResult", "run_benchmark"]
+
+# How often the driver checks for completed jobs (latency resolution)
+POLL_SECONDS = 0.1
+# Sequences inserted and queued per statement
+ENQUEUE_CHUNK = 200
+BENCH_PREFIX = "benchmark"
+
+# Sequences ``first..last`` spread over the cameras, due now: with their frame manifests
+# filled in as ingestion does (the workers read no detection) and frame keys unique per run
+_INSERT_DUE_SEQUENCES = text(
+    "INSERT INTO sequences (camera_id, pose_id, camera_azimuth, sequence_azimuth, cone_angle, started_at, "
+    "last_seen_at, max_conf, is_validated, validation_attempts, validation_due_at, validation_rank_at, "
+    "frame_count, recent_frame_keys, recent_frame_rois) "
+    "SELECT cameras[1 + g % cardinality(cameras)], poses[1 + g % cardinality(poses)], 180, 175, 5, "
+    "now_ - interval '5 minutes', now_, 0.9, false, 0, now_, now_, frames, "
+    "ARRAY(SELECT key_prefix || g || '-' || k || '.jpg' FROM generate_series(1, frames) AS k), "
+    "array_fill(NULL::float, ARRAY[frames * 4]) "
+    "FROM (SELECT CAST(:cameras AS int[]) AS cameras, CAST(:poses AS int[]) AS poses, "
+    "CAST(:now AS timestamp) AS now_, CAST(:frames AS int) AS frames, CAST(:key_prefix AS text) AS key_prefix) AS p, "
+    "generate_series(CAST(:first AS int), CAST(:last AS int)) AS g RETURNING id"
+)
+
+
+class BenchmarkResult(NamedTuple):
+    workers: int
+    overrides: Dict[str, Any]
+    jobs: int
+    completed: int
+    seconds: float
+    latencies: List[float]
+    statuses: Dict[str, int]
+
+    @property
+    def jobs_per_second(self) -> float:
+        return self.completed / self.seconds if self.seconds > 0 else 0.0
+
+    def percentile(self, pct: int) -> float:
+        if len(self.latencies) < 2:
+            return self.latencies[0] if self.latencies else float("nan")
+        return statistics.quantiles(self.latencies, n=100)[pct - 1]
+
+    def share(self, status: str) -> float:
+        return self.statuses.get(status, 0) / self.completed if self.completed else 0.0
+
+
+async def _seed_cameras(organizations: int) -> List[Tuple[int, int]]:
+    """One organization, camera and pose per organization asked; returns (camera_id, pose_id) pairs."""
+    pairs = []
+    async with session_factory() as session:
+        for idx in range(organizations):
+            org_id = (
+                await session.exec(
+                    text("INSERT INTO organizations (name) VALUES (:name) RETURNING id"),
+                    params={"name": f"{BENCH_PREFIX}-org-{idx}"},
+                )
+            ).one()[0]
+            camera_id = (
+                await session.exec(
+                    text(
+                        "INSERT INTO cameras (organization_id, name, angle_of_view, elevation, lat, lon, is_trustable, "
+                        "created_at) VALUES (:org_id, :name, 90, 100, 44.0 + :idx, 4.0, true, :now) RETURNING id"
+                    ),
+                    params={"org_id": org_id, "name": f"{BENCH_PREFIX}-cam-{idx}", "idx": idx, "now": utcnow()},
+                )
+            ).one()[0]
+            pose_id = (
+                await session.exec(
+                    text("INSERT INTO poses (camera_id, azimuth, active) VALUES (:camera_id, 180, true) RETURNING id"),
+                    params={"camera_id": camera_id},
+                )
+            ).one()[0]
+            pairs.append((int(camera_id), int(pose_id)))
+        await session.commit()
+    return pairs
+
+
+async def _cleanup() -> None:
+    """Drop everything the benchmark created."""
+    async with session_factory() as session:
+        for stmt in (
+            (
+                "DELETE FROM alerts_sequences WHERE sequence_id IN (SELECT s.id FROM sequences s "
+                "JOIN cameras c ON c.id = s.camera_id WHERE c.name LIKE :pattern)"
+            ),
+            "DELETE FROM alerts WHERE organization_id IN (SELECT id FROM organizations WHERE name LIKE :pattern)",
+            "DELETE FROM sequences WHERE camera_id IN (SELECT id FROM cameras WHERE name LIKE :pattern)",
+            "DELETE FROM poses WHERE camera_id IN (SELECT id FROM cameras WHERE name LIKE :pattern)",
+            "DELETE FROM cameras WHERE name LIKE :pattern",
+            "DELETE FROM organizations WHERE name LIKE :pattern",
+        ):
+            await session.exec(text(stmt), params={"pattern": f"{BENCH_PREFIX}-%"})
+        await session.commit()
+
+
+async def _enqueue(
+    cameras: List[Tuple[int, int]], count: int, frames: int, rate: float, run: int, pending: Dict[int, float]
+) -> None:
+    """Insert and queue ``count`` sequences spread over the cameras, at ``rate`` per second (0: all at once).
+
+    Records the enqueue time of each one in ``pending``.
+    """
+    chunk = ENQUEUE_CHUNK if rate <= 0 else max(1, int(rate * POLL_SECONDS))
+    started_at = time.monotonic()
+    for first in range(0, count, chunk):
+        if rate > 0:
+            await asyncio.sleep(max(0.0, started_at + first / rate - time.monotonic()))
+        async with session_factory() as session:
+            # Inserted due; the enqueue then applies the priorities and wakes the workers
+            res = await session.exec(
+                _INSERT_DUE_SEQUENCES,
+                params={
+                    "cameras": [camera_id for camera_id, _ in cameras],
+                    "poses": [pose_id for _, pose_id in cameras],
+                    "now": utcnow(),
+                    "frames": frames,
+                    "key_prefix": f"{BENCH_PREFIX}-{run}-",
+                    "first": first,
+                    "last": min(first + chunk, count) - 1,
+                },
+            )
+            ids = [int(row[0]) for row in res]
+            await session.commit()
+            pending.update(dict.fromkeys(ids, time.monotonic()))
+            await SequenceCRUD(session).enqueue_validations(
+                ids, priority_seconds=settings.TEMPORAL_VALIDATION_PRIORITY_SECONDS
+            )
+
+
+async def _completed(ids: Sequence[int]) -> List[Tuple[int, Optional[str]]]:
+    async with session_factory() as session:
+        res = await session.exec(
+            text("SELECT id, validation_status FROM sequences WHERE id = ANY(:ids) AND validation_due_at IS NULL"),
+            params={"ids": list(ids)},
+        )
+        return [(int(sequence_id), status) for sequence_id, status in res]
+
+
+async def run_benchmark(
+    sequences: int,
+    *,
+    workers: int = 1,
+    concurrency: int = 1,
+    organizations: int = 4,
+    frames: int = 6,
+    rate: float = 0.0,
+    max_seconds: float = 600.0,
+    simulator: Optional[TemporalSimulator] = None,
+    run: int = 0,
+) -> BenchmarkResult:
+    """Queue ``sequences`` jobs and drain them with ``workers`` worker loops of ``concurrency`` slots.
+
+    Stops after ``max_seconds``, reporting the jobs completed by then.
+
+    Scores against ``simulator`` in-process, or against TEMPORAL_API_URL when None.
+    """
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    await _cleanup()
+    cameras = await _seed_cameras(organizations)
+    # Fresh state: nothing cached nor tripped by a previous run
+    prediction_cache.clear()
+    temporal_service._record_success()
+    temporal_url = settings.TEMPORAL_API_URL
+    if simulator is not None:
+        settings.TEMPORAL_API_URL = "http://temporal-simulator"
+        await temporal_service.close()
+        temporal_service._client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=simulator.app), timeout=settings.TEMPORAL_API_TIMEOUT
+        )
+    pending: Dict[int, float] = {}
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    loops = [asyncio.create_task(validation_worker_loop(concurrency)) for _ in range(workers)]
+    started_at = time.monotonic()
+    enqueuer = asyncio.create_task(_enqueue(cameras, sequences, frames, rate, run, pending))
+    try:
+        while len(latencies) < sequences and time.monotonic() - started_at < max_seconds:
+            await asyncio.sleep(POLL_SECONDS)
+            if enqueuer.done():
+                enqueuer.result()  # surface a failed enqueue
+            done = await _completed(list(pending)) if pending else []
+            now = time.monotonic()
+            for sequence_id, status in done:
+                latencies.append(now - pending.pop(sequence_id))
+                statuses[status or "not_validated"] += 1
+        seconds = time.monotonic() - started_at
+    finally:
+        for task in (enqueuer, *loops):
+            task.cancel()
+        await asyncio.gather(enqueuer, *loops, return_exceptions=True)
+        await drain_notifications()
+        await temporal_service.close()
+        settings.TEMPORAL_API_URL = temporal_url
+        await _cleanup()
+    return BenchmarkResult(workers, {}, sequences, len(latencies), seconds, latencies, dict(statuses))
+
+
+def _parse_overrides(entries: Sequence[str]) -> List[Dict[str, Any]]:
+    """Every combination of the ``KEY=V1,V2`` settings, cast to the type of the current value."""
+    axes = []
+    for entry in entries:
+        key, _, values = entry.partition("=")
+        current = getattr(settings, key)
+        cast_to = type(current) if current is not None else str
+        axes.append([(key, cast_to(value)) for value in values.split(",")])
+    return [dict(combination) for combination in itertools.product(*axes)]
+
+
+def _report(result: BenchmarkResult) -> str:
+    overrides = " ".join(f"{key}={value}" for key, value in result.overrides.items()) or "-"
+    return (
+        f"{result.workers:>7} {result.completed:>5}/{result.jobs:<5} {result.jobs_per_second:>8.1f} "
+        f"{result.percentile(50):>7.2f} {result.percentile(99):>7.2f} "
+        f"{result.share('fail_open_unavailable'):>8.1%} {result.share('fail_open_stale'):>8.1%}  {overrides}"
+    )
+
+
+async def _main(args: argparse.Namespace) -> None:
+    simulator_kwargs = {
+        "latency_ms": args.latency_ms,
+        "latency_sigma": args.latency_sigma,
+        "per_item_ms": args.per_item_ms,
+        "failure_rate": args.failure_rate,
+        "client_error_share": args.client_error_share,
+        "serialized": args.serialized,
+        "positive_rate": args.positive_rate,
+    }
+    if args.temporal_url:
+        settings.TEMPORAL_API_URL = args.temporal_url
+    print("workers  done/jobs   jobs/s  p50 (s) p99 (s)  unavail.   stale  settings")
+    run = 0
+    for workers in args.workers:
+        for overrides in _parse_overrides(args.set):
+            previous = {key: getattr(settings, key) for key in overrides}
+            for key, value in overrides.items():
+                setattr(settings, key, value)
+            try:
+                result = await run_benchmark(
+                    args.sequences,
+                    workers=workers,
+                    concurrency=args.concurrency,
+                    organizations=args.organizations,
+                    frames=args.frames,
+                    rate=args.rate,
+                    max_seconds=args.max_seconds,
+                    simulator=None if args.temporal_url else TemporalSimulator(**simulator_kwargs),
+                    run=run,
+                )
+            finally:
+                for key, value in previous.items():
+                    setattr(settings, key, value)
+            print(_report(result._replace(overrides=overrides)), flush=True)
+            run += 1
+    await engine.dispose()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Pyronear validation load benchmark")
+    parser.add_argument("--sequences", type=int, default=2000, help="jobs queued per run")
+    parser.add_argument(
+        "--workers", type=lambda value: [int(item) for item in value.split(",")], default=[1], help="e.g. 1,2,4"
+    )
+    parser.add_argument("--concurrency", type=int, default=settings.TEMPORAL_VALIDATION_CONCURRENCY)
+    parser.add_argument(
+        "--set", action="append", default=[], metavar="KEY=V1,V2", help="settings to sweep (repeatable)"
+    )
+    parser.add_argument("--organizations", type=int, default=4, help="organizations the jobs are spread over")
+    parser.add_argument("--frames", type=int, default=6, help="frames per sequence")
+    parser.add_argument("--rate", type=float, default=0.0, help="jobs queued per second (0: all at once)")
+    parser.add_argument("--max-seconds", type=float, default=600.0, help="max duration of a run")
+    parser.add_argument("--temporal-url", default=None, help="score against this server instead of the simulator")
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--latency-sigma", type=float, default=0.3)
+    parser.add_argument("--per-item-ms", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--client-error-share", type=float, default=0.0)
+    parser.add_argument("--serialized", action="store_true")
+    parser.add_argument("--positive-rate", type=float, default=0.2)
+    asyncio.run(_main(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
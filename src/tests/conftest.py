@@ -22,6 +22,8 @@ from app.core.time import utcnow
 from app.db import engine, session_factory
 from app.main import app
 from app.models import Camera, Detection, OcclusionMask, Organization, Pose, Sequence, User, Webhook
+from app.services.prediction_cache import prediction_cache
+from app.services.sequence_index import sequence_index
 from app.services.storage import s3_service
 from app.services.validation import process_next_due_validation
 
@@ -319,6 +321,9 @@ async def async_session() -> AsyncSession:
                 await session.exec(table.delete())
                 if hasattr(table.c, "id"):
                     await session.exec(text(f"ALTER SEQUENCE {table.name}_id_seq RESTART WITH 1"))
+        # Tables are wiped between tests: drop the process-wide caches built on the previous rows
+        sequence_index.clear()
+        prediction_cache.clear()
 
         yield session
         await session.rollback()
@@ -15,30 +15,32 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from app.api.api_v1.endpoints import detections as detections_api
 from app.api.api_v1.endpoints.detections import (
     _attach_sequence_to_alert,
-    _bboxes_overlap,
     _build_links_for_group,
     _build_overlap_records,
     _fetch_alert_mapping,
     _filter_candidate_alert_ids,
     _get_camera_by_id,
-    _get_last_bbox_for_sequence,
     _get_or_create_alert_id,
     _get_recent_sequences,
     _maybe_update_alert,
     _merge_alerts,
     _parse_bbox,
     _resolve_groups_and_locations,
+    _sync_sequence_index,
     create_detection,
 )
+from app.core.bboxes import decode_bboxes
 from app.core.config import settings
 from app.core.time import utcnow
 from app.crud import AlertCRUD, CameraCRUD, DetectionCRUD, OrganizationCRUD, PoseCRUD, SequenceCRUD
 from app.models import Alert, AlertSequence, Camera, Detection, Organization, Pose, Role, Sequence, Webhook
+from app.schemas.detections import DetectionRead
 from app.schemas.login import TokenPayload
 from app.services import validation as validation_service
-from app.services.cones import resolve_cone
+from app.services.cones import cone_from_bboxes
+from app.services.sequence_index import sequence_index
 from app.services.slack import slack_client
-from app.services.storage import s3_service
+from app.services.storage import MediaSpool, s3_service
 from app.services.telegram import telegram_client
 from app.services.validation import process_next_due_validation
 
@@ -237,6 +239,53 @@ async def test_create_detection_empty_bboxes_without_active_sequence_stores_noth
     assert len(seqs) == len(pytest.sequence_table)
 
 
+@pytest.mark.asyncio
+async def test_create_detection_idempotency_key_replays_the_original_upload(
+    async_client: AsyncClient, detection_session: AsyncSession, mock_img: bytes, monkeypatch
+):
+    auth = pytest.get_token(pytest.camera_table[0]["id"], ["camera"], pytest.camera_table[0]["organization_id"])
+    uploads: List[str] = []
+    upload_file = detections_api.upload_file
+
+    async def counting_upload(*args, **kwargs):
+        uploads.append(args[0].filename)
+        return await upload_file(*args, **kwargs)
+
+    monkeypatch.setattr(detections_api, "upload_file", counting_upload)
+
+    async def post(bboxes: str, key: str):
+        return await async_client.post(
+            "/detections",
+            data={"pose_id": pytest.pose_table[0]["id"], "bboxes": bboxes},
+            files={"file": ("logo.png", mock_img, "image/png")},
+            headers={**auth, "Idempotency-Key": key},
+        )
+
+    first = await post("[(0.6,0.6,0.7,0.7,0.6)]", "frame-1")
+    assert first.status_code == 201, first.__dict__
+    # The retry gets the original detection back: nothing uploaded, stored or matched again
+    retry = await post("[(0.6,0.6,0.7,0.7,0.6)]", "frame-1")
+    assert retry.status_code == 201, retry.__dict__
+    assert retry.json() == first.json()
+    assert len(uploads) == 1
+    detection_session.expire_all()
+    dets = (await detection_session.exec(select(Detection))).all()
+    assert len(dets) == len(pytest.detection_table) + 1
+    # An empty frame extending no sequence replays its 204
+    for _ in range(2):
+        response = await post("[]", "frame-2")
+        assert response.status_code == 204, response.__dict__
+    # Another key is another upload
+    other = await post("[(0.6,0.6,0.7,0.7,0.6)]", "frame-3")
+    assert other.status_code == 201, other.__dict__
+    assert other.json()["id"] != first.json()["id"]
+    # Expired keys are forgotten
+    monkeypatch.setattr(settings, "IDEMPOTENCY_KEY_TTL_SECONDS", 0)
+    expired = await post("[(0.6,0.6,0.7,0.7,0.6)]", "frame-1")
+    assert expired.status_code == 201, expired.__dict__
+    assert expired.json()["id"] not in {first.json()["id"], other.json()["id"]}
+
+
 @pytest.mark.asyncio
 async def test_create_detection_empty_bboxes_rejects_crops(
     async_client: AsyncClient, detection_session: AsyncSession, mock_img: bytes
@@ -368,9 +417,27 @@ async def test_create_detection_continuity_row_for_unmatched_sequence(
     unmatched_after = await detection_session.get(Sequence, unmatched_seq_id)
     assert unmatched_after.last_seen_at == unmatched_last_seen
 
+    # Both frame manifests got the frame, the continuity one without a box
+    matched_after = await detection_session.get(Sequence, matched_seq_id)
+    for seq, roi in ((matched_after, (0.6, 0.6, 0.7, 0.7)), (unmatched_after, None)):
+        manifest = seq.frame_manifest
+        assert manifest.frame_count == settings.SEQUENCE_MIN_INTERVAL_DETS + 1
+        assert manifest.keys[-1] == bucket_key
+        assert manifest.rois[-1] == (pytest.approx(roi) if roi else None)
+
+    # Losing a detection invalidates the manifest, which is rebuilt from the remaining rows
+    sequences = SequenceCRUD(detection_session)
+    await sequences.record_detection_removal(matched_seq_id)
+    detection_session.expire_all()
+    assert (await detection_session.get(Sequence, matched_seq_id)).frame_manifest is None
+    rebuilt = await sequences.get_frame_manifest(matched_seq_id, keep_last=2)
+    assert rebuilt == matched_after.frame_manifest._replace(
+        keys=matched_after.frame_manifest.keys[-2:], rois=matched_after.frame_manifest.rois[-2:]
+    )
+
 
 @pytest.mark.asyncio
-async def test_get_last_bbox_for_sequence_returns_latest(detection_session: AsyncSession):
+async def test_sync_sequence_index_loads_latest_bbox(detection_session: AsyncSession):
     detections = DetectionCRUD(detection_session)
     now = utcnow()
     camera_id = pytest.camera_table[0]["id"]
@@ -413,12 +480,37 @@ async def test_get_last_bbox_for_sequence_returns_latest(detection_session: Asyn
     detection_session.add(det2)
     await detection_session.commit()
 
-    last_bbox = await _get_last_bbox_for_sequence(detections, sequence.id)
+    await _sync_sequence_index(detections, SequenceCRUD(detection_session), camera_id, pose.id)
+    last_bbox = dict(sequence_index.active(camera_id, pose.id))[sequence.id].bbox
     assert last_bbox == (0.3, 0.3, 0.4, 0.4, 0.9)
 
+    # A detection appended by another worker refreshes last_seen_at, so the entry gets reloaded
+    det3 = Detection(
+        camera_id=camera_id,
+        pose_id=pose.id,
+        sequence_id=sequence.id,
+        bucket_key="bbox-3",
+        bbox="[(0.5,0.5,0.6,0.6,0.9)]",
+        created_at=now + timedelta(seconds=1),
+    )
+    detection_session.add(det3)
+    sequence.last_seen_at = now + timedelta(seconds=1)
+    detection_session.add(sequence)
+    await detection_session.commit()
+    await detection_session.refresh(det3)
+    await _sync_sequence_index(detections, SequenceCRUD(detection_session), camera_id, pose.id)
+    assert dict(sequence_index.active(camera_id, pose.id))[sequence.id].bbox == (0.5, 0.5, 0.6, 0.6, 0.9)
+
+    # Deleting it through another worker leaves last_seen_at as is: the removal stamp alone
+    # makes this worker fall back to the previous bbox
+    await SequenceCRUD(detection_session).record_detection_removal(sequence.id, commit=False)
+    await detections.delete(det3.id)
+    await _sync_sequence_index(detections, SequenceCRUD(detection_session), camera_id, pose.id)
+    assert dict(sequence_index.active(camera_id, pose.id))[sequence.id].bbox == (0.3, 0.3, 0.4, 0.4, 0.9)
+
 
 @pytest.mark.asyncio
-async def test_get_last_bbox_for_sequence_returns_none_without_detections(detection_session: AsyncSession):
+async def test_sync_sequence_index_without_detections(detection_session: AsyncSession):
     detections = DetectionCRUD(detection_session)
     now = utcnow()
     camera_id = pytest.camera_table[0]["id"]
@@ -440,12 +532,13 @@ async def test_get_last_bbox_for_sequence_returns_none_without_detections(detect
     await detection_session.commit()
     await detection_session.refresh(sequence)
 
-    last_bbox = await _get_last_bbox_for_sequence(detections, sequence.id)
+    await _sync_sequence_index(detections, SequenceCRUD(detection_session), camera_id, pose.id)
+    last_bbox = dict(sequence_index.active(camera_id, pose.id))[sequence.id].bbox
     assert last_bbox is None
 
 
 @pytest.mark.asyncio
-async def test_get_last_bbox_for_sequence_returns_none_for_invalid_bbox(detection_session: AsyncSession):
+async def test_sync_sequence_index_ignores_empty_bbox(detection_session: AsyncSession):
     detections = DetectionCRUD(detection_session)
     now = utcnow()
     camera_id = pytest.camera_table[0]["id"]
@@ -478,12 +571,13 @@ async def test_get_last_bbox_for_sequence_returns_none_for_invalid_bbox(detectio
     detection_session.add(det)
     await detection_session.commit()
 
-    last_bbox = await _get_last_bbox_for_sequence(detections, sequence.id)
+    await _sync_sequence_index(detections, SequenceCRUD(detection_session), camera_id, pose.id)
+    last_bbox = dict(sequence_index.active(camera_id, pose.id))[sequence.id].bbox
     assert last_bbox is None
 
 
 @pytest.mark.asyncio
-async def test_get_last_bbox_for_sequence_skips_continuity_rows(detection_session: AsyncSession):
+async def test_sync_sequence_index_skips_continuity_rows(detection_session: AsyncSession):
     detections = DetectionCRUD(detection_session)
     now = utcnow()
     camera_id = pytest.camera_table[0]["id"]
@@ -525,10 +619,38 @@ async def test_get_last_bbox_for_sequence_skips_continuity_rows(detection_sessio
     detection_session.add(continuity_det)
     await detection_session.commit()
 
-    last_bbox = await _get_last_bbox_for_sequence(detections, sequence.id)
+    await _sync_sequence_index(detections, SequenceCRUD(detection_session), camera_id, pose.id)
+    last_bbox = dict(sequence_index.active(camera_id, pose.id))[sequence.id].bbox
     assert last_bbox == (0.1, 0.1, 0.2, 0.2, 0.9)
 
 
+@pytest.mark.asyncio
+async def test_detection_bbox_columns_follow_bbox_strings(detection_session: AsyncSession):
+    camera_id = pytest.camera_table[0]["id"]
+    det = Detection(
+        camera_id=camera_id,
+        pose_id=pytest.pose_table[0]["id"],
+        bucket_key="bbox-columns",
+        bbox="[(.1,.2,.3,.4,.9)]",
+        others_bboxes="[(.5,.5,.6,.6,.4),(0,0,1,1,.2)]",
+    )
+    detection_session.add(det)
+    await detection_session.commit()
+    await detection_session.refresh(det)
+    assert det.primary_bbox == (0.1, 0.2, 0.3, 0.4, 0.9)
+    assert det.others_coords == [0.5, 0.5, 0.6, 0.6, 0.4, 0.0, 0.0, 1.0, 1.0, 0.2]
+    # Decoded columns stay out of the API payload
+    assert "bbox_conf" not in DetectionRead(**det.model_dump()).model_dump()
+
+    det.bbox, det.others_bboxes = "[]", None
+    detection_session.add(det)
+    await detection_session.commit()
+    await detection_session.refresh(det)
+    assert det.bbox_conf is None
+    assert det.primary_bbox is None
+    assert det.others_coords is None
+
+
 @pytest.mark.asyncio
 async def test_get_camera_by_id_adds_missing_sequence_camera(detection_session: AsyncSession):
     cam_crud = CameraCRUD(detection_session)
@@ -612,26 +734,6 @@ def test_resolve_groups_and_locations_no_match_returns_none():
     assert _resolve_groups_and_locations(records, 999) is None
 
 
-@pytest.mark.parametrize(
-    ("left", "right", "tolerance", "expected"),
-    [
-        # Overlapping boxes always match
-        ((0.1, 0.1, 0.3, 0.3, 0.9), (0.2, 0.2, 0.4, 0.4, 0.9), 0.0, True),
-        # Disjoint boxes with zero tolerance never match
-        ((0.1, 0.1, 0.3, 0.3, 0.9), (0.32, 0.1, 0.5, 0.3, 0.9), 0.0, False),
-        # Gap smaller than the tolerance matches
-        ((0.1, 0.1, 0.3, 0.3, 0.9), (0.32, 0.1, 0.5, 0.3, 0.9), 0.05, True),
-        # Gap larger than the tolerance does not match
-        ((0.1, 0.1, 0.3, 0.3, 0.9), (0.4, 0.1, 0.5, 0.3, 0.9), 0.05, False),
-        # Tolerance applies per axis
-        ((0.1, 0.1, 0.3, 0.3, 0.9), (0.32, 0.32, 0.5, 0.5, 0.9), 0.05, True),
-    ],
-)
-def test_bboxes_overlap_tolerance(left, right, tolerance, expected):
-    assert _bboxes_overlap(left, right, tolerance) is expected
-    assert _bboxes_overlap(right, left, tolerance) is expected
-
-
 @pytest.mark.asyncio
 async def test_fetch_alert_mapping_empty(detection_session: AsyncSession):
     mapping = await _fetch_alert_mapping(detection_session, [])
@@ -1277,6 +1379,7 @@ async def test_create_detection_sequence_flow_direct(detection_session: AsyncSes
         recorded_at=None,
         file=upload,
         crop_files=None,
+        idempotency_key=None,
         detections=detections,
         sequences=sequences,
         cameras=cameras,
@@ -1312,6 +1415,7 @@ async def test_create_detection_sequence_flow_direct(detection_session: AsyncSes
         recorded_at=None,
         file=upload_again,
         crop_files=None,
+        idempotency_key=None,
         detections=detections,
         sequences=sequences,
         cameras=cameras,
@@ -1496,9 +1600,9 @@ async def test_create_detection_creates_sequence(
     assert seq_res.cone_angle is not None
     camera = await detection_session.get(Camera, pytest.camera_table[0]["id"])
     assert camera is not None
-    expected_sequence_azimuth, expected_cone_angle = resolve_cone(
+    expected_sequence_azimuth, expected_cone_angle = cone_from_bboxes(
         float(pose.azimuth),
-        str(payload["bboxes"]),
+        decode_bboxes(str(payload["bboxes"])),
         camera.angle_of_view,
     )
     assert seq_res.sequence_azimuth == pytest.approx(expected_sequence_azimuth)
@@ -2157,3 +2261,423 @@ async def test_create_detection_authorizes_pose_before_uploading(
     assert response.status_code == 403, response.text
     assert response.json()["detail"] == "Access forbidden."
     assert upload_calls == []
+
+
+@pytest.mark.asyncio
+async def test_create_detections_batch_replays_frames_in_capture_order(
+    async_client: AsyncClient, detection_session: AsyncSession, mock_img: bytes
+):
+    auth = pytest.get_token(
+        pytest.camera_table[1]["id"],
+        ["camera"],
+        pytest.camera_table[1]["organization_id"],
+    )
+    base = datetime(2024, 1, 15, 10, 30, 0)
+    # Frames arrive out of order; each keeps its own capture time.
+    recorded = [base + timedelta(seconds=60), base, base + timedelta(seconds=30), base + timedelta(seconds=90)]
+    bboxes = ["[(0.6,0.6,0.7,0.7,0.6)]", "[(0.6,0.6,0.7,0.7,0.6)]", "[(0.6,0.6,0.7,0.7,0.6)]", "[]"]
+    response = await async_client.post(
+        "/detections/batch",
+        data={
+            "bboxes": bboxes,
+            "pose_id": [3] * len(bboxes),
+            "recorded_at": [ts.isoformat() for ts in recorded],
+        },
+        files=[("file", (f"frame-{idx}.jpg", mock_img + bytes([idx]), "image/jpeg")) for idx in range(len(bboxes))],
+        headers=auth,
+    )
+    assert response.status_code == 201, response.text
+    items = response.json()
+    assert [item["frame_index"] for item in items] == list(range(len(bboxes)))
+    for item, ts in zip(items, recorded, strict=True):
+        assert item["detection"]["pose_id"] == 3
+        assert item["detection"]["recorded_at"] == ts.isoformat()
+    # Replayed in capture order: frame 1 is the oldest detection, frame 0 the newest of the three.
+    det_ids = [item["detection"]["id"] for item in items[:3]]
+    assert det_ids[1] < det_ids[2] < det_ids[0]
+    # The three overlapping frames seed one sequence, which the trailing empty frame extends.
+    sequence_id = items[0]["detection"]["sequence_id"]
+    assert isinstance(sequence_id, int)
+    assert items[3]["detection"]["bbox"] == "[]"
+    dets_res = await detection_session.exec(
+        select(Detection).where(Detection.id.in_([item["detection"]["id"] for item in items]))  # type: ignore[attr-defined]
+    )
+    assert {det.sequence_id for det in dets_res.all()} == {sequence_id}
+
+
+@pytest.mark.asyncio
+async def test_create_detections_batch_splits_crops_per_frame(
+    async_client: AsyncClient, detection_session: AsyncSession, mock_img: bytes
+):
+    auth = pytest.get_token(
+        pytest.camera_table[1]["id"],
+        ["camera"],
+        pytest.camera_table[1]["organization_id"],
+    )
+    now = utcnow()
+    response = await async_client.post(
+        "/detections/batch",
+        data={
+            "bboxes": ["[(0.6,0.6,0.7,0.7,0.6),(0.2,0.2,0.3,0.3,0.8)]", "[(0.6,0.6,0.7,0.7,0.6)]"],
+            "pose_id": [3, 3],
+            "recorded_at": [now.isoformat(), (now + timedelta(seconds=30)).isoformat()],
+        },
+        files=[
+            ("file", ("frame-0.jpg", mock_img, "image/jpeg")),
+            ("file", ("frame-1.jpg", mock_img + b"frame-1", "image/jpeg")),
+            ("crop", ("crop-0.jpg", mock_img + b"crop-0", "image/jpeg")),
+            ("crop", ("crop-1.jpg", mock_img + b"crop-1", "image/jpeg")),
+            ("crop", ("crop-2.jpg", mock_img + b"crop-2", "image/jpeg")),
+        ],
+        headers=auth,
+    )
+    assert response.status_code == 201, response.text
+    items = response.json()
+    dets_res = await detection_session.exec(
+        select(Detection)
+        .where(Detection.bucket_key.in_([item["detection"]["bucket_key"] for item in items]))  # type: ignore[attr-defined]
+        .order_by(Detection.id)  # type: ignore[attr-defined]
+    )
+    dets = dets_res.all()
+    assert len(dets) == 3
+    crop_keys = [det.crop_bucket_key for det in dets]
+    assert all(isinstance(key, str) and key.startswith("crop_") for key in crop_keys)
+    assert len(set(crop_keys)) == 3
+    bucket = s3_service.get_bucket(s3_service.resolve_bucket_name(pytest.camera_table[1]["organization_id"]))
+    for key, suffix in zip(crop_keys, (b"crop-0", b"crop-1", b"crop-2"), strict=True):
+        expected = hashlib.md5(mock_img + suffix).hexdigest()  # ruff:ignore[hashlib-insecure-hash-function]
+        assert bucket.get_file_metadata(key)["ETag"].replace('"', "") == expected
+
+
+@pytest.mark.parametrize(
+    ("data", "crops", "status_code", "status_detail"),
+    [
+        (
+            {"bboxes": ["[(0.6,0.6,0.7,0.7,0.6)]"] * 2, "pose_id": [3], "recorded_at": ["2024-01-15T10:30:00"] * 2},
+            0,
+            422,
+            "Each frame needs its own bboxes, pose_id, recorded_at and file.",
+        ),
+        (
+            {
+                "bboxes": ["[(0.6,0.6,0.7,0.7,0.6)]", "[(0.6, 0.6)]"],
+                "pose_id": [3, 3],
+                "recorded_at": ["2024-01-15T10:30:00"] * 2,
+            },
+            0,
+            422,
+            "Invalid bbox format.",
+        ),
+        (
+            {"bboxes": ["[(0.6,0.6,0.7,0.7,0.6)]"] * 2, "pose_id": [3, 0], "recorded_at": ["2024-01-15T10:30:00"] * 2},
+            0,
+            422,
+            None,
+        ),
+        (
+            {"bboxes": ["[(0.6,0.6,0.7,0.7,0.6)]"] * 2, "pose_id": [3, 1], "recorded_at": ["2024-01-15T10:30:00"] * 2},
+            0,
+            403,
+            "Access forbidden.",
+        ),
+        (
+            {"bboxes": ["[(0.6,0.6,0.7,0.7,0.6)]"] * 2, "pose_id": [3, 99], "recorded_at": ["2024-01-15T10:30:00"] * 2},
+            0,
+            404,
+            "Table Pose has no corresponding entry.",
+        ),
+        (
+            {"bboxes": ["[(0.6,0.6,0.7,0.7,0.6)]"] * 2, "pose_id": [3, 3], "recorded_at": ["2024-01-15T10:30:00"] * 2},
+            1,
+            422,
+            "Number of crops must match the number of bboxes.",
+        ),
+    ],
+)
+@pytest.mark.asyncio
+async def test_create_detections_batch_rejects_before_upload(
+    async_client: AsyncClient,
+    detection_session: AsyncSession,
+    mock_img: bytes,
+    monkeypatch,
+    data: Dict[str, Any],
+    crops: int,
+    status_code: int,
+    status_detail: str,
+):
+    upload_calls: List[str] = []
+
+    async def fake_upload_file(  # ruff:ignore[unused-async]
+        file: UploadFile, organization_id: int, camera_id: int, key_prefix: str = ""
+    ) -> str:
+        upload_calls.append(file.filename or "")
+        return f"{key_prefix}should-never-persist"
+
+    monkeypatch.setattr(detections_api, "upload_file", fake_upload_file)
+
+    auth = pytest.get_token(
+        pytest.camera_table[1]["id"],
+        ["camera"],
+        pytest.camera_table[1]["organization_id"],
+    )
+    files = [("file", (f"frame-{idx}.jpg", mock_img, "image/jpeg")) for idx in range(2)]
+    files.extend(("crop", (f"crop-{idx}.jpg", mock_img, "image/jpeg")) for idx in range(crops))
+    response = await async_client.post("/detections/batch", data=data, files=files, headers=auth)
+    assert response.status_code == status_code, response.text
+    if isinstance(status_detail, str):
+        assert response.json()["detail"] == status_detail
+    # The whole batch is validated before any upload, so no orphan S3 objects are created.
+    assert upload_calls == []
+
+
+@pytest.mark.asyncio
+async def test_create_detections_batch_rejects_oversized_batch(
+    async_client: AsyncClient, detection_session: AsyncSession, mock_img: bytes, monkeypatch
+):
+    monkeypatch.setattr(settings, "MAX_FRAMES_PER_BATCH", 1)
+    auth = pytest.get_token(
+        pytest.camera_table[1]["id"],
+        ["camera"],
+        pytest.camera_table[1]["organization_id"],
+    )
+    response = await async_client.post(
+        "/detections/batch",
+        data={"bboxes": ["[]", "[]"], "pose_id": [3, 3], "recorded_at": ["2024-01-15T10:30:00"] * 2},
+        files=[("file", (f"frame-{idx}.jpg", mock_img, "image/jpeg")) for idx in range(2)],
+        headers=auth,
+    )
+    assert response.status_code == 422, response.text
+    assert response.json()["detail"] == "A batch holds at most 1 frames."
+
+
+@pytest.mark.asyncio
+async def test_create_detection_reuses_indexed_sequence_bboxes(
+    async_client: AsyncClient, detection_session: AsyncSession, mock_img: bytes, monkeypatch
+):
+    reloads: List[List[int]] = []
+    get_latest_with_bbox_in = DetectionCRUD.get_latest_with_bbox_in
+
+    async def counting_get_latest_with_bbox_in(self, sequence_ids):
+        reloads.append(sorted(sequence_ids))
+        return await get_latest_with_bbox_in(self, sequence_ids)
+
+    monkeypatch.setattr(DetectionCRUD, "get_latest_with_bbox_in", counting_get_latest_with_bbox_in)
+    auth = pytest.get_token(
+        pytest.camera_table[1]["id"],
+        ["camera"],
+        pytest.camera_table[1]["organization_id"],
+    )
+    payload = {"pose_id": 3, "bboxes": "[(0.6,0.6,0.7,0.7,0.6)]"}
+    det_ids = []
+    for idx in range(5):
+        response = await async_client.post(
+            "/detections",
+            data=payload,
+            files={"file": ("frame.jpg", mock_img + bytes([idx]), "image/jpeg")},
+            headers=auth,
+        )
+        assert response.status_code == 201, response.text
+        det_ids.append(response.json()["id"])
+    sequence_id = response.json()["sequence_id"]
+    assert isinstance(sequence_id, int)
+    # The sequence was indexed when seeded and kept up to date on each match: never reloaded
+    assert reloads == []
+
+    # Another worker appends a detection elsewhere in the frame: last_seen_at moves, so the
+    # next frame reloads the last bbox from the DB and matches against it.
+    moved = Detection(
+        camera_id=pytest.camera_table[1]["id"],
+        pose_id=3,
+        sequence_id=sequence_id,
+        bucket_key="other-worker",
+        bbox="[(0.1,0.1,0.2,0.2,0.6)]",
+    )
+    detection_session.add(moved)
+    await detection_session.commit()
+    seq = await detection_session.get(Sequence, sequence_id)
+    assert seq is not None
+    seq.last_seen_at = moved.created_at
+    detection_session.add(seq)
+    await detection_session.commit()
+
+    response = await async_client.post(
+        "/detections",
+        data={"pose_id": 3, "bboxes": "[(0.1,0.1,0.2,0.2,0.7)]"},
+        files={"file": ("frame.jpg", mock_img + b"moved", "image/jpeg")},
+        headers=auth,
+    )
+    assert response.status_code == 201, response.text
+    assert reloads == [[sequence_id]]
+    assert response.json()["sequence_id"] == sequence_id
+
+
+@pytest.mark.asyncio
+async def test_create_detection_assigns_each_box_to_its_best_sequence(
+    async_client: AsyncClient, detection_session: AsyncSession, mock_img: bytes
+):
+    camera_id = pytest.camera_table[1]["id"]
+    now = utcnow()
+    seq_ids = []
+    # The most recent sequence comes first and is within reach of both boxes of the frame
+    for offset, bbox in ((20, "[(0.1,0.1,0.4,0.4,0.8)]"), (10, "[(0.4,0.4,0.5,0.5,0.8)]")):
+        seq = Sequence(
+            camera_id=camera_id,
+            pose_id=3,
+            camera_azimuth=0.0,
+            sequence_azimuth=0.0,
+            cone_angle=10.0,
+            started_at=now - timedelta(seconds=60),
+            last_seen_at=now - timedelta(seconds=offset),
+        )
+        detection_session.add(seq)
+        await detection_session.commit()
+        await detection_session.refresh(seq)
+        detection_session.add(
+            Detection(
+                camera_id=camera_id,
+                pose_id=3,
+                sequence_id=seq.id,
+                bucket_key=f"seq-{seq.id}",
+                bbox=bbox,
+                created_at=now - timedelta(seconds=offset),
+            )
+        )
+        await detection_session.commit()
+        seq_ids.append(seq.id)
+
+    auth = pytest.get_token(camera_id, ["camera"], pytest.camera_table[1]["organization_id"])
+    response = await async_client.post(
+        "/detections",
+        data={"pose_id": 3, "bboxes": "[(0.1,0.1,0.5,0.5,0.9),(0.42,0.42,0.5,0.5,0.7)]"},
+        files={"file": ("frame.jpg", mock_img + b"two-plumes", "image/jpeg")},
+        headers=auth,
+    )
+    assert response.status_code == 201, response.text
+
+    bucket_key = (await detection_session.get(Detection, response.json()["id"])).bucket_key
+    rows = (await detection_session.exec(select(Detection).where(Detection.bucket_key == bucket_key))).all()
+    sequence_by_bbox = {det.bbox: det.sequence_id for det in rows}
+    # First-match would have sent both boxes to the most recent sequence
+    assert sequence_by_bbox == {
+        "[(0.1,0.1,0.5,0.5,0.9)]": seq_ids[0],
+        "[(0.42,0.42,0.5,0.5,0.7)]": seq_ids[1],
+    }
+
+
+@pytest.mark.asyncio
+async def test_extend_sequences_updates_all_matches_at_once(detection_session: AsyncSession):
+    crud = SequenceCRUD(detection_session)
+    seq_low = await detection_session.get(Sequence, 1)
+    seq_high = await detection_session.get(Sequence, 2)
+    assert seq_low is not None
+    assert seq_high is not None
+    seq_low.max_conf = 0.2
+    seq_high.max_conf = 0.9
+    detection_session.add_all([seq_low, seq_high])
+    await detection_session.commit()
+
+    seen_low = utcnow()
+    seen_high = seen_low + timedelta(seconds=1)
+    await crud.extend_sequences({1: (seen_low, 0.5), 2: (seen_high, 0.5)})
+    await detection_session.refresh(seq_low)
+    await detection_session.refresh(seq_high)
+    assert (seq_low.last_seen_at, seq_low.max_conf) == (seen_low, pytest.approx(0.5))
+    # max_conf only ever rises
+    assert (seq_high.last_seen_at, seq_high.max_conf) == (seen_high, pytest.approx(0.9))
+
+    # No parsable confidence: last_seen_at moves, max_conf is left as is
+    await crud.extend_sequences({1: (seen_high, None)})
+    await detection_session.refresh(seq_low)
+    assert (seq_low.last_seen_at, seq_low.max_conf) == (seen_high, pytest.approx(0.5))
+
+
+@pytest.mark.asyncio
+async def test_create_detection_applies_frame_atomically(detection_session: AsyncSession, monkeypatch):
+    camera_id = pytest.camera_table[1]["id"]
+    org_id = pytest.camera_table[1]["organization_id"]
+    detections = DetectionCRUD(detection_session)
+    sequences = SequenceCRUD(detection_session)
+
+    async def fake_upload_file(  # ruff:ignore[unused-async]
+        file: UploadFile, organization_id: int, camera_id: int, key_prefix: str = "", spool: bool = False
+    ) -> str:
+        return f"{key_prefix}frame-key"
+
+    async def failing_enqueue_validations(*args, **kwargs):  # ruff:ignore[unused-async]
+        raise RuntimeError("connection lost")
+
+    monkeypatch.setattr(detections_api, "upload_file", fake_upload_file)
+    monkeypatch.setattr(settings, "SEQUENCE_MIN_INTERVAL_DETS", 1)
+    monkeypatch.setattr(sequences, "enqueue_validations", failing_enqueue_validations)
+    dets_before = len(await detections.fetch_all())
+    seqs_before = len(await sequences.fetch_all())
+
+    with pytest.raises(RuntimeError, match="connection lost"):
+        await create_detection(
+            bboxes="[(0.6,0.6,0.7,0.7,0.6),(0.2,0.2,0.3,0.3,0.8)]",
+            pose_id=3,
+            recorded_at=None,
+            file=UploadFile(filename="img.png", file=io.BytesIO(b"img")),
+            crop_files=None,
+            idempotency_key=None,
+            detections=detections,
+            sequences=sequences,
+            cameras=CameraCRUD(detection_session),
+            poses=PoseCRUD(detection_session),
+            token_payload=TokenPayload(sub=camera_id, scopes=[Role.CAMERA], organization_id=org_id),
+        )
+    # The request session is closed without commit: nothing of the frame was applied
+    await detection_session.rollback()
+    assert len(await detections.fetch_all()) == dets_before
+    assert len(await sequences.fetch_all()) == seqs_before
+
+
+@pytest.mark.asyncio
+async def test_create_detection_flags_spooled_frames(detection_session: AsyncSession, monkeypatch, tmp_path):
+    camera_id = pytest.camera_table[1]["id"]
+    org_id = pytest.camera_table[1]["organization_id"]
+    local_spool = MediaSpool(str(tmp_path))
+    monkeypatch.setattr(detections_api, "media_spool", local_spool)
+    detections = DetectionCRUD(detection_session)
+
+    async def spooling_upload_file(  # ruff:ignore[unused-async]
+        file: UploadFile, organization_id: int, camera_id: int, key_prefix: str = "", spool: bool = False
+    ) -> str:
+        key = f"{key_prefix}frame-{len(uploads)}.jpg"
+        uploads.append(key)
+        if not flushed_before_commit:
+            local_spool.put(organization_id, key, file.file)
+        return key
+
+    uploads: List[str] = []
+    monkeypatch.setattr(detections_api, "upload_file", spooling_upload_file)
+
+    async def _ingest() -> Detection:
+        det = await create_detection(
+            bboxes="[(0.6,0.6,0.7,0.7,0.6)]",
+            pose_id=3,
+            recorded_at=None,
+            file=UploadFile(filename="img.png", file=io.BytesIO(b"img")),
+            crop_files=None,
+            idempotency_key=None,
+            detections=detections,
+            sequences=SequenceCRUD(detection_session),
+            cameras=CameraCRUD(detection_session),
+            poses=PoseCRUD(detection_session),
+            token_payload=TokenPayload(sub=camera_id, scopes=[Role.CAMERA], organization_id=org_id),
+        )
+        return await detections.get(det.id, strict=True)
+
+    # Still in the spool: flagged until the uploader clears it
+    flushed_before_commit = False
+    spooled = await _ingest()
+    assert spooled.frame_spooled is True
+    assert await detections.has_spooled_frames([spooled.bucket_key])
+    await detections.mark_frames_uploaded([spooled.bucket_key])
+    assert not await detections.has_spooled_frames([spooled.bucket_key])
+
+    # Uploaded before the detection was committed: the uploader had no row to clear, the ingest does
+    flushed_before_commit = True
+    flushed = await _ingest()
+    await detection_session.refresh(flushed)
+    assert flushed.frame_spooled is False
@@ -9,18 +9,21 @@ from typing import Any, cast
 from unittest.mock import AsyncMock
 
 import pytest
+from prometheus_client import REGISTRY
 from sqlalchemy import update
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.config import settings
 from app.core.time import utcnow
 from app.crud import DetectionCRUD, SequenceCRUD
 from app.db import session_factory
-from app.models import AlertSequence, Detection, Sequence
+from app.models import Alert, AlertSequence, Detection, Sequence
 from app.services import validation as validation_service
 from app.services.risk import risk_service
 from app.services.temporal import TemporalPrediction, temporal_service
 from app.services.validation import (
+    DECLINED,
     FAIL_OPEN_STALE,
     FAIL_OPEN_UNAVAILABLE,
     VALIDATED_BY_MODEL,
@@ -28,7 +31,9 @@ from app.services.validation import (
     _notify_for_sequence,
     _process_claimed_sequence,
     _sequence_frames_and_roi,
+    drain_notifications,
     process_next_due_validation,
+    refresh_queue_metrics,
     validation_worker_loop,
 )
 
@@ -76,6 +81,11 @@ async def _seed_sequence(
     return seq
 
 
+def _sample(name: str, **labels: str) -> float:
+    """Current value of a Prometheus sample (0 before its first observation)."""
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
 async def _enqueue(session: AsyncSession, sequence_id: int) -> None:
     await SequenceCRUD(session).enqueue_validation(sequence_id)
 
@@ -128,7 +138,7 @@ async def test_sequence_frames_distinct_ordered_with_union_roi(detection_session
     )
     await detection_session.commit()
 
-    total, frames, roi = await _sequence_frames_and_roi(DetectionCRUD(detection_session), cast(int, seq.id))
+    total, frames, roi = await _sequence_frames_and_roi(SequenceCRUD(detection_session), cast(int, seq.id))
     assert total == 4
     assert frames == ["frame-0.jpg", "frame-1.jpg", "frame-2.jpg", "frame-3.jpg"]
     assert roi == [pytest.approx(0.1), pytest.approx(0.1), pytest.approx(0.9), pytest.approx(0.8)]
@@ -144,7 +154,7 @@ async def test_sequence_frames_truncates_to_last_n_and_scopes_roi(detection_sess
     detection_session.add(dets[0])
     await detection_session.commit()
 
-    total, frames, roi = await _sequence_frames_and_roi(DetectionCRUD(detection_session), cast(int, seq.id), last_n=10)
+    total, frames, roi = await _sequence_frames_and_roi(SequenceCRUD(detection_session), cast(int, seq.id), last_n=10)
     assert total == 12
     assert frames == [f"frame-{i}.jpg" for i in range(2, 12)]  # the last 10
     assert roi == [pytest.approx(0.1), pytest.approx(0.1), pytest.approx(0.7), pytest.approx(0.8)]
@@ -166,6 +176,7 @@ async def test_enqueue_is_idempotent_and_fifo_preserving(detection_session: Asyn
     await crud.enqueue_validation(cast(int, seq.id))  # second detection while queued
     await detection_session.refresh(seq)
     assert seq.validation_due_at == first_due  # one entry per sequence, oldest due kept
+    assert seq.validation_queued_at == first_due
 
 
 @pytest.mark.asyncio
@@ -184,6 +195,19 @@ async def test_enqueue_skips_validated_and_window_exhausted(detection_session: A
     assert seq2.validation_due_at is None  # terminal: never resurrected
 
 
+@pytest.mark.asyncio
+async def test_enqueue_validations_marks_all_in_one_statement(detection_session: AsyncSession):
+    seqs = [await _seed_sequence(detection_session, 5) for _ in range(3)]
+    crud = SequenceCRUD(detection_session)
+    await crud.claim_validation(cast(int, seqs[2].id))
+    await crud.enqueue_validations([cast(int, seq.id) for seq in seqs])
+    for seq in seqs:
+        await detection_session.refresh(seq)
+    assert seqs[0].validation_due_at is not None
+    assert seqs[1].validation_due_at is not None
+    assert seqs[2].validation_due_at is None  # validated: same rules as enqueue_validation
+
+
 @pytest.mark.asyncio
 async def test_claim_leases_and_blocks_concurrent_workers(detection_session: AsyncSession):
     """Cross-worker dedup: a claimed job is invisible to other workers until the lease expires."""
@@ -206,10 +230,99 @@ async def test_claim_leases_and_blocks_concurrent_workers(detection_session: Asy
     seq_db.validation_lease_until = stale_lease
     detection_session.add(seq_db)
     await detection_session.commit()
+    expired_before = _sample("validation_claimed_jobs_total", lease="expired")
     async with session_factory() as worker_c:
         reclaimed = await SequenceCRUD(worker_c).claim_due_validation(lease_seconds=60)
         assert reclaimed is not None
         assert reclaimed.id == seq.id
+    assert _sample("validation_claimed_jobs_total", lease="expired") == expired_before + 1
+
+
+@pytest.mark.asyncio
+async def test_claim_due_validations_leases_a_batch_in_due_order(detection_session: AsyncSession):
+    seqs = [await _seed_sequence(detection_session, 5) for _ in range(3)]
+    for seq in seqs:
+        await _enqueue(detection_session, cast(int, seq.id))
+    await _backdate_due()
+
+    async with session_factory() as worker_a, session_factory() as worker_b:
+        batch = await SequenceCRUD(worker_a).claim_due_validations(2, lease_seconds=60)
+        assert [seq_.id for seq_ in batch] == [seqs[0].id, seqs[1].id]  # oldest due first
+        assert all(seq_.validation_lease_until is not None for seq_ in batch)
+        rest = await SequenceCRUD(worker_b).claim_due_validations(5, lease_seconds=60)
+        assert [seq_.id for seq_ in rest] == [seqs[2].id]  # the leased ones are skipped
+        assert await SequenceCRUD(worker_b).claim_due_validations(5, lease_seconds=60) == []
+
+
+@pytest.mark.asyncio
+async def test_claim_due_validations_ranks_by_priority_with_aging(detection_session: AsyncSession):
+    """Under a backlog the likeliest fires are claimed first, but an old job is never overtaken for long."""
+    low, strong, partnered, old, partner = [
+        await _seed_sequence(detection_session, 5, max_conf=max_conf) for max_conf in (0.3, 0.9, 0.3, 0.3, 0.3)
+    ]
+    alert = Alert(organization_id=1, lat=44.0, lon=4.0, started_at=utcnow(), last_seen_at=utcnow())
+    detection_session.add(alert)
+    await detection_session.commit()
+    detection_session.add_all([
+        AlertSequence(alert_id=alert.id, sequence_id=partnered.id),
+        AlertSequence(alert_id=alert.id, sequence_id=partner.id),
+    ])
+    await detection_session.commit()
+    crud = SequenceCRUD(detection_session)
+    await crud.enqueue_validations([cast(int, old.id)], priority_seconds=120)
+    for seq, risk_priority in ((low, 0.0), (strong, 1.0), (partnered, 0.0)):
+        await crud.enqueue_validations([cast(int, seq.id)], risk_priority=risk_priority, priority_seconds=120)
+    # Queued 10 min ago: no priority boost (at most 120s) can overtake it anymore
+    rank_col = cast(Any, Sequence.validation_rank_at)
+    await detection_session.exec(
+        update(Sequence)
+        .where(cast(Any, Sequence.id) == old.id)
+        .values(validation_rank_at=rank_col - timedelta(minutes=10))
+    )
+    await detection_session.commit()
+    await _backdate_due()
+
+    async with session_factory() as worker:
+        batch = await SequenceCRUD(worker).claim_due_validations(4, lease_seconds=60)
+    assert [seq_.id for seq_ in batch] == [old.id, strong.id, partnered.id, low.id]
+
+    # Re-enqueueing a queued job can only move it forward
+    await detection_session.refresh(low)
+    first_rank = low.validation_rank_at
+    await crud.enqueue_validations([cast(int, low.id)], risk_priority=1.0, priority_seconds=120)
+    await crud.enqueue_validations([cast(int, low.id)], priority_seconds=0)
+    await detection_session.refresh(low)
+    assert low.validation_rank_at < first_rank - timedelta(seconds=30)
+
+
+@pytest.mark.asyncio
+async def test_claim_due_validations_takes_turns_across_organizations(detection_session: AsyncSession):
+    """A flooding camera only delays its own organization, which the in-flight cap also bounds."""
+    flood = [await _seed_sequence(detection_session, 5) for _ in range(3)]
+    other = await _seed_sequence(detection_session, 5, camera_id=2, pose_id=3)
+    for seq in (*flood, other):
+        await _enqueue(detection_session, cast(int, seq.id))
+    await _backdate_due()
+
+    async with session_factory() as worker:
+        batch = await SequenceCRUD(worker).claim_due_validations(2, lease_seconds=60)
+        # Queued last, but organization 2 gets its turn before the rest of the flood
+        assert [seq_.id for seq_ in batch] == [flood[0].id, other.id]
+        capped = await SequenceCRUD(worker).claim_due_validations(5, lease_seconds=60, max_in_flight_per_org=2)
+        assert [seq_.id for seq_ in capped] == [flood[1].id]
+        stats = await SequenceCRUD(worker).validation_queue_stats()
+    assert [row[:3] for row in stats] == [(1, 1, 2), (2, 0, 1)]
+    assert stats[0][3] is not None
+    assert stats[1][3] is None
+
+    await refresh_queue_metrics()
+    assert REGISTRY.get_sample_value("validation_queue_waiting", {"organization_id": "1"}) == 1
+    assert REGISTRY.get_sample_value("validation_queue_in_flight", {"organization_id": "2"}) == 1
+    assert REGISTRY.get_sample_value("validation_queue_oldest_age_seconds", {"organization_id": "1"}) >= 60
+    # An emptied queue stops being reported
+    await SequenceCRUD(detection_session).finish_validation_job(cast(int, other.id))
+    await refresh_queue_metrics()
+    assert REGISTRY.get_sample_value("validation_queue_in_flight", {"organization_id": "2"}) is None
 
 
 @pytest.mark.asyncio
@@ -279,10 +392,17 @@ async def test_process_scores_with_fresh_frames_and_roi(detection_session: Async
     monkeypatch.setattr(risk_service, "_scores", {})  # gate open
     monkeypatch.setattr(temporal_service, "is_available", lambda: True)
     monkeypatch.setattr(temporal_service, "predict", predict)
+    phases = ("read", "model", "triangulate", "notify")
+    phases_before = {phase: _sample("validation_phase_seconds_count", phase=phase) for phase in phases}
+    latency_before = _sample("validation_latency_seconds_count", validation_status=VALIDATED_BY_MODEL)
 
     assert await _process_one_due() is True
+    await drain_notifications()
 
     assert predict.await_args.args[1] == [f"frame-{i}.jpg" for i in range(5)]  # frames read at call time
+    for phase in phases:
+        assert _sample("validation_phase_seconds_count", phase=phase) == phases_before[phase] + 1
+    assert _sample("validation_latency_seconds_count", validation_status=VALIDATED_BY_MODEL) == latency_before + 1
     # The bbox-union ROI is forwarded so the verdict is scoped to the sequence's region.
     assert predict.await_args.kwargs["roi_xyxyn"] == [
         pytest.approx(0.1),
@@ -300,16 +420,98 @@ async def test_process_scores_with_fresh_frames_and_roi(detection_session: Async
     assert await _has_alert_link(detection_session, cast(int, seq.id)) is True
 
 
+@pytest.mark.asyncio
+async def test_process_waits_for_spooled_frames(detection_session: AsyncSession, monkeypatch):
+    seq = await _seed_sequence(detection_session, 5, max_conf=0.30)
+    # The last frame is still in the write-behind spool of the host that received it
+    await detection_session.exec(
+        update(Detection).where(cast(Any, Detection.bucket_key) == "frame-4.jpg").values(frame_spooled=True)
+    )
+    await _enqueue(detection_session, cast(int, seq.id))
+    await detection_session.refresh(seq)
+    queued_at = seq.validation_queued_at
+    predict = AsyncMock(return_value=_prediction(0.9))
+    acquire = AsyncMock(return_value=True)
+    monkeypatch.setattr(risk_service, "_scores", {})  # gate open
+    monkeypatch.setattr(temporal_service, "acquire", acquire)
+    monkeypatch.setattr(temporal_service, "predict", predict)
+
+    assert await _process_one_due() is True
+
+    # The model would not find the last frame on the bucket yet: the job is put off, as is,
+    # without taking a model slot
+    acquire.assert_not_awaited()
+    predict.assert_not_awaited()
+    await detection_session.refresh(seq)
+    assert seq.is_validated is False
+    # Due again once the uploader had time to flush it; neither leased (not counted in flight
+    # meanwhile) nor re-enqueued (the enqueue time the staleness fail-open reads is kept)
+    assert seq.validation_due_at > utcnow()
+    assert seq.validation_queued_at == queued_at
+    assert seq.validation_lease_until is None
+    assert seq.validation_attempts == 0
+    assert await SequenceCRUD(detection_session).validation_queue_stats() == [(1, 0, 0, None)]
+
+    # Once uploaded, the next claim scores it
+    await DetectionCRUD(detection_session).mark_frames_uploaded(["frame-4.jpg"])
+    await detection_session.exec(
+        update(Sequence).where(cast(Any, Sequence.id) == seq.id).values(validation_due_at=utcnow())
+    )
+    await detection_session.commit()
+    assert await _process_one_due() is True
+    predict.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_process_stops_waiting_for_spooled_frames_past_max_age(detection_session: AsyncSession, monkeypatch):
+    """A frame whose upload never lands (spool lost with its host) can't hold the job back forever."""
+    seq = await _seed_sequence(detection_session, 5, max_conf=0.30)
+    await detection_session.exec(
+        update(Detection).where(cast(Any, Detection.bucket_key) == "frame-4.jpg").values(frame_spooled=True)
+    )
+    await _enqueue(detection_session, cast(int, seq.id))
+    await detection_session.exec(
+        update(Sequence)
+        .where(cast(Any, Sequence.id) == seq.id)
+        .values(validation_queued_at=utcnow() - timedelta(seconds=600))  # queued for 10 min
+    )
+    await detection_session.commit()
+    predict = AsyncMock(return_value=_prediction(0.9))
+    monkeypatch.setattr(risk_service, "_scores", {})  # gate open
+    monkeypatch.setattr(temporal_service, "is_available", lambda: True)
+    monkeypatch.setattr(temporal_service, "predict", predict)
+
+    assert await _process_one_due() is True
+
+    predict.assert_not_awaited()
+    await detection_session.refresh(seq)
+    assert seq.is_validated is True
+    assert seq.validation_status == FAIL_OPEN_STALE
+    assert seq.validation_due_at is None
+
+
 @pytest.mark.asyncio
 async def test_process_persists_score_below_threshold_without_validating(detection_session: AsyncSession, monkeypatch):
     seq = await _seed_sequence(detection_session, 5, max_conf=0.30)
     await _enqueue(detection_session, cast(int, seq.id))
+    # Queued 2 minutes ago, then retried after an error (which moved the due time only)
+    await detection_session.exec(
+        update(Sequence)
+        .where(cast(Any, Sequence.id) == seq.id)
+        .values(validation_queued_at=utcnow() - timedelta(seconds=120), validation_attempts=1)
+    )
+    await detection_session.commit()
     monkeypatch.setattr(risk_service, "_scores", {})  # gate open
     monkeypatch.setattr(temporal_service, "is_available", lambda: True)
     monkeypatch.setattr(temporal_service, "predict", AsyncMock(return_value=_prediction(0.40)))  # below 0.45
+    declined_before = _sample("validation_latency_seconds_count", validation_status=DECLINED)
+    declined_sum_before = _sample("validation_latency_seconds_sum", validation_status=DECLINED)
 
     assert await _process_one_due() is True
 
+    # The verdict counts toward the latency, from the enqueue time
+    assert _sample("validation_latency_seconds_count", validation_status=DECLINED) == declined_before + 1
+    assert _sample("validation_latency_seconds_sum", validation_status=DECLINED) >= declined_sum_before + 120
     await detection_session.refresh(seq)
     assert seq.temporal_model_score == pytest.approx(0.40)  # latest score persisted
     assert seq.is_validated is False  # but not validated
@@ -364,10 +566,12 @@ async def test_process_window_exhausted_when_scored_and_past_max_frames(detectio
     monkeypatch.setattr(risk_service, "_scores", {})
     monkeypatch.setattr(temporal_service, "is_available", lambda: True)
     monkeypatch.setattr(temporal_service, "predict", predict)
+    exhausted_before = _sample("validation_latency_seconds_count", validation_status=WINDOW_EXHAUSTED)
 
     assert await _process_one_due() is True
 
     predict.assert_not_awaited()  # don't call the model again
+    assert _sample("validation_latency_seconds_count", validation_status=WINDOW_EXHAUSTED) == exhausted_before + 1
     await detection_session.refresh(seq)
     assert seq.is_validated is False
     assert seq.validation_status == WINDOW_EXHAUSTED
@@ -386,7 +590,7 @@ async def test_process_stale_job_fails_open_explicitly(detection_session: AsyncS
     seq = await _seed_sequence(detection_session, 5, max_conf=0.30)
     crud = SequenceCRUD(detection_session)
     seq_db = cast(Sequence, await crud.get(cast(int, seq.id), strict=True))
-    seq_db.validation_due_at = utcnow() - timedelta(seconds=600)  # queued for 10 min
+    seq_db.validation_due_at = seq_db.validation_queued_at = utcnow() - timedelta(seconds=600)  # queued for 10 min
     detection_session.add(seq_db)
     await detection_session.commit()
     predict = AsyncMock(return_value=_prediction(0.9))
@@ -518,6 +722,25 @@ async def test_attach_failure_past_window_does_not_window_exhaust(detection_sess
     assert await _has_alert_link(detection_session, cast(int, seq.id)) is True
 
 
+@pytest.mark.asyncio
+async def test_rescoring_the_same_frame_set_reuses_the_cached_prediction(detection_session: AsyncSession, monkeypatch):
+    """A job run again on an unchanged frame set (e.g. resumed after a lost lease) skips the model call."""
+    seq = await _seed_sequence(detection_session, 5)
+    monkeypatch.setattr(risk_service, "_scores", {})
+    acquire = AsyncMock(return_value=True)
+    monkeypatch.setattr(temporal_service, "acquire", acquire)
+    predict = AsyncMock(return_value=_prediction(0.40))  # below threshold: the sequence stays open
+    monkeypatch.setattr(temporal_service, "predict", predict)
+    for _ in range(2):
+        await _enqueue(detection_session, cast(int, seq.id))
+        assert await _process_one_due() is True
+
+    predict.assert_awaited_once()
+    acquire.assert_awaited_once()  # a cache hit takes no model slot (nor a half-open probe)
+    await detection_session.refresh(seq)
+    assert seq.temporal_model_score == pytest.approx(0.40)
+
+
 @pytest.mark.asyncio
 async def test_process_risk_gates_on_current_max_conf(detection_session: AsyncSession, monkeypatch):
     """The worker risk-gates on the CURRENT max_conf: a bump while the job was queued counts
@@ -567,6 +790,7 @@ async def test_poison_job_dead_letters_after_max_attempts(detection_session: Asy
     monkeypatch.setattr(temporal_service, "is_available", lambda: True)
     monkeypatch.setattr(temporal_service, "predict", AsyncMock(side_effect=RuntimeError("poison")))
     crud = SequenceCRUD(detection_session)
+    dead_letters_before = _sample("validation_dead_letters_total")
 
     for attempt in range(MAX_VALIDATION_ATTEMPTS):
         if attempt:  # fast-forward past the retry backoff
@@ -581,6 +805,7 @@ async def test_poison_job_dead_letters_after_max_attempts(detection_session: Asy
     assert seq.validation_status == validation_service.VALIDATION_FAILED
     assert seq.validation_due_at is None  # dead-lettered: no more retries
     assert seq.is_validated is False
+    assert _sample("validation_dead_letters_total") == dead_letters_before + 1
 
     # Terminal: new detections can't resurrect it, the worker sees nothing due.
     await crud.enqueue_validation(cast(int, seq.id))
@@ -665,7 +890,7 @@ async def test_process_stale_below_min_frames_stays_unvalidated(detection_sessio
     seq = await _seed_sequence(detection_session, 3, max_conf=0.30)
     crud = SequenceCRUD(detection_session)
     seq_db = cast(Sequence, await crud.get(cast(int, seq.id), strict=True))
-    seq_db.validation_due_at = utcnow() - timedelta(seconds=600)  # queued for 10 min
+    seq_db.validation_due_at = seq_db.validation_queued_at = utcnow() - timedelta(seconds=600)  # queued for 10 min
     detection_session.add(seq_db)
     await detection_session.commit()
     monkeypatch.setattr(risk_service, "_scores", {})
@@ -695,19 +920,24 @@ async def test_claim_validation_is_won_once(detection_session: AsyncSession):
 
 
 @pytest.mark.asyncio
-async def test_sequence_frames_skips_unparseable_bboxes(detection_session: AsyncSession, monkeypatch):
-    """Unparseable bboxes are skipped (full-frame ROI), never abort the job."""
-    from fastapi import HTTPException
-
-    from app.api.api_v1.endpoints import detections as detections_api
-
-    seq = await _seed_sequence(detection_session, 4)
-
-    def bad_parse(_bbox_str):
-        raise HTTPException(status_code=422, detail="bad bbox")
+async def test_sequence_frames_skips_unparseable_bboxes(detection_session: AsyncSession):
+    """Unparseable stored bboxes are skipped (full-frame ROI), never abort the job."""
+    seq = await _seed_sequence(detection_session, 0)
+    now = utcnow()
+    for i in range(4):
+        detection_session.add(
+            Detection(
+                camera_id=1,
+                pose_id=1,
+                sequence_id=seq.id,
+                bucket_key=f"frame-{i}.jpg",
+                bbox="[(not,a,bbox)]",  # legacy row the codec can't decode
+                created_at=now + timedelta(seconds=i),
+            )
+        )
+    await detection_session.commit()
 
-    monkeypatch.setattr(detections_api, "_parse_bbox", bad_parse)
-    total, frames, roi = await _sequence_frames_and_roi(DetectionCRUD(detection_session), cast(int, seq.id))
+    total, frames, roi = await _sequence_frames_and_roi(SequenceCRUD(detection_session), cast(int, seq.id))
     assert total == 4
     assert frames == [f"frame-{i}.jpg" for i in range(4)]
     assert roi is None  # no parseable corner -> full-frame behavior
@@ -731,7 +961,7 @@ async def test_sequence_frames_degenerate_roi_is_dropped(detection_session: Asyn
         )
     await detection_session.commit()
 
-    total, _frames, roi = await _sequence_frames_and_roi(DetectionCRUD(detection_session), cast(int, seq.id))
+    total, _frames, roi = await _sequence_frames_and_roi(SequenceCRUD(detection_session), cast(int, seq.id))
     assert total == 2
     assert roi is None
 
@@ -743,6 +973,22 @@ async def _drain_notifications() -> None:
         await asyncio.gather(*pending, return_exceptions=True)
 
 
+@pytest.mark.asyncio
+async def test_drain_notifications_waits_then_drops_the_hanging_ones(monkeypatch):
+    """At shutdown, delivered notifications are awaited and a hanging channel is bounded."""
+    monkeypatch.setattr(validation_service, "NOTIFICATION_DRAIN_SECONDS", 0.05)
+    delivered = asyncio.create_task(asyncio.sleep(0))
+    hanging = asyncio.create_task(asyncio.Event().wait())
+    monkeypatch.setattr(validation_service, "_pending_notifications", {delivered, hanging})
+
+    await drain_notifications()
+
+    assert delivered.done()
+    assert not delivered.cancelled()
+    await asyncio.sleep(0)
+    assert hanging.cancelled()
+
+
 @pytest.mark.asyncio
 async def test_notify_without_detections_is_a_noop(detection_session: AsyncSession, monkeypatch):
     """A sequence with no detections (deleted meanwhile) notifies nothing and doesn't crash."""
@@ -910,8 +1156,8 @@ async def test_risk_gate_finish_keeps_due_when_frames_changed(detection_session:
     # Simulate a detection arriving after the frame read: the worker saw 4 frames, DB has 5.
     real_frames = validation_service._sequence_frames_and_roi
 
-    async def stale_frames(detections, sequence_id, last_n=None):
-        total, frames, roi = await real_frames(detections, sequence_id, last_n)
+    async def stale_frames(sequences, sequence_id, last_n=None):
+        total, frames, roi = await real_frames(sequences, sequence_id, last_n)
         return total - 1, frames[:-1], roi
 
     monkeypatch.setattr(validation_service, "_sequence_frames_and_roi", stale_frames)
@@ -926,13 +1172,135 @@ async def test_risk_gate_finish_keeps_due_when_frames_changed(detection_session:
 @pytest.mark.asyncio
 async def test_validation_worker_loop_survives_errors_and_idles(monkeypatch):
     """The loop never dies on errors, idles when nothing is due, and stops on cancellation."""
-    calls = AsyncMock(side_effect=[True, RuntimeError("boom"), False, asyncio.CancelledError()])
-    sleeps = AsyncMock()
-    monkeypatch.setattr(validation_service, "process_next_due_validation", calls)
-    monkeypatch.setattr(validation_service.asyncio, "sleep", sleeps)
+    claims = AsyncMock(side_effect=[[7], RuntimeError("boom"), [], asyncio.CancelledError()])
+    run_job = AsyncMock()
+    waits = AsyncMock()
+    monkeypatch.setattr(settings, "TEMPORAL_VALIDATION_CONCURRENCY", 1)
+    monkeypatch.setattr(validation_service, "_claim_due_jobs", claims)
+    monkeypatch.setattr(validation_service, "_run_job", run_job)
+    monkeypatch.setattr(validation_service, "_listen_for_due_validations", AsyncMock())
+    monkeypatch.setattr(validation_service, "_wait_for_due", waits)
 
     with pytest.raises(asyncio.CancelledError):
         await validation_worker_loop()
 
-    assert calls.await_count == 4
-    assert sleeps.await_count == 2  # after the error and after the idle poll, not after work
+    assert claims.await_count == 4
+    run_job.assert_awaited_once_with(7, 0)
+    assert waits.await_count == 2  # after the error and after the idle poll, not after work
+
+
+@pytest.mark.asyncio
+async def test_validation_worker_loop_runs_concurrent_slots(monkeypatch):
+    """Each process runs TEMPORAL_VALIDATION_CONCURRENCY jobs at once, one per slot, claimed as a batch."""
+    running: set = set()
+    peak = 0
+    all_busy = asyncio.Event()
+    claims = AsyncMock(side_effect=lambda limit: list(range(limit)))
+
+    async def job(sequence_id: int, slot: int) -> None:
+        nonlocal peak
+        running.add(slot)
+        peak = max(peak, len(running))
+        if len(running) == 3:
+            all_busy.set()
+        await asyncio.sleep(0.01)
+        running.discard(slot)
+
+    monkeypatch.setattr(settings, "TEMPORAL_VALIDATION_CONCURRENCY", 3)
+    monkeypatch.setattr(validation_service, "_claim_due_jobs", claims)
+    monkeypatch.setattr(validation_service, "_run_job", job)
+    monkeypatch.setattr(validation_service, "_listen_for_due_validations", AsyncMock())
+    worker = asyncio.create_task(validation_worker_loop())
+    await asyncio.wait_for(all_busy.wait(), timeout=5)
+    worker.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await worker
+    assert peak == 3
+    limits = [call.args[0] for call in claims.await_args_list]
+    assert limits[0] == 3  # one claim for the three idle slots
+    assert all(limit <= 3 for limit in limits)
+
+
+@pytest.mark.asyncio
+async def test_idle_worker_wakes_when_a_deferred_job_is_due(detection_session: AsyncSession, monkeypatch):
+    """No NOTIFY marks the end of a deferral: the idle dispatcher sleeps until then, not a whole poll."""
+    seq = await _seed_sequence(detection_session, 5)
+    await _enqueue(detection_session, cast(int, seq.id))
+    crud = SequenceCRUD(detection_session)
+    await crud.defer_validation(cast(int, seq.id), 0.2)
+    await detection_session.refresh(seq)
+    next_at, held_back = await crud.next_validation_claim()
+    assert next_at == seq.validation_due_at
+    assert held_back is False
+    monkeypatch.setattr(settings, "TEMPORAL_VALIDATION_POLL_SECONDS", 30.0)
+
+    await asyncio.wait_for(validation_service._wait_for_due(asyncio.Event(), asyncio.Event()), timeout=5)
+    assert utcnow() >= cast(Any, next_at)
+
+
+@pytest.mark.asyncio
+async def test_idle_worker_wakes_when_a_job_ends_if_jobs_were_held_back(detection_session: AsyncSession, monkeypatch):
+    """Jobs held back by the in-flight cap are claimable once a job of the process ends."""
+    seq = await _seed_sequence(detection_session, 5)
+    await _enqueue(detection_session, cast(int, seq.id))
+    await _backdate_due()
+    assert (await SequenceCRUD(detection_session).next_validation_claim())[1] is True
+    monkeypatch.setattr(settings, "TEMPORAL_VALIDATION_POLL_SECONDS", 30.0)
+    job_done = asyncio.Event()
+
+    waiting = asyncio.create_task(validation_service._wait_for_due(asyncio.Event(), job_done))
+    await asyncio.sleep(0.05)
+    assert not waiting.done()
+    job_done.set()
+    await asyncio.wait_for(waiting, timeout=5)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_job_releases_its_lease(detection_session: AsyncSession, monkeypatch):
+    seq = await _seed_sequence(detection_session, 5, max_conf=0.30)
+    await _enqueue(detection_session, cast(int, seq.id))
+    scoring = asyncio.Event()
+
+    async def hanging_predict(*args, **kwargs):
+        scoring.set()
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(risk_service, "_scores", {})  # gate open
+    monkeypatch.setattr(temporal_service, "is_available", lambda: True)
+    monkeypatch.setattr(temporal_service, "predict", hanging_predict)
+    cancelled = validation_service.SLOT_JOBS.labels("1", "cancelled")
+    cancelled_before = cancelled._value.get()
+
+    await _backdate_due()
+    job = asyncio.create_task(process_next_due_validation(1))
+    await asyncio.wait_for(scoring.wait(), timeout=5)
+    job.cancel()  # shutdown mid model call
+    with pytest.raises(asyncio.CancelledError):
+        await job
+
+    await detection_session.refresh(seq)
+    # Still due, and claimable right away by a sibling instead of after the lease expires
+    assert seq.validation_due_at is not None
+    assert seq.validation_lease_until is None  # released, not expired
+    assert seq.validation_attempts == 0
+    assert cancelled._value.get() == cancelled_before + 1
+    assert validation_service.SLOT_BUSY.labels("1")._value.get() == 0
+
+
+@pytest.mark.asyncio
+async def test_enqueue_wakes_the_listening_workers(detection_session: AsyncSession):
+    wakeup = asyncio.Event()
+    listener = asyncio.create_task(validation_service._listen_for_due_validations(wakeup))
+    await asyncio.wait_for(wakeup.wait(), timeout=5)  # set once listening: catch up on missed NOTIFYs
+    wakeup.clear()
+    seq = await _seed_sequence(detection_session, 5)
+
+    await _enqueue(detection_session, cast(int, seq.id))
+    await asyncio.wait_for(wakeup.wait(), timeout=5)
+    wakeup.clear()
+    # Releasing a job for a sibling wakes the workers too
+    await SequenceCRUD(detection_session).defer_validation(cast(int, seq.id), 0)
+    await asyncio.wait_for(wakeup.wait(), timeout=5)
+    listener.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await listener
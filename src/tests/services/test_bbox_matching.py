@@ -0,0 +1,60 @@
+# Copyright (C) 2026, Pyronear.
+
+# This program is licensed under the Apache License 2.0.
+# See LICENSE or go to <https://www.apache.org/licenses/LICENSE-2.0> for full license details.
+
+import pytest
+
+from app.services.bbox_matching import assign_boxes, match_matrices
+
+
+@pytest.mark.parametrize(
+    ("left", "right", "tolerance", "expected"),
+    [
+        # Overlapping boxes always match
+        ((0.1, 0.1, 0.3, 0.3, 0.9), (0.2, 0.2, 0.4, 0.4, 0.9), 0.0, True),
+        # Disjoint boxes with zero tolerance never match
+        ((0.1, 0.1, 0.3, 0.3, 0.9), (0.32, 0.1, 0.5, 0.3, 0.9), 0.0, False),
+        # Gap smaller than the tolerance matches
+        ((0.1, 0.1, 0.3, 0.3, 0.9), (0.32, 0.1, 0.5, 0.3, 0.9), 0.05, True),
+        # Gap larger than the tolerance does not match
+        ((0.1, 0.1, 0.3, 0.3, 0.9), (0.4, 0.1, 0.5, 0.3, 0.9), 0.05, False),
+        # Tolerance applies per axis
+        ((0.1, 0.1, 0.3, 0.3, 0.9), (0.32, 0.32, 0.5, 0.5, 0.9), 0.05, True),
+    ],
+)
+def test_match_matrices_tolerance(left, right, tolerance, expected):
+    feasible, _ = match_matrices([left], [right], tolerance)
+    assert bool(feasible[0, 0]) is expected
+    feasible, _ = match_matrices([right], [left], tolerance)
+    assert bool(feasible[0, 0]) is expected
+
+
+def test_match_matrices_scores_iou_above_gaps():
+    box = (0.1, 0.1, 0.3, 0.3, 0.9)
+    targets = [(0.2, 0.2, 0.4, 0.4, 0.9), (0.1, 0.1, 0.3, 0.3, 0.5), (0.32, 0.1, 0.5, 0.3, 0.9)]
+    feasible, score = match_matrices([box], targets, 0.05)
+    assert feasible.shape == score.shape == (1, 3)
+    assert feasible.all()
+    assert score[0, 1] == pytest.approx(1.0)
+    assert score[0, 0] == pytest.approx(0.01 / 0.07)
+    assert score[0, 2] == pytest.approx(-0.02)
+
+
+def test_assign_boxes_prefers_best_match_over_first():
+    wide = (0.1, 0.1, 0.5, 0.5, 0.9)
+    small = (0.42, 0.42, 0.5, 0.5, 0.9)
+    # The first target is within reach of the wide box but fits the small one far better
+    targets = [(0.4, 0.4, 0.5, 0.5, 0.9), (0.1, 0.1, 0.4, 0.4, 0.9)]
+    assert assign_boxes([wide, small], targets, 0.05) == [1, 0]
+
+
+def test_assign_boxes_leftovers_join_their_best_target():
+    plume = (0.1, 0.1, 0.3, 0.3, 0.9)
+    boxes = [(0.1, 0.1, 0.2, 0.2, 0.9), (0.2, 0.2, 0.3, 0.3, 0.8), (0.8, 0.8, 0.9, 0.9, 0.7)]
+    assert assign_boxes(boxes, [plume], 0.0) == [0, 0, None]
+
+
+def test_assign_boxes_empty():
+    assert assign_boxes([], [(0.1, 0.1, 0.2, 0.2, 0.9)], 0.05) == []
+    assert assign_boxes([(0.1, 0.1, 0.2, 0.2, 0.9)], [], 0.05) == [None]
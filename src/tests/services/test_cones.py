@@ -5,24 +5,29 @@
 
 import pytest
 
-from app.services.cones import resolve_cone
+from app.services.cones import cone_from_bboxes
 
 
 @pytest.mark.parametrize(
     ("azimuth", "bbox", "aov", "expected_azimuth", "expected_angle"),
     [
         # Centered bbox: cone azimuth equals camera azimuth.
-        (180.0, "[(0.4, 0.0, 0.6, 1.0, 0.9)]", 60.0, 180.0, 12.0),
+        (180.0, (0.4, 0.0, 0.6, 1.0, 0.9), 60.0, 180.0, 12.0),
         # Negative wrap: small camera azimuth + bbox on the left.
-        (5.0, "[(0.0, 0.0, 0.2, 1.0, 0.9)]", 60.0, 341.0, 12.0),
+        (5.0, (0.0, 0.0, 0.2, 1.0, 0.9), 60.0, 341.0, 12.0),
         # Over-360 wrap: large camera azimuth + bbox on the right.
-        (355.0, "[(0.8, 0.0, 1.0, 1.0, 0.9)]", 60.0, 19.0, 12.0),
+        (355.0, (0.8, 0.0, 1.0, 1.0, 0.9), 60.0, 19.0, 12.0),
         # Exactly 360 -> normalized to 0.
-        (336.0, "[(0.8, 0.0, 1.0, 1.0, 0.9)]", 60.0, 0.0, 12.0),
+        (336.0, (0.8, 0.0, 1.0, 1.0, 0.9), 60.0, 0.0, 12.0),
     ],
 )
-def test_resolve_cone_normalizes_azimuth(azimuth, bbox, aov, expected_azimuth, expected_angle):
-    cone_azimuth, cone_angle = resolve_cone(azimuth, bbox, aov)
+def test_cone_from_bboxes_normalizes_azimuth(azimuth, bbox, aov, expected_azimuth, expected_angle):
+    cone_azimuth, cone_angle = cone_from_bboxes(azimuth, [bbox], aov)
     assert 0.0 <= cone_azimuth < 360.0
     assert cone_azimuth == expected_azimuth
     assert cone_angle == expected_angle
+
+
+def test_cone_from_bboxes_uses_the_rightmost_bbox():
+    bboxes = [(0.0, 0.0, 0.2, 1.0, 0.9), (0.4, 0.0, 0.6, 1.0, 0.5)]
+    assert cone_from_bboxes(180.0, bboxes, 60.0) == (180.0, 12.0)
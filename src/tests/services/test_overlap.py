@@ -5,10 +5,13 @@
 
 from datetime import datetime, timedelta
 
+import numpy as np
 import pandas as pd
+from geopy.distance import geodesic
+from shapely.geometry import Polygon
 
 from app.core.time import utcnow
-from app.services.overlap import compute_overlap
+from app.services.overlap import _arc_resolution, _build_cone_polygon, compute_overlap
 
 
 def _make_sequence(
@@ -130,3 +133,24 @@ def test_compute_overlap_mixed_group_locates_from_triangulable_pairs_only() -> N
     assert location is not None
     # The triangulated point sits between the two sites, close to neither apex
     assert 48.26 < location[0] < 48.43
+
+
+def test_arc_resolution_scales_with_cone_angle() -> None:
+    assert _arc_resolution(0.5) == 3
+    assert _arc_resolution(10) == 11
+    assert _arc_resolution(90) == 36
+
+
+def test_build_cone_polygon_matches_pointwise_geodesic_cone() -> None:
+    lat, lon, azimuth, angle = 44.5, 4.2, 350.0, 20.0
+    cone = _build_cone_polygon(lat, lon, azimuth, angle, 30.0, 0.5)
+
+    # Reference: the same sector sampled densely, one geodesic solve per point
+    azimuths = np.linspace(azimuth - angle / 2, azimuth + angle / 2, 200)
+    outer = [geodesic(kilometers=30.0).destination((lat, lon), az % 360) for az in azimuths]
+    inner = [geodesic(kilometers=0.5).destination((lat, lon), az % 360) for az in azimuths[::-1]]
+    reference = Polygon([(p.longitude, p.latitude) for p in outer + inner])
+
+    assert cone.is_valid
+    assert abs(cone.area - reference.area) / reference.area < 1e-3
+    assert cone.hausdorff_distance(reference) < 1e-4  # ~10 m
@@ -0,0 +1,74 @@
+# Copyright (C) 2026, Pyronear.
+
+# This program is licensed under the Apache License 2.0.
+# See LICENSE or go to <https://www.apache.org/licenses/LICENSE-2.0> for full license details.
+
+import pytest
+
+from app.core.config import settings
+from app.services import prediction_cache as cache_module
+from app.services.prediction_cache import PredictionCache
+from app.services.temporal import TemporalPrediction
+
+FRAMES = ["a.jpg", "b.jpg", "c.jpg", "d.jpg"]
+
+
+def _lookups(result: str) -> float:
+    return cache_module.CACHE_LOOKUPS.labels(result=result)._value.get()
+
+
+def test_prediction_cache_hits_on_the_same_frame_set_only():
+    cache = PredictionCache()
+    prediction = TemporalPrediction(0.8, model_version="1.0")
+    hits, misses = _lookups("hit"), _lookups("miss")
+    assert cache.get("bucket", FRAMES, [0.1, 0.2, 0.3, 0.4]) is None
+    cache.put("bucket", FRAMES, [0.1, 0.2, 0.3, 0.4], prediction)
+
+    # ROI float noise still hits
+    assert cache.get("bucket", FRAMES, [0.1000001, 0.2, 0.3, 0.4]) == prediction
+    # Another order, ROI or bucket is another frame set
+    assert cache.get("bucket", FRAMES[::-1], [0.1, 0.2, 0.3, 0.4]) is None
+    assert cache.get("bucket", FRAMES, None) is None
+    assert cache.get("other", FRAMES, [0.1, 0.2, 0.3, 0.4]) is None
+    assert _lookups("hit") - hits == 1
+    assert _lookups("miss") - misses == 4
+
+
+def test_prediction_cache_evicts_expired_and_least_recent_entries(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(settings, "TEMPORAL_PREDICTION_CACHE_SIZE", 2)
+    monkeypatch.setattr(settings, "TEMPORAL_PREDICTION_CACHE_TTL_SECONDS", 60.0)
+    cache = PredictionCache()
+    for key in ("a", "b"):
+        cache.put("bucket", [key], None, TemporalPrediction(0.5))
+    assert cache.get("bucket", ["a"]) is not None  # "b" is now the least recent
+    cache.put("bucket", ["c"], None, TemporalPrediction(0.5))
+    assert cache.get("bucket", ["b"]) is None
+    assert cache.get("bucket", ["a"]) is not None
+
+    now[0] += 61
+    assert cache.get("bucket", ["a"]) is None
+    assert cache.get("bucket", ["c"]) is None
+
+
+@pytest.mark.parametrize(
+    ("cache_size", "prediction"),
+    [
+        (0, TemporalPrediction(0.9)),  # disabled
+        (10, TemporalPrediction(None)),  # scoreless: retried on the next frame set
+    ],
+)
+def test_prediction_cache_skips(monkeypatch, cache_size, prediction):
+    monkeypatch.setattr(settings, "TEMPORAL_PREDICTION_CACHE_SIZE", cache_size)
+    cache = PredictionCache()
+    cache.put("bucket", FRAMES, None, prediction)
+    assert cache.get("bucket", FRAMES) is None
+
+
+def test_prediction_cache_drops_the_entries_of_a_previous_model_release():
+    cache = PredictionCache()
+    cache.put("bucket", ["a"], None, TemporalPrediction(0.2, model_version="1.0"))
+    cache.put("bucket", ["b"], None, TemporalPrediction(0.7, model_version="1.1"))
+    assert cache.get("bucket", ["a"]) is None
+    assert cache.get("bucket", ["b"]) == TemporalPrediction(0.7, model_version="1.1")
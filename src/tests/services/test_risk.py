@@ -3,14 +3,22 @@
 # This program is licensed under the Apache License 2.0.
 # See LICENSE or go to <https://www.apache.org/licenses/LICENSE-2.0> for full license details.
 
-from datetime import date
+import asyncio
+from datetime import date, datetime, timedelta, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
 import pytest
 
 from app.core.config import settings
-from app.services.risk import FWI_MIN_CONF, RiskService, min_confidence_for_class
+from app.services.risk import (
+    FWI_MIN_CONF,
+    FWI_PRIORITY,
+    RiskService,
+    _seconds_until_next_utc_hour,
+    min_confidence_for_class,
+    risk_refresh_loop,
+)
 
 
 def _fake_httpx_client(*, json_data=None, raise_exc=None, side_effect_per_call=None):
@@ -176,3 +184,97 @@ async def test_get_scores_for_date_no_org_param_when_none(configured_risk):
         await service.get_scores_for_date(date(2026, 5, 5))
     _, kwargs = inner.get.await_args
     assert kwargs["params"] is None
+
+
+def test_seconds_until_next_utc_hour_future_today():
+    fake_now = datetime(2026, 5, 5, 1, 30, 0, tzinfo=timezone.utc)
+    with patch("app.services.risk.datetime") as mock_dt:
+        mock_dt.now.return_value = fake_now
+        # datetime.replace + timedelta still need to work — point them at the real type.
+        mock_dt.side_effect = lambda *a, **kw: datetime(*a, **kw)
+        seconds = _seconds_until_next_utc_hour(4)
+    # 04:00 - 01:30 = 2h30m = 9000s
+    assert seconds == 2 * 3600 + 30 * 60
+
+
+def test_seconds_until_next_utc_hour_rolls_to_next_day_when_passed():
+    fake_now = datetime(2026, 5, 5, 5, 0, 0, tzinfo=timezone.utc)
+    with patch("app.services.risk.datetime") as mock_dt:
+        mock_dt.now.return_value = fake_now
+        mock_dt.side_effect = lambda *a, **kw: datetime(*a, **kw)
+        seconds = _seconds_until_next_utc_hour(4)
+    # next 04:00 is tomorrow → 23h
+    assert seconds == 23 * 3600
+
+
+def test_seconds_until_next_utc_hour_clamps_negative_hour():
+    fake_now = datetime(2026, 5, 5, 12, 0, 0, tzinfo=timezone.utc)
+    with patch("app.services.risk.datetime") as mock_dt:
+        mock_dt.now.return_value = fake_now
+        mock_dt.side_effect = lambda *a, **kw: datetime(*a, **kw)
+        seconds = _seconds_until_next_utc_hour(-5)  # clamped to 0
+    # next 00:00 is tomorrow → 12h
+    assert seconds == 12 * 3600
+
+
+def test_seconds_until_next_utc_hour_clamps_overflow_hour():
+    fake_now = datetime(2026, 5, 5, 12, 0, 0, tzinfo=timezone.utc)
+    with patch("app.services.risk.datetime") as mock_dt:
+        mock_dt.now.return_value = fake_now
+        mock_dt.side_effect = lambda *a, **kw: datetime(*a, **kw)
+        seconds = _seconds_until_next_utc_hour(99)  # clamped to 23
+    # next 23:00 today → 11h
+    assert seconds == 11 * 3600
+
+
+def test_seconds_until_next_utc_hour_returns_full_day_when_now_equals_target():
+    fake_now = datetime(2026, 5, 5, 4, 0, 0, tzinfo=timezone.utc)
+    with patch("app.services.risk.datetime") as mock_dt:
+        mock_dt.now.return_value = fake_now
+        mock_dt.side_effect = lambda *a, **kw: datetime(*a, **kw)
+        seconds = _seconds_until_next_utc_hour(4)
+    assert seconds == timedelta(days=1).total_seconds()
+
+
+@pytest.mark.asyncio
+async def test_risk_refresh_loop_calls_refresh_then_cancels_cleanly():
+    sleep_mock = AsyncMock(side_effect=[None, asyncio.CancelledError()])
+    refresh_mock = AsyncMock()
+
+    with (
+        patch("app.services.risk.asyncio.sleep", sleep_mock),
+        patch("app.services.risk.risk_service.refresh", new=refresh_mock),
+        pytest.raises(asyncio.CancelledError),
+    ):
+        await risk_refresh_loop()
+
+    refresh_mock.assert_awaited_once()
+    assert sleep_mock.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_risk_refresh_loop_swallows_refresh_errors_and_continues():
+    sleep_mock = AsyncMock(side_effect=[None, None, asyncio.CancelledError()])
+    refresh_mock = AsyncMock(side_effect=[RuntimeError("boom"), None])
+
+    with (
+        patch("app.services.risk.asyncio.sleep", sleep_mock),
+        patch("app.services.risk.risk_service.refresh", new=refresh_mock),
+        patch("app.services.risk.logger.exception") as exception_mock,
+        pytest.raises(asyncio.CancelledError),
+    ):
+        await risk_refresh_loop()
+
+    assert refresh_mock.await_count == 2
+    assert sleep_mock.await_count == 3
+    exception_mock.assert_called_once_with("Risk refresh loop iteration failed; continuing")
+
+
+def test_priority_weighs_the_camera_fwi_class():
+    service = RiskService()
+    service._scores = {1: "extreme", 2: "Very Low", 3: "unheard_of"}
+    assert service.priority(1) == FWI_PRIORITY["extreme"]
+    assert service.priority(2) == FWI_PRIORITY["very_low"]
+    # Unknown class or camera: neutral weight
+    assert service.priority(3) == FWI_PRIORITY["moderate"]
+    assert service.priority(4) == FWI_PRIORITY["moderate"]
@@ -0,0 +1,76 @@
+# Copyright (C) 2026, Pyronear.
+#
+# This program is licensed under the Apache License 2.0.
+# See LICENSE or go to <https://www.apache.org/licenses/LICENSE-2.0> for full license details.
+
+from datetime import datetime, timedelta
+
+from app.services.sequence_index import SequenceIndex
+
+T0 = datetime(2026, 1, 1, 12, 0, 0)
+BBOX = (0.1, 0.1, 0.2, 0.2, 0.9)
+
+
+def test_sync_reports_unknown_and_moved_sequences():
+    index = SequenceIndex()
+    assert index.sync(1, 1, {10: (T0, None), 11: (T0, None)}) == [10, 11]
+    index.put(1, 1, 10, T0, BBOX)
+    index.put(1, 1, 11, T0, None)
+    # Up-to-date entries are trusted, including sequences without any real bbox
+    assert index.sync(1, 1, {10: (T0, None), 11: (T0, None)}) == []
+    # A detection appended elsewhere moves last_seen_at: the entry must be reloaded
+    assert index.sync(1, 1, {10: (T0 + timedelta(seconds=30), None), 11: (T0, None)}) == [10]
+
+
+def test_sync_drops_sequences_leaving_the_active_window():
+    index = SequenceIndex()
+    index.put(1, 1, 10, T0, BBOX)
+    index.put(1, 1, 11, T0 + timedelta(seconds=10), BBOX)
+    index.put(1, 2, 12, T0, BBOX)
+    assert index.sync(1, 1, {11: (T0 + timedelta(seconds=10), None)}) == []
+    assert [seq_id for seq_id, _ in index.active(1, 1)] == [11]
+    # Other poses are untouched
+    assert [seq_id for seq_id, _ in index.active(1, 2)] == [12]
+    assert index.sync(1, 1, {}) == []
+    assert index.active(1, 1) == []
+
+
+def test_sync_reports_detection_removals_to_every_index():
+    # Two workers indexing the same sequence: a deletion served by one leaves last_seen_at
+    # untouched, only the detection_removed_at stamped in the DB tells the other one
+    serving, other = SequenceIndex(), SequenceIndex()
+    for index in (serving, other):
+        assert index.sync(1, 1, {10: (T0, None)}) == [10]
+        index.put(1, 1, 10, T0, BBOX)
+    removed_at = T0 + timedelta(seconds=5)
+    for index in (serving, other):
+        assert index.sync(1, 1, {10: (T0, removed_at)}) == [10]
+    serving.put(1, 1, 10, T0, (0.3, 0.3, 0.4, 0.4, 0.8), removed_at)
+    assert serving.sync(1, 1, {10: (T0, removed_at)}) == []
+    # Appending a detection keeps the removal marker of the entry
+    serving.extend(10, T0 + timedelta(seconds=30), BBOX)
+    assert serving.sync(1, 1, {10: (T0 + timedelta(seconds=30), removed_at)}) == []
+    assert serving.active(1, 1)[0][1].bbox == BBOX
+    serving.extend(99, T0, BBOX)
+    assert [seq_id for seq_id, _ in serving.active(1, 1)] == [10]
+
+
+def test_active_orders_most_recent_first():
+    index = SequenceIndex()
+    index.put(1, 1, 10, T0, BBOX)
+    index.put(1, 1, 11, T0 + timedelta(seconds=20), BBOX)
+    index.put(1, 1, 12, T0 + timedelta(seconds=10), None)
+    assert [seq_id for seq_id, _ in index.active(1, 1)] == [11, 12, 10]
+    assert index.active(1, 1)[1][1].bbox is None
+
+
+def test_discard_and_clear():
+    index = SequenceIndex()
+    index.put(1, 1, 10, T0, BBOX)
+    index.put(1, 1, 11, T0, BBOX)
+    index.discard(10)
+    index.discard(99)
+    assert [seq_id for seq_id, _ in index.active(1, 1)] == [11]
+    assert index.sync(1, 1, {10: (T0, None), 11: (T0, None)}) == [10]
+    index.clear()
+    assert index.active(1, 1) == []
@@ -1,11 +1,19 @@
+import asyncio
+import base64
+import hashlib
 import io
+import threading
+import time
 
 import boto3
 import pytest
-from fastapi import HTTPException
+from botocore.exceptions import ClientError
+from fastapi import HTTPException, UploadFile
+from prometheus_client import REGISTRY
 
 from app.core.config import settings
-from app.services.storage import S3Bucket, S3Service
+from app.services import storage
+from app.services.storage import S3Bucket, S3Service, s3_service, upload_file
 
 
 @pytest.mark.parametrize(
@@ -106,3 +114,107 @@ async def test_s3_bucket(bucket_name, proxy_url, expected_error, mock_img):
     else:
         with pytest.raises(expected_error):
             S3Bucket(s3, bucket_name, proxy_url)
+
+
+@pytest.mark.asyncio
+async def test_upload_file_runs_off_loop_with_bounded_concurrency(monkeypatch):
+    lock = threading.Lock()
+    running = {"now": 0, "max": 0}
+
+    def slow_upload(file_binary, organization_id, camera_id, key_prefix):
+        with lock:
+            running["now"] += 1
+            running["max"] = max(running["max"], running["now"])
+        time.sleep(0.05)  # blocking boto3 call
+        with lock:
+            running["now"] -= 1
+        return f"{key_prefix}{camera_id}-key"
+
+    monkeypatch.setattr(storage, "_upload_file_sync", slow_upload)
+    monkeypatch.setattr(settings, "S3_UPLOAD_CONCURRENCY", 2)
+    storage._get_upload_limiter.cache_clear()
+    queued_before = REGISTRY.get_sample_value("s3_upload_seconds_count", {"phase": "queue"}) or 0.0
+    waited_before = REGISTRY.get_sample_value("s3_upload_seconds_sum", {"phase": "queue"}) or 0.0
+    ticks = 0
+
+    async def ticker() -> None:
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.005)
+
+    ticker_task = asyncio.create_task(ticker())
+    try:
+        keys = await asyncio.gather(
+            *(
+                upload_file(UploadFile(filename="img.png", file=io.BytesIO(b"img")), 1, 1, key_prefix=f"crop_{idx}_")
+                for idx in range(5)
+            )
+        )
+    finally:
+        ticker_task.cancel()
+        storage._get_upload_limiter.cache_clear()
+    assert keys == [f"crop_{idx}_1-key" for idx in range(5)]
+    assert running["max"] == 2
+    # Every upload reports its wait for a slot: 3 of the 5 queued behind the 2 slots
+    assert REGISTRY.get_sample_value("s3_upload_seconds_count", {"phase": "queue"}) == queued_before + 5
+    assert REGISTRY.get_sample_value("s3_upload_seconds_sum", {"phase": "queue"}) - waited_before >= 0.1
+    # The event loop kept running while the uploads blocked their threads
+    assert ticks >= 10
+
+
+@pytest.mark.asyncio
+async def test_bucket_upload_file_with_content_md5(mock_img):
+    bucket_name = "dummy-bucket-md5"
+    s3_service.create_bucket(bucket_name)
+    bucket = s3_service.get_bucket(bucket_name)
+    md5 = hashlib.md5(mock_img)  # ruff:ignore[hashlib-insecure-hash-function]
+    assert bucket.upload_file("good.png", io.BytesIO(mock_img), content_md5=base64.b64encode(md5.digest()).decode())
+    assert bucket.get_file_metadata("good.png")["ETag"].replace('"', "") == md5.hexdigest()
+    await s3_service.delete_bucket(bucket_name)
+
+
+def test_bucket_upload_file_rejected_digest():
+    class _S3Client:
+        def head_bucket(self, **kwargs):  # ruff:ignore[unused-method-argument]
+            return {}
+
+        def put_object(self, **kwargs):
+            code = "BadDigest" if kwargs["Key"] == "corrupted.png" else "AccessDenied"
+            raise ClientError({"Error": {"Code": code}}, "PutObject")
+
+    bucket = S3Bucket(_S3Client(), "dummy-bucket")
+    # S3 rejects a body not matching its Content-MD5: reported as a failed upload
+    assert not bucket.upload_file("corrupted.png", io.BytesIO(b"img"), content_md5="digest")
+    # Other errors are not swallowed
+    with pytest.raises(ClientError):
+        bucket.upload_file("denied.png", io.BytesIO(b"img"), content_md5="digest")
+
+
+@pytest.mark.asyncio
+async def test_media_spool_write_behind(tmp_path, monkeypatch, mock_img):
+    spool = storage.MediaSpool(str(tmp_path))
+    monkeypatch.setattr(storage, "media_spool", spool)
+    bucket_name = s3_service.resolve_bucket_name(99)
+    s3_service.create_bucket(bucket_name)
+    bucket = s3_service.get_bucket(bucket_name)
+    try:
+        key = await upload_file(UploadFile(filename="img.png", file=io.BytesIO(mock_img)), 99, 1, spool=True)
+        # The key is returned before anything reaches the bucket
+        assert spool.pending(99, [key])
+        assert not bucket.check_file_existence(key)
+        # Org 98 has no bucket: its upload fails and stays spooled for the next pass
+        orphan = await upload_file(UploadFile(filename="img.png", file=io.BytesIO(b"img")), 98, 1, spool=True)
+        assert sorted(spool.entries()) == [(98, orphan), (99, key)]
+        assert await spool.flush() == ([key], 1)
+        assert bucket.check_file_existence(key)
+        assert not spool.pending(99, [key])
+        assert spool.entries() == [(98, orphan)]
+        spool.discard(98, orphan)
+        assert spool.entries() == []
+        # Without the spool flag (camera and pose images), uploads stay synchronous
+        direct = await upload_file(UploadFile(filename="img.png", file=io.BytesIO(mock_img)), 99, 2)
+        assert bucket.check_file_existence(direct)
+        assert spool.entries() == []
+    finally:
+        await s3_service.delete_bucket(bucket_name)
@@ -3,15 +3,27 @@
 # This program is licensed under the Apache License 2.0.
 # See LICENSE or go to <https://www.apache.org/licenses/LICENSE-2.0> for full license details.
 
+import asyncio
 from datetime import timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
 import pytest
+from prometheus_client import REGISTRY
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
 from app.core.time import utcnow
-from app.services.temporal import TemporalModelService, TemporalUnavailableError
+from app.crud import TemporalBreakerCRUD
+from app.models import TemporalBreaker
+from app.services.temporal import (
+    BREAKER_TRIPS,
+    TemporalModelService,
+    TemporalPrediction,
+    TemporalRequest,
+    TemporalUnavailableError,
+)
+from tests.temporal_simulator import TemporalSimulator
 
 
 def _fake_httpx_post_client(*, json_data=None, raise_exc=None):
@@ -24,11 +36,8 @@ def _fake_httpx_post_client(*, json_data=None, raise_exc=None):
         response.raise_for_status = MagicMock()
         response.json = MagicMock(return_value=json_data)
         inner.post = AsyncMock(return_value=response)
-
-    cm = MagicMock()
-    cm.__aenter__ = AsyncMock(return_value=inner)
-    cm.__aexit__ = AsyncMock(return_value=None)
-    return MagicMock(return_value=cm), inner
+    inner.aclose = AsyncMock()
+    return MagicMock(return_value=inner), inner
 
 
 @pytest.fixture
@@ -75,6 +84,7 @@ async def test_predict_tolerates_missing_or_null_version(configured_temporal):
     assert prediction.api_version is None
     assert prediction.model_version == "0.1.0"
 
+    await service.close()
     factory, _ = _fake_httpx_post_client(json_data={"probability": 0.5})  # no version key at all
     with patch("app.services.temporal.httpx.AsyncClient", factory):
         prediction = await service.predict("bucket", ["a.jpg"])
@@ -126,11 +136,16 @@ async def test_predict_raises_and_records_failure_on_http_error(configured_tempo
 @pytest.mark.asyncio
 async def test_breaker_opens_after_three_consecutive_failures(configured_temporal):
     service = TemporalModelService()
+    trips = BREAKER_TRIPS.labels(scope="process")
+    trips_before = trips._value.get()
     factory, _ = _fake_httpx_post_client(raise_exc=httpx.ConnectError("boom"))
     with patch("app.services.temporal.httpx.AsyncClient", factory):
         for _ in range(TemporalModelService.MAX_CONSECUTIVE_FAILURES):
+            assert service.breaker_state() == 0
             with pytest.raises(TemporalUnavailableError):
                 await service.predict("bucket", ["a.jpg"])
+    assert service.breaker_state() == 2
+    assert trips._value.get() == trips_before + 1
     assert service.is_available() is False  # breaker is open / paused
     # First trip: base pause (with jitter), not a long blackout.
     pause = service._paused_until - utcnow().timestamp()
@@ -142,7 +157,9 @@ def test_breaker_half_opens_after_pause_elapses(configured_temporal):
     service._consecutive_failures = 3
     service._open_count = 1
     service._paused_until = (utcnow() - timedelta(seconds=1)).timestamp()  # pause already elapsed
+    assert service.breaker_state() == 1
     assert service.is_available() is True  # half-open: a probe call is allowed
+    assert service.breaker_state() == 1
     assert service._paused_until is None
     assert service._consecutive_failures == 0
     assert service._half_open is True
@@ -209,3 +226,175 @@ async def test_5xx_counts_toward_the_breaker(configured_temporal):
             with pytest.raises(TemporalUnavailableError):
                 await service.predict("bucket", ["a.jpg"])
     assert service.is_available() is False  # outage: breaker opened
+
+
+@pytest.mark.asyncio
+async def test_predict_reuses_one_client_until_closed(configured_temporal):
+    service = TemporalModelService()
+    factory, inner = _fake_httpx_post_client(json_data={"probability": 0.5})
+    with patch("app.services.temporal.httpx.AsyncClient", factory):
+        service.open()
+        await service.predict("bucket", ["a.jpg"])
+        await service.predict("bucket", ["b.jpg"])
+        assert factory.call_count == 1  # kept-alive connections, no handshake per call
+        _, kwargs = factory.call_args
+        assert kwargs["timeout"].connect == settings.TEMPORAL_API_CONNECT_TIMEOUT
+        assert kwargs["timeout"].read == settings.TEMPORAL_API_TIMEOUT
+        await service.close()
+        inner.aclose.assert_awaited_once()
+        await service.predict("bucket", ["c.jpg"])  # reopened on demand
+        assert factory.call_count == 2
+
+
+@pytest.fixture
+def stand_in_api(configured_temporal, monkeypatch: pytest.MonkeyPatch) -> TemporalSimulator:
+    api = TemporalSimulator()
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        "app.services.temporal.httpx.AsyncClient",
+        lambda **kwargs: real_client(transport=httpx.ASGITransport(app=api.app), **kwargs),
+    )
+    return api
+
+
+@pytest.mark.asyncio
+async def test_predict_batch_returns_per_item_outcomes(stand_in_api):
+    service = TemporalModelService()
+    labels = {"path": "/predict/batch", "outcome": "ok"}
+    batches_before = REGISTRY.get_sample_value("temporal_predict_seconds_count", labels) or 0.0
+    single_before = REGISTRY.get_sample_value("temporal_predict_seconds_count", {**labels, "path": "/predict"})
+    outcomes = await service.predict_batch([
+        TemporalRequest("ok", ["a.jpg", "b.jpg"]),
+        TemporalRequest("missing", ["a.jpg"]),
+        TemporalRequest("broken", ["a.jpg"], [0.1, 0.1, 0.2, 0.2]),
+    ])
+    await service.close()
+    assert stand_in_api.paths == ["/predict/batch"]  # one round-trip
+    # Timed apart from the single /predict calls
+    assert REGISTRY.get_sample_value("temporal_predict_seconds_count", labels) == batches_before + 1
+    assert REGISTRY.get_sample_value("temporal_predict_seconds_count", {**labels, "path": "/predict"}) == single_before
+    assert outcomes[0] == TemporalPrediction(0.2, model_version="0.2.0", api_version="1.5.0")
+    assert isinstance(outcomes[1], TemporalUnavailableError)
+    assert isinstance(outcomes[2], TemporalUnavailableError)
+    # Per-item accounting: the 404 item closed the breaker, the 500 one counted as a failure
+    assert service._consecutive_failures == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_predicts_coalesce_into_one_batch(stand_in_api, monkeypatch):
+    monkeypatch.setattr(settings, "TEMPORAL_API_BATCH_SIZE", 3)
+    monkeypatch.setattr(settings, "TEMPORAL_API_BATCH_WINDOW_SECONDS", 5.0)  # a full batch doesn't wait
+    service = TemporalModelService()
+    outcomes = await asyncio.gather(
+        service.predict("ok", ["a.jpg"]),
+        service.predict("missing", ["a.jpg"]),
+        service.predict("ok", ["a.jpg", "b.jpg", "c.jpg"]),
+        return_exceptions=True,
+    )
+    assert stand_in_api.paths == ["/predict/batch"]
+    assert [getattr(outcome, "probability", None) for outcome in outcomes] == [0.1, None, pytest.approx(0.3)]
+    assert isinstance(outcomes[1], TemporalUnavailableError)
+
+    # A partial batch goes out once the window elapses
+    monkeypatch.setattr(settings, "TEMPORAL_API_BATCH_WINDOW_SECONDS", 0.01)
+    assert (await service.predict("ok", ["a.jpg"])).probability == pytest.approx(0.1)
+    # A failed round-trip fails every coalesced call
+    stand_in_api.down = True
+    with pytest.raises(TemporalUnavailableError):
+        await service.predict("ok", ["a.jpg"])
+    await service.close()
+    assert stand_in_api.paths == ["/predict/batch"] * 3
+
+
+@pytest.mark.asyncio
+async def test_unexpected_batch_error_fails_the_calls_open(monkeypatch):
+    monkeypatch.setattr(settings, "TEMPORAL_API_BATCH_SIZE", 3)
+    monkeypatch.setattr(settings, "TEMPORAL_API_BATCH_WINDOW_SECONDS", 0.01)
+    service = TemporalModelService()
+    monkeypatch.setattr(service, "predict_batch", AsyncMock(side_effect=KeyError("probability")))
+    # Not a cancellation: the caller's slot survives and fails open
+    with pytest.raises(TemporalUnavailableError):
+        await service.predict("ok", ["a.jpg"])
+
+
+@pytest.fixture
+def shared_breaker(configured_temporal, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(settings, "TEMPORAL_API_SHARED_BREAKER", True)
+
+
+async def _fail(service: TemporalModelService) -> None:
+    factory, _ = _fake_httpx_post_client(raise_exc=httpx.ConnectError("down"))
+    with patch("app.services.temporal.httpx.AsyncClient", factory), pytest.raises(TemporalUnavailableError):
+        await service.predict("bucket", ["a.jpg"])
+    await service.close()
+
+
+@pytest.mark.asyncio
+async def test_shared_breaker_opens_for_every_process(async_session: AsyncSession, shared_breaker):
+    """Failures add up across processes: the third one, wherever it lands, pauses them all."""
+    process_a, process_b = TemporalModelService(), TemporalModelService()
+    shared_trips = BREAKER_TRIPS.labels(scope="shared")
+    trips_before = shared_trips._value.get()
+    await _fail(process_a)
+    await _fail(process_b)
+    assert await process_a.acquire() is True
+    await _fail(process_a)
+    assert shared_trips._value.get() == trips_before + 1
+
+    assert await process_a.acquire() is False
+    assert await process_b.acquire() is False  # never tripped its own breaker
+    assert process_b.is_available() is True
+    assert REGISTRY.get_sample_value("temporal_breaker_state", {"scope": "shared"}) == 2
+    state = await async_session.get(TemporalBreaker, 1)
+    pause = (state.paused_until - utcnow()).total_seconds()
+    assert pause == pytest.approx(TemporalModelService.BASE_PAUSE_SECONDS, rel=TemporalModelService.JITTER_RATIO + 0.05)
+
+
+@pytest.mark.asyncio
+async def test_shared_breaker_elects_a_single_prober(async_session: AsyncSession, shared_breaker):
+    process_a, process_b = TemporalModelService(), TemporalModelService()
+    async_session.add(TemporalBreaker(id=1, open_count=1, paused_until=utcnow() - timedelta(seconds=1)))
+    await async_session.commit()
+
+    assert await process_a.acquire() is True  # elected: probes the API
+    assert await process_b.acquire() is False  # waits for the probe's verdict
+    assert REGISTRY.get_sample_value("temporal_breaker_state", {"scope": "shared"}) == 1
+    # The probe fails: re-opened at once, at the next backoff tier
+    await _fail(process_a)
+    state = await async_session.get(TemporalBreaker, 1)
+    await async_session.refresh(state)
+    assert state.open_count == 2
+    assert state.probe_until is None
+    assert await process_b.acquire() is False
+
+    # Pause elapsed again: the next probe succeeds and closes it for everyone
+    state.paused_until = utcnow() - timedelta(seconds=1)
+    async_session.add(state)
+    await async_session.commit()
+    assert await process_b.acquire() is True
+    factory, _ = _fake_httpx_post_client(json_data={"probability": 0.5})
+    with patch("app.services.temporal.httpx.AsyncClient", factory):
+        await process_b.predict("bucket", ["a.jpg"])
+    assert await process_a.acquire() is True
+    await async_session.refresh(state)
+    assert (state.open_count, state.paused_until) == (0, None)
+    assert REGISTRY.get_sample_value("temporal_breaker_state", {"scope": "shared"}) == 0
+
+
+@pytest.mark.asyncio
+async def test_shared_breaker_success_locks_only_to_reset(async_session: AsyncSession, monkeypatch):
+    breaker = TemporalBreakerCRUD(async_session)
+    lock = AsyncMock(wraps=breaker._lock)
+    monkeypatch.setattr(breaker, "_lock", lock)
+    # Closed and clean (the row not even created yet): nothing to write, no lock
+    assert await breaker.record(True, 3, lambda _: 1.0) is None
+    lock.assert_not_awaited()
+
+    assert await breaker.record(False, 3, lambda _: 1.0) is None
+    assert await breaker.record(True, 3, lambda _: 1.0) is None  # resets the failure count
+    assert lock.await_count == 2
+    state = await async_session.get(TemporalBreaker, 1)
+    await async_session.refresh(state)
+    assert state.consecutive_failures == 0
+    assert await breaker.record(True, 3, lambda _: 1.0) is None
+    assert lock.await_count == 2
@@ -0,0 +1,139 @@
+# Copyright (C) 2026, Pyronear.
+
+# This program is licensed under the Apache License 2.0.
+# See LICENSE or go to <https://www.apache.org/licenses/LICENSE-2.0> for full license details.
+
+"""Stand-in for the temporal API: ``python -m tests.temporal_simulator [--port 8100] ...``.
+
+Serves ``/predict`` and ``/predict/batch`` like the real model server, with a configurable
+latency distribution, request failure rate and 4xx/5xx mix, and optionally serialized
+inference (one request scored at a time, as the real server does). Used in-process by the
+tests and the validation benchmark (through ``httpx.ASGITransport``), or served over HTTP to
+load-test standalone workers (``TEMPORAL_API_URL=http://localhost:8100``).
+"""
+
+import argparse
+import asyncio
+import hashlib
+import random
+from typing import List, Optional, Sequence, Union
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+__all__ = ["TemporalSimulator"]
+
+VERSION = {"api": "1.5.0", "model": "0.2.0"}
+
+
+class TemporalSimulator:
+    """Temporal API stand-in.
+
+    Scores an item ``len(frames) / 10``, or with ``positive_rate`` set, 0.9 for that share of
+    the frame sets (stable per frame set) and 0.1 for the rest. The ``missing`` bucket answers
+    an item-level 404 and the ``broken`` one an item-level 500.
+
+    Each request waits a log-normal latency (median ``latency_ms``, shape ``latency_sigma``;
+    0 for a fixed latency) plus ``per_item_ms`` per scored item, behind a lock when
+    ``serialized``. A ``failure_rate`` share of the requests then fails, with a 400 for a
+    ``client_error_share`` of them and a 503 otherwise; ``down`` fails them all with a 503.
+    """
+
+    def __init__(
+        self,
+        *,
+        latency_ms: float = 0.0,
+        latency_sigma: float = 0.0,
+        per_item_ms: float = 0.0,
+        failure_rate: float = 0.0,
+        client_error_share: float = 0.0,
+        serialized: bool = False,
+        positive_rate: Optional[float] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.per_item_ms = per_item_ms
+        self.failure_rate = failure_rate
+        self.client_error_share = client_error_share
+        self.positive_rate = positive_rate
+        self.down = False
+        self.paths: List[str] = []
+        self._random = random.Random(seed)  # ruff:ignore[suspicious-non-cryptographic-random-usage] - simulation, not crypto
+        self._inference = asyncio.Lock() if serialized else None
+        self.app = FastAPI(title="Temporal API simulator")
+        self.app.add_api_route("/predict", self._predict, methods=["POST"])
+        self.app.add_api_route("/predict/batch", self._predict_batch, methods=["POST"])
+
+    def _score(self, item: dict) -> dict:
+        if item["bucket"] == "missing":
+            return {"error": "frames not found", "status": 404}
+        if item["bucket"] == "broken":
+            return {"error": "inference failed", "status": 500}
+        if self.positive_rate is None:
+            probability = len(item["frames"]) / 10
+        else:
+            digest = hashlib.sha256("\n".join(item["frames"]).encode()).digest()
+            probability = 0.9 if int.from_bytes(digest[:8], "big") / 2**64 < self.positive_rate else 0.1
+        return {"probability": probability, "version": VERSION}
+
+    async def _infer(self, n_items: int) -> None:
+        latency = self.latency_ms
+        if latency > 0 and self.latency_sigma > 0:
+            latency *= self._random.lognormvariate(0, self.latency_sigma)
+        seconds = (latency + self.per_item_ms * n_items) / 1000
+        if self._inference is None:
+            await asyncio.sleep(seconds)
+            return
+        async with self._inference:
+            await asyncio.sleep(seconds)
+
+    async def _answer(self, request: Request, items: Sequence[dict]) -> Union[JSONResponse, None]:
+        """Error response of a failing request (after its latency), or None."""
+        self.paths.append(request.url.path)
+        if self.down:
+            return JSONResponse({"detail": "down"}, status_code=503)
+        await self._infer(len(items))
+        if self._random.random() < self.failure_rate:
+            if self._random.random() < self.client_error_share:
+                return JSONResponse({"detail": "bad request"}, status_code=400)
+            return JSONResponse({"detail": "inference failed"}, status_code=503)
+        return None
+
+    async def _predict(self, request: Request) -> JSONResponse:
+        item = await request.json()
+        return await self._answer(request, [item]) or JSONResponse(self._score(item))
+
+    async def _predict_batch(self, request: Request) -> JSONResponse:
+        items = (await request.json())["items"]
+        error = await self._answer(request, items)
+        return error or JSONResponse({"results": [self._score(item) for item in items]})
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Temporal API simulator")
+    parser.add_argument("--host", default="0.0.0.0")  # ruff:ignore[hardcoded-bind-all-interfaces] - local test server
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="median latency of a request")
+    parser.add_argument("--latency-sigma", type=float, default=0.3, help="log-normal shape (0: fixed latency)")
+    parser.add_argument("--per-item-ms", type=float, default=0.0, help="latency added per scored item")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="share of the requests failing")
+    parser.add_argument("--client-error-share", type=float, default=0.0, help="share of the failures as 400s")
+    parser.add_argument("--serialized", action="store_true", help="score one request at a time")
+    parser.add_argument("--positive-rate", type=float, default=None, help="share of the frame sets scored 0.9")
+    args = parser.parse_args(argv)
+    simulator = TemporalSimulator(
+        latency_ms=args.latency_ms,
+        latency_sigma=args.latency_sigma,
+        per_item_ms=args.per_item_ms,
+        failure_rate=args.failure_rate,
+        client_error_share=args.client_error_share,
+        serialized=args.serialized,
+        positive_rate=args.positive_rate,
+    )
+    uvicorn.run(simulator.app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
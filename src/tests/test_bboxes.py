@@ -0,0 +1,42 @@
+# Copyright (C) 2026, Pyronear.
+
+# This program is licensed under the Apache License 2.0.
+# See LICENSE or go to <https://www.apache.org/licenses/LICENSE-2.0> for full license details.
+
+import pytest
+
+from app.core.bboxes import EMPTY_BBOXES, decode_bbox, decode_bboxes, flatten_bboxes, unflatten_bboxes
+
+
+def test_decode_bbox():
+    assert decode_bbox("(.1,0.2,.7,1,0)") == (0.1, 0.2, 0.7, 1.0, 0.0)
+
+
+@pytest.mark.parametrize(
+    "raw", ["(.1,.2,.7,.8)", "(0.1, 0.2, 0.7, 0.8, 0.9)", "[(.1,.2,.7,.8,.9)]", "(1.5,.2,.7,.8,.9)"]
+)
+def test_decode_bbox_invalid(raw):
+    with pytest.raises(ValueError, match="invalid bbox"):
+        decode_bbox(raw)
+
+
+def test_decode_bboxes():
+    assert decode_bboxes("[(.1,.1,.7,.8,.9),(0,0,1,1,.5)]") == [(0.1, 0.1, 0.7, 0.8, 0.9), (0.0, 0.0, 1.0, 1.0, 0.5)]
+    assert decode_bboxes(EMPTY_BBOXES) == []
+    assert decode_bboxes(None) == []
+    assert decode_bboxes("[garbage]") == []
+
+
+def test_flatten_roundtrip():
+    boxes = decode_bboxes("[(.1,.1,.7,.8,.9),(0,0,1,1,.5)]")
+    flat = flatten_bboxes(boxes)
+    assert flat == [0.1, 0.1, 0.7, 0.8, 0.9, 0.0, 0.0, 1.0, 1.0, 0.5]
+    assert unflatten_bboxes(flat) == boxes
+    assert unflatten_bboxes(None) == []
+
+
+def test_decode_bboxes_confidences():
+    # The confidence of a box is its last coordinate, across the primary and sibling bbox strings
+    bbox, others = "[(.1,.1,.7,.8,.3)]", "[(.1,.1,.5,.5,.7),(.2,.2,.6,.6,.55)]"
+    assert max(box[4] for raw in (bbox, others) for box in decode_bboxes(raw)) == pytest.approx(0.7)
+    assert [box[4] for raw in ("[(.1,.1,.7,.8,.5)]", "[garbage]", None) for box in decode_bboxes(raw)] == [0.5]
@@ -0,0 +1,46 @@
+# Copyright (C) 2026, Pyronear.
+
+# This program is licensed under the Apache License 2.0.
+# See LICENSE or go to <https://www.apache.org/licenses/LICENSE-2.0> for full license details.
+
+import asyncio
+import time
+
+import httpx
+import pytest
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from tests.benchmark_validation import run_benchmark
+from tests.temporal_simulator import TemporalSimulator
+
+
+@pytest.mark.asyncio
+async def test_simulator_serializes_inference_and_injects_failures():
+    simulator = TemporalSimulator(latency_ms=50, serialized=True)
+    payload = {"bucket": "ok", "frames": ["a.jpg", "b.jpg"]}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=simulator.app), base_url="http://sim") as client:
+        started_at = time.perf_counter()
+        responses = await asyncio.gather(*(client.post("/predict", json=payload) for _ in range(2)))
+        assert time.perf_counter() - started_at >= 0.1  # one request scored at a time
+        assert [response.json()["probability"] for response in responses] == [0.2, 0.2]
+
+        simulator.failure_rate, simulator.client_error_share = 1.0, 1.0
+        assert (await client.post("/predict", json=payload)).status_code == 400
+        simulator.client_error_share = 0.0
+        assert (await client.post("/predict/batch", json={"items": [payload]})).status_code == 503
+
+
+@pytest.mark.asyncio
+async def test_run_benchmark_drains_the_queue(async_session: AsyncSession, monkeypatch):
+    monkeypatch.setattr(settings, "TEMPORAL_API_URL", None)
+    result = await run_benchmark(
+        12, workers=2, concurrency=2, simulator=TemporalSimulator(positive_rate=0.5, seed=0), max_seconds=30
+    )
+
+    assert result.completed == 12
+    assert sum(result.statuses.values()) == 12
+    assert result.share("fail_open_unavailable") == 0
+    assert result.jobs_per_second > 0
+    assert 0 < result.percentile(50) <= result.percentile(99)
+    assert settings.TEMPORAL_API_URL is None  # restored after the run
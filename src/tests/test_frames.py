@@ -0,0 +1,32 @@
+# Copyright (C) 2026, Pyronear.
+
+# This program is licensed under the Apache License 2.0.
+# See LICENSE or go to <https://www.apache.org/licenses/LICENSE-2.0> for full license details.
+
+from app.core.frames import FrameManifest
+
+
+def test_frame_manifest_add_counts_distinct_frames_and_keeps_the_last():
+    manifest = FrameManifest.build([("a", (0.1, 0.1, 0.2, 0.2)), ("b", None)], keep_last=3)
+    manifest = manifest.add([("b", (0.5, 0.5, 0.6, 0.6)), ("c", (0.3, 0.3, 0.4, 0.4)), ("d", None)], keep_last=3)
+    assert manifest.frame_count == 4  # "b" again is the same frame
+    assert manifest.keys == ["b", "c", "d"]
+    assert manifest.rois == [(0.5, 0.5, 0.6, 0.6), (0.3, 0.3, 0.4, 0.4), None]
+
+
+def test_frame_manifest_roi():
+    manifest = FrameManifest.build(
+        [("a", (-0.1, 0.0, 0.9, 0.2)), ("b", (0.3, 0.1, 0.4, 1.2)), ("c", None)], keep_last=10
+    )
+    assert manifest.roi() == [0.0, 0.0, 0.9, 1.0]  # union, clamped to the image
+    assert manifest.roi(last_n=2) == [0.3, 0.1, 0.4, 1.0]  # kept frames only
+    assert manifest.roi(last_n=1) is None  # continuity only: full frame
+    assert FrameManifest.build([("a", (0.5, 0.1, 0.5, 0.8))], keep_last=10).roi() is None  # degenerate
+
+
+def test_frame_manifest_columns_roundtrip():
+    manifest = FrameManifest.build([("a", (0.1, 0.2, 0.3, 0.4)), ("b", None)], keep_last=10)
+    columns = manifest.columns()
+    assert columns["recent_frame_rois"] == [0.1, 0.2, 0.3, 0.4, None, None, None, None]
+    assert FrameManifest.from_columns(**columns) == manifest
+    assert FrameManifest.from_columns(0, None, None) == FrameManifest(0, [], [])
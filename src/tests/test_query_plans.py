@@ -0,0 +1,215 @@
+# Copyright (C) 2026, Pyronear.
+
+# This program is licensed under the Apache License 2.0.
+# See LICENSE or go to <https://www.apache.org/licenses/LICENSE-2.0> for full license details.
+
+"""Query-plan regression suite.
+
+Seeds months of synthetic history, replays the hot API routes and a validation job while
+capturing every statement they send, then runs ``EXPLAIN (ANALYZE, BUFFERS)`` on each one.
+A statement fails the suite when its plan sequentially scans one of the large tables, or
+touches more shared buffers than the budget.
+"""
+
+import json
+from datetime import timedelta
+from typing import Any, Dict, Iterator, List, Tuple
+from unittest.mock import AsyncMock
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import event, text
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.core.time import utcnow
+from app.db import engine
+from app.services.risk import risk_service
+from app.services.temporal import TemporalPrediction, temporal_service
+from app.services.validation import process_next_due_validation
+
+# ~3 months of history at one sequence every 20 min, 10 frames each
+NUM_SEQUENCES = 6000
+FRAMES_PER_SEQUENCE = 10
+# Tables that grow with time: never scanned whole on a request path
+LARGE_TABLES = {"detections", "sequences", "alerts", "alerts_sequences"}
+# Shared buffers (8kB pages) a single statement may touch: the hot routes stay under ~300
+# at this scale, walking the whole detections heap goes over it
+BUFFER_BUDGET = 1000
+# Statements worth explaining (inserts are plain appends)
+EXPLAINED_PREFIXES = ("SELECT", "UPDATE", "DELETE", "WITH")
+
+
+async def _seed_history(session: AsyncSession) -> int:
+    """Bulk-load synthetic sequences, their frames and alerts; returns the first seeded sequence id."""
+    now = utcnow()
+    first_id = int((await session.exec(text("SELECT COALESCE(MAX(id), 0) + 1 FROM sequences"))).one()[0])
+    await session.exec(
+        text(
+            "INSERT INTO sequences (camera_id, pose_id, camera_azimuth, sequence_azimuth, cone_angle, "
+            "started_at, last_seen_at, max_conf, is_validated, validation_attempts) "
+            "SELECT 1 + g % 2, CASE WHEN g % 2 = 0 THEN 1 ELSE 3 END, 180, 175, 5, "
+            "CAST(:now AS timestamp) - g * interval '20 minutes', CAST(:now AS timestamp) - g * interval '20 minutes' + interval '5 minutes', "
+            "(g % 100) / 100.0, true, 0 FROM generate_series(1, :n) AS g"
+        ),
+        params={"now": now, "n": NUM_SEQUENCES},
+    )
+    await session.exec(
+        text(
+            "INSERT INTO detections (camera_id, pose_id, sequence_id, bucket_key, bbox, created_at, recorded_at, "
+            "bbox_xmin, bbox_ymin, bbox_xmax, bbox_ymax, bbox_conf, frame_spooled) "
+            "SELECT s.camera_id, s.pose_id, s.id, 'seed-' || s.id || '-' || k || '.jpg', '[(.1,.1,.2,.2,.5)]', "
+            "s.started_at + k * interval '30 seconds', s.started_at + k * interval '30 seconds', .1, .1, .2, .2, .5, "
+            "false "
+            "FROM sequences s CROSS JOIN generate_series(0, :frames - 1) AS k WHERE s.id >= :first_id"
+        ),
+        params={"frames": FRAMES_PER_SEQUENCE, "first_id": first_id},
+    )
+    await session.exec(
+        text(
+            "INSERT INTO alerts (id, organization_id, lat, lon, started_at, last_seen_at) "
+            "SELECT s.id, c.organization_id, 44.0, 4.0, s.started_at, s.last_seen_at "
+            "FROM sequences s JOIN cameras c ON c.id = s.camera_id WHERE s.id >= :first_id"
+        ),
+        params={"first_id": first_id},
+    )
+    await session.exec(
+        text("INSERT INTO alerts_sequences (alert_id, sequence_id) SELECT id, id FROM sequences WHERE id >= :first_id"),
+        params={"first_id": first_id},
+    )
+    await session.exec(text("SELECT setval('alerts_id_seq', (SELECT MAX(id) FROM alerts))"))
+    await session.commit()
+    # Fixtures wipe tables with DELETE: vacuum the dead rows of previous tests away so each
+    # test plans (and counts buffers) against a clean heap, with fresh statistics.
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        for table in sorted(LARGE_TABLES):
+            await conn.exec_driver_sql(f"VACUUM ANALYZE {table}")
+    return first_id
+
+
+@pytest.fixture
+def captured_statements() -> Iterator[List[Tuple[str, Any]]]:
+    statements: List[Tuple[str, Any]] = []
+
+    def capture(_conn, _cursor, statement, parameters, _context, executemany) -> None:
+        if not executemany and statement.lstrip().upper().startswith(EXPLAINED_PREFIXES):
+            statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    yield statements
+    event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+
+def _plan_nodes(node: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield node
+    for child in node.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+async def _assert_plans(statements: List[Tuple[str, Any]]) -> None:
+    """EXPLAIN every captured statement (rolled back) and check it against the plan rules."""
+    assert statements, "nothing was captured"
+    failures: List[str] = []
+    async with engine.connect() as conn:
+        for statement, parameters in statements:
+            trans = await conn.begin()
+            try:
+                # At this table size a seq scan may honestly be cheapest: forbid it, so one only
+                # shows up when no index can serve the predicate at all.
+                await conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+                result = await conn.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}", parameters)
+                raw = result.scalar_one()
+            finally:
+                await trans.rollback()
+            plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+            scanned = {
+                node["Relation Name"]
+                for node in _plan_nodes(plan)
+                if node["Node Type"] in {"Seq Scan", "Parallel Seq Scan"} and node.get("Relation Name") in LARGE_TABLES
+            }
+            buffers = plan.get("Shared Hit Blocks", 0) + plan.get("Shared Read Blocks", 0)
+            if scanned or buffers > BUFFER_BUDGET:
+                failures.append(f"seq scan on {sorted(scanned)}, {buffers} buffers:\n{' '.join(statement.split())}")
+    assert not failures, "\n\n".join(failures)
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def history(detection_session: AsyncSession) -> int:
+    return await _seed_history(detection_session)
+
+
+@pytest.mark.parametrize(
+    "route",
+    [
+        "/alerts/all/fromdate?from_date={day}&risk_score=very_low",
+        "/alerts/all/fromdate/count?from_date={day}&risk_score=very_low",
+        "/alerts/unlabeled/latest?risk_score=very_low",
+        "/alerts/unlabeled/latest/count?risk_score=very_low",
+        "/alerts/{alert_id}/sequences",
+        "/sequences/all/fromdate?from_date={day}&risk_score=very_low",
+        "/sequences/unlabeled/latest?risk_score=very_low",
+        "/sequences/{sequence_id}/detections",
+    ],
+)
+@pytest.mark.asyncio
+async def test_read_routes_query_plans(
+    async_client: AsyncClient, history: int, captured_statements: List[Tuple[str, Any]], route: str
+):
+    # Odd offsets from the first seeded id land on camera 1 (organization 1)
+    sequence_id = history + NUM_SEQUENCES // 2 + 1
+    url = route.format(day=(utcnow() - timedelta(days=30)).date(), alert_id=sequence_id, sequence_id=sequence_id)
+    auth = pytest.get_token(pytest.user_table[1]["id"], ["agent"], pytest.user_table[1]["organization_id"])
+    response = await async_client.get(url, headers=auth)
+    assert response.status_code == 200, response.text
+    await _assert_plans(captured_statements)
+
+
+@pytest.mark.asyncio
+async def test_ingest_query_plans(
+    async_client: AsyncClient, history: int, captured_statements: List[Tuple[str, Any]], mock_img: bytes
+):
+    auth = pytest.get_token(pytest.camera_table[0]["id"], ["camera"], pytest.camera_table[0]["organization_id"])
+    for _ in range(3):
+        response = await async_client.post(
+            "/detections",
+            data={"pose_id": 1, "bboxes": "[(.4,.4,.5,.5,.7)]"},
+            files={"file": ("logo.png", mock_img, "image/png")},
+            headers=auth,
+        )
+        assert response.status_code == 201, response.text
+    await _assert_plans(captured_statements)
+
+
+@pytest.mark.asyncio
+async def test_delete_detection_query_plans(
+    async_client: AsyncClient, history: int, captured_statements: List[Tuple[str, Any]]
+):
+    auth = pytest.get_token(pytest.user_table[0]["id"], ["admin"], pytest.user_table[0]["organization_id"])
+    response = await async_client.delete(f"/detections/{pytest.detection_table[0]['id']}", headers=auth)
+    assert response.status_code == 200, response.text
+    await _assert_plans(captured_statements)
+
+
+@pytest.mark.asyncio
+async def test_validation_job_query_plans(
+    detection_session: AsyncSession, history: int, captured_statements: List[Tuple[str, Any]], monkeypatch
+):
+    # Queue the most recent seeded sequence, still within the triangulation window
+    await detection_session.exec(
+        text("UPDATE sequences SET is_validated = false, validation_due_at = :due WHERE id = :sid"),
+        params={"due": utcnow() - timedelta(minutes=1), "sid": history},
+    )
+    await detection_session.commit()
+    # With the in-flight cap, the claim also counts the live leases of each organization
+    monkeypatch.setattr(settings, "TEMPORAL_VALIDATION_MAX_IN_FLIGHT_PER_ORG", 2)
+    monkeypatch.setattr(risk_service, "_scores", {})
+    monkeypatch.setattr(temporal_service, "is_available", lambda: True)
+    monkeypatch.setattr(
+        temporal_service, "predict", AsyncMock(return_value=TemporalPrediction(0.9, model_version="0.1.0"))
+    )
+    captured_statements.clear()
+
+    assert await process_next_due_validation() is True
+    await _assert_plans(captured_statements)
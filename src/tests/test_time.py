@@ -1,6 +1,6 @@
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 
-from app.core.time import utcnow
+from app.core.time import day_bounds, utcnow
 
 
 def test_utcnow_returns_naive_datetime():
@@ -20,3 +20,9 @@ def test_utcnow_is_monotonic_across_quick_calls():
     first = utcnow()
     second = utcnow()
     assert first <= second
+
+
+def test_day_bounds_is_half_open_day():
+    start, end = day_bounds(date(2026, 2, 28))
+    assert start == datetime(2026, 2, 28)
+    assert end == datetime(2026, 3, 1)
@@ -0,0 +1,54 @@
+# Copyright (C) 2026, Pyronear.
+
+# This program is licensed under the Apache License 2.0.
+# See LICENSE or go to <https://www.apache.org/licenses/LICENSE-2.0> for full license details.
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.worker import main, run_worker
+
+
+@pytest.mark.asyncio
+async def test_run_worker_runs_the_validation_loop_until_cancelled():
+    started = asyncio.Event()
+    slots = []
+
+    async def fake_loop(concurrency):
+        slots.append(concurrency)
+        started.set()
+        await asyncio.Event().wait()
+
+    fake_temporal = SimpleNamespace(is_configured=True, open=MagicMock(), close=AsyncMock())
+    fake_engine = SimpleNamespace(dispose=AsyncMock())
+    drain = AsyncMock()
+    with (
+        patch("app.worker.risk_service", SimpleNamespace(is_configured=False)),
+        patch("app.worker.temporal_service", fake_temporal),
+        patch("app.worker.validation_worker_loop", fake_loop),
+        patch("app.worker.drain_notifications", drain),
+        patch("app.worker.engine", fake_engine),
+    ):
+        worker = asyncio.create_task(run_worker(4))
+        await asyncio.wait_for(started.wait(), 1)
+        fake_temporal.open.assert_called_once()
+        worker.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await worker
+
+    assert slots == [4]
+    # Notifications flushed and connections closed on the way out
+    drain.assert_awaited_once()
+    fake_temporal.close.assert_awaited_once()
+    fake_engine.dispose.assert_awaited_once()
+
+
+def test_main_passes_the_concurrency_to_the_worker():
+    serve = AsyncMock()
+    with patch("app.worker._serve", serve), patch("app.worker.start_http_server") as metrics_server:
+        main(["--concurrency", "3"])
+    serve.assert_awaited_once_with(3)
+    metrics_server.assert_not_called()  # PROMETHEUS_ENABLED is off in tests